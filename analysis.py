@@ -1,36 +1,242 @@
 # analysis.py
 from __future__ import annotations
-from typing import List, Dict
+import csv, io, os
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple
 from pathlib import Path
-import pandas as pd
+from config_loader import get_settings
+from http_client import json_dumps
+import metrics
 
-def write_csv_topics(df: pd.DataFrame | None, path: Path):
+if TYPE_CHECKING:
+    import pandas as pd
+
+S = get_settings()
+
+# Formats written per query (and for --combined): any of csv, md, jsonl, parquet
+REPORT_FORMATS = tuple(f.strip().lower() for f in S.report_formats.split(",") if f.strip())
+SAMPLE_ARTICLES = 15
+TOPIC_COLUMNS = ["topic", "score", "count"]
+
+# One result for the combined report: (query, topics_df, rows)
+Result = Tuple[str, Any, List[Dict]]
+
+def _tmp_for(path: Path) -> Path:
+    # Same directory, so os.replace is an atomic rename; readers never see a half-written file
+    return path.with_name(f".{path.name}.tmp")
+
+def _atomic_write(path: Path, data, newline: Optional[str] = None) -> Path:
+    """
+    Write `data` (str or bytes) in one call, then rename into place. As with
+    open(), str data gets "\n" written as os.linesep unless newline="" is given.
+    """
     path = Path(path)
     path.parent.mkdir(parents=True, exist_ok=True)
-    out = df if isinstance(df, pd.DataFrame) else pd.DataFrame(columns=["topic", "score", "count"])
-    out.to_csv(path, index=False, encoding="utf-8")
-    print(f"Saved: {path.name} ({len(out)} rows)")
-
-def write_markdown(query: str, topics_df: pd.DataFrame | None, sample_rows: List[Dict], path: Path):
-    lines = [f"# Trends for: **{query}**", ""]
-
-    if topics_df is None or topics_df.empty:
-        lines.append("_No signal found._")
-    else:
-        lines += ["## Top topics", ""]
-        for _, row in topics_df.iterrows():
-            lines.append(f"- **{row['topic']}** — score {row['score']:.3f} (docs: {int(row['count'])})")
+    tmp = _tmp_for(path)
+    if isinstance(data, str):
+        if newline is None and os.linesep != "\n":
+            data = data.replace("\n", os.linesep)
+        data = data.encode("utf-8")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return path
+
+def _columns(df) -> Tuple[List[str], List[list]]:
+    """Column names and whole-column Python lists (numpy scalars converted once per column)."""
+    if df is None or df.empty:
+        cols = list(df.columns) if df is not None and len(df.columns) else TOPIC_COLUMNS
+        return cols, [[] for _ in cols]
+    cols = list(df.columns)
+    return cols, [df[c].tolist() for c in cols]
+
+def _stamps(rows: Sequence[Dict]) -> List[str]:
+    """'YYYY-MM-DD HH:MM UTC' for every row in one numpy pass."""
+    import numpy as np
+
+    if not rows:
+        return []
+    minutes = np.fromiter((r["published_at"].timestamp() // 60 for r in rows), dtype=np.int64, count=len(rows))
+    text = np.datetime_as_string(minutes.astype("datetime64[m]"), unit="m")
+    return [s.replace("T", " ") + " UTC" for s in text.tolist()]
+
+def _topic_lines(df) -> List[str]:
+    if df is None or df.empty:
+        return ["_No signal found._"]
+    topics, scores, counts = df["topic"].tolist(), df["score"].tolist(), df["count"].astype(int).tolist()
+    # Fragments folded into a phrase (keyword/burst modes) follow it in brackets
+    also = [f" [also: {v}]" if v else "" for v in df["variants"].tolist()] if "variants" in df.columns else [""] * len(topics)
+    if "burst_score" in df.columns:   # burst mode: count is docs in the recent window
+        lines = ["## Bursting topics", ""]
+        lines += [f"- **{t}** — burst z {z:.1f}, {v:+.2f} docs/h, peak {p.replace('T', ' ').rstrip('Z')} UTC "
+                  f"(recent docs: {c}){x}" for t, z, v, p, c, x in
+                  zip(topics, df["burst_score"].tolist(), df["velocity"].tolist(), df["peak_time"].tolist(), counts, also)]
         lines.append("")
+        return lines
+    lines = ["## Top topics", ""]
+    lines += [f"- **{t}** — score {s:.3f} (docs: {c}){x}" for t, s, c, x in zip(topics, scores, counts, also)]
+    lines.append("")
+    return lines
 
-    if sample_rows:
-        lines += ["## Sample recent articles", ""]
-        for r in sample_rows[:15]:
-            # r['published_at'] is tz-aware UTC; render explicitly
-            ts = r["published_at"].strftime("%Y-%m-%d %H:%M UTC")
-            lines.append(f"- [{r['title']}]({r['url']}) — *{ts}*, source: {r['source']}")
+def _article_lines(rows: Sequence[Dict]) -> List[str]:
+    rows = rows[:SAMPLE_ARTICLES]
+    if not rows:
+        return []
+    lines = ["## Sample recent articles", ""]
+    for r, ts in zip(rows, _stamps(rows)):
+        synd = r.get("syndication") or 1
+        extra = f" (+{synd - 1} similar)" if synd > 1 else ""
+        lines.append(f"- [{r['title']}]({r['url']}) — *{ts}*, source: {r['source']}{extra}")
+    return lines
 
-    path = Path(path)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        f.write("\n".join(lines))
+def _markdown(query: str, topics_df, rows: Sequence[Dict], level: int = 1) -> List[str]:
+    body = _topic_lines(topics_df) + _article_lines(rows)
+    if level > 1:   # nest the per-query headings under the combined report's title
+        body = [("#" * (level - 1) + ln) if ln.startswith("## ") else ln for ln in body]
+    return [f"{'#' * level} Trends for: **{query}**", ""] + body
+
+def _csv_text(cols: List[str], columns: List[list], prefix: Sequence = ()) -> str:
+    buf = io.StringIO()
+    w = csv.writer(buf, lineterminator=os.linesep)   # what DataFrame.to_csv wrote
+    w.writerow(list(prefix) + cols)
+    w.writerows(zip(*columns))
+    return buf.getvalue()
+
+def _jsonl_lines(query: str, cols: List[str], columns: List[list]) -> List[bytes]:
+    n = len(columns[0]) if columns else 0
+    return [json_dumps({"query": query, "rank": i + 1, **dict(zip(cols, vals))})
+            for i, vals in zip(range(n), zip(*columns))]
+
+def _parquet_engine() -> Optional[str]:
+    for name in ("pyarrow", "fastparquet"):
+        if find_spec(name) is not None:
+            return name
+    return None
+
+@metrics.timed("write.csv")
+def write_csv_topics(df: pd.DataFrame | None, path: Path) -> Path:
+    cols, columns = _columns(df)
+    path = _atomic_write(path, _csv_text(cols, columns), newline="")
+    print(f"Saved: {path.name} ({len(columns[0]) if columns else 0} rows)")
+    return path
+
+@metrics.timed("write.markdown")
+def write_markdown(query: str, topics_df: pd.DataFrame | None, sample_rows: List[Dict], path: Path) -> Path:
+    path = _atomic_write(path, "\n".join(_markdown(query, topics_df, sample_rows or [])))
     print(f"Saved: {path.name}")
+    return path
+
+@metrics.timed("write.jsonl")
+def write_jsonl(query: str, topics_df: pd.DataFrame | None, path: Path) -> Path:
+    """One JSON object per ranked topic, tagged with the query (concatenates cleanly across runs)."""
+    cols, columns = _columns(topics_df)
+    lines = _jsonl_lines(query, cols, columns)
+    path = _atomic_write(path, b"".join(ln + b"\n" for ln in lines))
+    print(f"Saved: {path.name} ({len(lines)} rows)")
+    return path
+
+@metrics.timed("write.parquet")
+def write_parquet(query: str, topics_df: pd.DataFrame | None, path: Path) -> Optional[Path]:
+    """Topics with a query column; skipped (returns None) when neither pyarrow nor fastparquet is installed."""
+    return _write_parquet_frame({"query": [query] * (0 if topics_df is None else len(topics_df))},
+                                topics_df, path)
+
+def _write_parquet_frame(extra: Dict[str, list], topics_df, path: Path) -> Optional[Path]:
+    import pandas as pd
+
+    engine = _parquet_engine()
+    if engine is None:
+        print(f"[DEBUG] Parquet output skipped for {Path(path).name}: install pyarrow (or fastparquet)")
+        return None
+    cols, columns = _columns(topics_df)
+    frame = pd.DataFrame({**extra, **dict(zip(cols, columns))})
+    buf = io.BytesIO()
+    frame.to_parquet(buf, engine=engine, index=False)
+    path = _atomic_write(path, buf.getvalue())
+    print(f"Saved: {path.name} ({len(frame)} rows)")
+    return path
+
+# format -> writer(query, topics_df, rows, path); a writer returns the path, or None when skipped
+WRITERS: Dict[str, Callable[[str, Any, List[Dict], Path], Optional[Path]]] = {
+    "csv": lambda q, df, rows, p: write_csv_topics(df, p),
+    "md": lambda q, df, rows, p: write_markdown(q, df, rows, p),
+    "jsonl": lambda q, df, rows, p: write_jsonl(q, df, p),
+    "parquet": lambda q, df, rows, p: write_parquet(q, df, p),
+}
+
+def write_reports(query: str, topics_df: pd.DataFrame | None, rows: List[Dict],
+                  paths: Dict[str, Path], formats: Sequence[str] = REPORT_FORMATS) -> Dict[str, Path]:
+    """Write every requested format that has a path; returns {format: path} of what was written."""
+    out = {}
+    for fmt in formats:
+        if fmt in paths and fmt in WRITERS:
+            p = WRITERS[fmt](query, topics_df, rows, paths[fmt])
+            if p is not None:
+                out[fmt] = p
+    return out
+
+@metrics.timed("write.combined")
+def write_combined(results: Sequence[Result], stem: Path,
+                   formats: Sequence[str] = REPORT_FORMATS) -> Dict[str, Path]:
+    """
+    One file per format covering every query, built in a single pass over the
+    results: `<stem>.csv` / `.jsonl` / `.parquet` carry a query column, `<stem>.md`
+    has one section per query.
+    """
+    stem = Path(stem)
+    want = set(formats)
+    cols: Optional[List[str]] = None
+    by_col: Dict[str, list] = {}   # column -> [(first row, values), ...]
+    md: List[str] = [f"# Trends for {len(results)} queries", ""]
+    jsonl: List[bytes] = []
+    queries: List[str] = []
+
+    for query, topics_df, rows in results:
+        c, columns = _columns(topics_df)
+        if cols is None or (topics_df is not None and not topics_df.empty and len(c) > len(cols)):
+            cols = c
+        n = len(columns[0]) if columns else 0
+        queries += [query] * n
+        for name, vals in zip(c, columns):
+            by_col.setdefault(name, []).append((len(queries) - n, vals))
+        if "md" in want:
+            md += _markdown(query, topics_df, rows, level=2) + [""]
+        if "jsonl" in want:
+            jsonl += _jsonl_lines(query, c, columns)
+
+    # Align columns across queries (frames from different modes may differ)
+    cols = cols or TOPIC_COLUMNS
+    table = []
+    for name in cols:
+        col = [None] * len(queries)
+        for start, vals in by_col.get(name, []):
+            col[start:start + len(vals)] = vals
+        table.append(col)
+
+    written: Dict[str, Path] = {}
+    if "csv" in want:
+        written["csv"] = _atomic_write(stem.with_suffix(".csv"),
+                                       _csv_text(cols, [queries] + table, prefix=["query"]), newline="")
+    if "md" in want:
+        written["md"] = _atomic_write(stem.with_suffix(".md"), "\n".join(md))
+    if "jsonl" in want:
+        written["jsonl"] = _atomic_write(stem.with_suffix(".jsonl"), b"".join(ln + b"\n" for ln in jsonl))
+    if "parquet" in want:
+        import pandas as pd
+        frame = pd.DataFrame(dict(zip(cols, table)))
+        p = _write_parquet_frame({"query": queries}, frame, stem.with_suffix(".parquet"))
+        if p:
+            written["parquet"] = p
+    print(f"Saved: combined report for {len(results)} queries ({', '.join(p.name for p in written.values())})")
+    return written
+
+@metrics.timed("write.index")
+def write_index(entries: List[Dict], path: Path):
+    """Summary of a batch run: one line per query with its status and output files."""
+    cols = ["query", "status", "topics", "articles", "top_topic", "csv", "md", "error"]
+    buf = io.StringIO()
+    w = csv.DictWriter(buf, fieldnames=cols, extrasaction="ignore")
+    w.writeheader()
+    w.writerows(entries)
+    path = _atomic_write(path, buf.getvalue(), newline="")
+    print(f"Saved: {path.name} ({len(entries)} queries)")
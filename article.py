@@ -0,0 +1,53 @@
+# article.py
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional
+
+class Article:
+    """
+    One normalized news item. Slotted to keep large watchlists small in memory;
+    the provider payload is only kept when explicitly asked for (`raw`).
+
+    Supports read-only mapping access (`a["title"]`, `a.get("url")`) so code
+    written against the old dict rows keeps working.
+    """
+    __slots__ = ("title", "url", "summary", "published_at", "source", "raw", "syndication")
+
+    def __init__(self, title: str, url: str, summary: str, published_at: datetime,
+                 source: str, raw: Optional[Dict[str, Any]] = None, syndication: int = 1):
+        self.title = title
+        self.url = url
+        self.summary = summary
+        self.published_at = published_at  # tz-aware UTC datetime
+        self.source = source
+        self.raw = raw
+        self.syndication = syndication  # outlets carrying a near-identical story (see dedup.py)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self.__slots__:
+            return default
+        v = getattr(self, key)
+        return default if v is None else v
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.__slots__ and getattr(self, key) is not None
+
+    def keys(self) -> Iterator[str]:
+        return (k for k in self.__slots__ if getattr(self, k) is not None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {k: getattr(self, k) for k in self.keys()}
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Article):
+            return NotImplemented
+        return all(getattr(self, k) == getattr(other, k) for k in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Article({self.source!r}, {self.published_at!s}, {self.title[:60]!r})"
@@ -0,0 +1,66 @@
+# article_batch.py
+from __future__ import annotations
+import math
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+def _clean(v) -> str:
+    if v is None: return ""
+    if isinstance(v, float) and math.isnan(v): return ""
+    return str(v)
+
+@dataclass
+class ArticleBatch:
+    """
+    Struct-of-arrays view of fetched articles: one column per field and a
+    datetime64[ns, UTC] `published_at`. Fetchers hand rows over once through
+    `from_rows`; scorers work on whole columns instead of per-row dicts.
+    """
+    titles: np.ndarray
+    summaries: np.ndarray
+    urls: np.ndarray
+    sources: np.ndarray
+    published_at: pd.DatetimeIndex
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Dict[str, Any]]) -> "ArticleBatch":
+        n = len(rows)
+
+        def col(name: str) -> np.ndarray:
+            return np.fromiter((_clean(r.get(name)) for r in rows), dtype=object, count=n)
+
+        return cls(
+            titles=col("title"),
+            summaries=col("summary"),
+            urls=col("url"),
+            sources=col("source"),
+            published_at=pd.DatetimeIndex(
+                pd.to_datetime([r.get("published_at") for r in rows], utc=True)
+            ).as_unit("ns"),
+        )
+
+    @classmethod
+    def coerce(cls, data: Union["ArticleBatch", Sequence[Dict[str, Any]]]) -> "ArticleBatch":
+        return data if isinstance(data, cls) else cls.from_rows(data)
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def epoch_seconds(self) -> np.ndarray:
+        """Seconds since the epoch; NaT becomes NaN."""
+        ns = self.published_at.asi8.astype(np.float64)
+        ns[self.published_at.isna()] = np.nan
+        return ns / 1e9
+
+    def hours_ago(self, now: Optional[datetime] = None) -> np.ndarray:
+        """Age in hours against one fixed `now`; future and missing timestamps count as 0."""
+        now_s = (now or datetime.now(timezone.utc)).timestamp()
+        hrs = (now_s - self.epoch_seconds()) / 3600.0
+        return np.clip(np.nan_to_num(hrs, nan=0.0), 0.0, None)
+
+    def decay_weights(self, half_life_h: float, now: Optional[datetime] = None) -> np.ndarray:
+        return 0.5 ** (self.hours_ago(now) / max(half_life_h, 1e-6))
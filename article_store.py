@@ -0,0 +1,137 @@
+# article_store.py
+import sqlite3, threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from config_loader import get_settings
+from article import Article
+
+def query_key(query: str, lang: str) -> str:
+    return f"{lang.strip().lower()}|{' '.join(query.lower().split())}"
+
+def _ts(dt: datetime) -> float:
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+class ArticleStore:
+    """
+    Local SQLite store of normalized article rows, keyed by URL, plus a
+    per query/provider high-water mark so each run only fetches what is new.
+    """
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS articles ("
+            " url TEXT PRIMARY KEY, title TEXT, summary TEXT, published_at REAL, source TEXT);"
+            "CREATE TABLE IF NOT EXISTS query_articles ("
+            " qkey TEXT, url TEXT, PRIMARY KEY (qkey, url));"
+            "CREATE TABLE IF NOT EXISTS watermarks ("
+            " qkey TEXT, provider TEXT, high_water REAL, covered_since REAL,"
+            " PRIMARY KEY (qkey, provider));"
+            "CREATE INDEX IF NOT EXISTS ix_articles_published ON articles(published_at);"
+        )
+
+    def add(self, qkey: str, rows: Iterable[Dict[str, Any]]) -> int:
+        recs, links = [], []
+        for r in rows:
+            url = r.get("url") or ("title:" + (r.get("title") or ""))
+            if url == "title:":
+                continue
+            recs.append((url, r.get("title") or "", r.get("summary") or "",
+                         _ts(r["published_at"]), r.get("source") or ""))
+            links.append((qkey, url))
+        if not recs:
+            return 0
+        with self._lock:
+            self._db.execute("BEGIN")
+            self._db.executemany(
+                "INSERT INTO articles(url, title, summary, published_at, source) VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT(url) DO UPDATE SET title=excluded.title, summary=excluded.summary,"
+                " published_at=excluded.published_at, source=excluded.source",
+                recs,
+            )
+            self._db.executemany("INSERT OR IGNORE INTO query_articles(qkey, url) VALUES (?, ?)", links)
+            self._db.execute("COMMIT")
+        return len(recs)
+
+    def watermark(self, qkey: str, provider: str, since: datetime) -> Optional[datetime]:
+        """
+        High-water mark for (query, provider), or None when the stored data does
+        not already cover `since` (first run, or a wider window than before).
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT high_water, covered_since FROM watermarks WHERE qkey=? AND provider=?",
+                (qkey, provider),
+            ).fetchone()
+        if row is None or row[0] is None or row[1] > _ts(since):
+            return None
+        return datetime.fromtimestamp(row[0], timezone.utc)
+
+    def advance(self, qkey: str, provider: str, rows: List[Dict[str, Any]],
+                covered_since: datetime, full: bool) -> None:
+        """Move the mark forward to the newest fetched row; a full fetch also resets coverage."""
+        newest = max((_ts(r["published_at"]) for r in rows), default=None)
+        with self._lock:
+            cur = self._db.execute(
+                "SELECT high_water, covered_since FROM watermarks WHERE qkey=? AND provider=?",
+                (qkey, provider),
+            ).fetchone()
+            if cur is not None and not full:
+                high = max((x for x in (cur[0], newest) if x is not None), default=None)
+                cov = cur[1]
+            else:
+                high, cov = newest, _ts(covered_since)
+            self._db.execute(
+                "INSERT OR REPLACE INTO watermarks(qkey, provider, high_water, covered_since) VALUES (?, ?, ?, ?)",
+                (qkey, provider, high, cov),
+            )
+
+    def window(self, qkey: str, since: datetime) -> List[Article]:
+        with self._lock:
+            cur = self._db.execute(
+                "SELECT a.title, a.url, a.summary, a.published_at, a.source"
+                " FROM articles a JOIN query_articles q ON q.url = a.url"
+                " WHERE q.qkey=? AND a.published_at >= ? ORDER BY a.published_at DESC",
+                (qkey, _ts(since)),
+            )
+            out = [
+                Article(title, "" if url.startswith("title:") else url, summary,
+                        datetime.fromtimestamp(ts, timezone.utc), source)
+                for title, url, summary, ts, source in cur
+            ]
+        return out
+
+    def prune(self, older_than: datetime) -> int:
+        """
+        Drop articles (and their query links) published before `older_than`.
+        Coverage is clipped to match, so a later wider window refetches in full.
+        """
+        cutoff = _ts(older_than)
+        with self._lock:
+            self._db.execute("BEGIN")
+            self._db.execute(
+                "DELETE FROM query_articles WHERE url IN (SELECT url FROM articles WHERE published_at < ?)",
+                (cutoff,),
+            )
+            n = self._db.execute("DELETE FROM articles WHERE published_at < ?", (cutoff,)).rowcount
+            self._db.execute("UPDATE watermarks SET covered_since=? WHERE covered_since < ?", (cutoff, cutoff))
+            self._db.execute("COMMIT")
+        return n
+
+_store: Optional[ArticleStore] = None
+_store_lock = threading.Lock()
+
+def get_store() -> ArticleStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ArticleStore(get_settings().article_store_path)
+    return _store
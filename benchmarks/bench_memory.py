@@ -0,0 +1,94 @@
+# benchmarks/bench_memory.py
+"""
+Retained memory for N fetched articles, legacy dict rows (with the SerpApi
+payload kept in "raw") vs. slotted Article records, plus JSON page decode
+speed with the stdlib vs. orjson.
+
+    python -m benchmarks.bench_memory --n 10000 --out output/bench_memory.json
+"""
+import argparse, gc, json, random, sys, time, tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from article import Article
+
+def _serp_item(i: int, now: datetime) -> dict:
+    pub = now - timedelta(minutes=7 * i)
+    return {
+        "position": i,
+        "title": f"County officials respond to storm damage report number {i}",
+        "source": {"name": f"Outlet {i % 97}", "icon": f"https://img.example/{i % 97}.png",
+                   "authors": ["Staff Reporter", "Wire Desk"]},
+        "link": f"https://news.example/{i % 97}/story-{i}",
+        "thumbnail": f"https://img.example/thumb/{i}.jpg",
+        "thumbnail_small": f"https://img.example/thumb/{i}_s.jpg",
+        "snippet": "Emergency crews worked through the night as residents assessed damage " * 2,
+        "date": pub.strftime("%m/%d/%Y, %I:%M %p, +0000 UTC"),
+        "iso_date": pub.strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+
+def _legacy(n: dict, pub: datetime) -> dict:
+    return {"source": "serpapi", "title": n["title"].strip(), "summary": n["snippet"].strip(),
+            "url": n["link"], "published_at": pub, "language": "en", "raw": n}
+
+def _compact(n: dict, pub: datetime) -> Article:
+    return Article(n["title"].strip(), n["link"], n["snippet"].strip(), pub, "serpapi")
+
+def retained_bytes(build, n: int) -> int:
+    """Bytes still allocated after decoding pages and keeping only the rows."""
+    now = datetime.now(timezone.utc)
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    pages = [json.loads(json.dumps([_serp_item(i, now) for i in range(p, min(p + 100, n))]))
+             for p in range(0, n, 100)]
+    rows = [build(item, now) for page in pages for item in page]
+    del pages
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    assert len(rows) == n
+    return used
+
+def decode_seconds(loads, payload: bytes, repeat: int) -> float:
+    t = time.perf_counter()
+    for _ in range(repeat):
+        loads(payload)
+    return (time.perf_counter() - t) / repeat
+
+def run(n: int = 10000) -> dict:
+    random.seed(0)
+    legacy = retained_bytes(_legacy, n)
+    compact = retained_bytes(_compact, n)
+
+    now = datetime.now(timezone.utc)
+    page = json.dumps({"news_results": [_serp_item(i, now) for i in range(100)]}).encode("utf-8")
+    out = {
+        "articles": n,
+        "legacy_dict_rows_bytes": legacy,
+        "article_records_bytes": compact,
+        "bytes_per_10k": {"legacy": int(legacy * 10000 / n), "article": int(compact * 10000 / n)},
+        "reduction": round(1 - compact / legacy, 3) if legacy else None,
+        "page_decode_ms": {"json": round(decode_seconds(json.loads, page, 200) * 1000, 3)},
+    }
+    try:
+        import orjson
+        out["page_decode_ms"]["orjson"] = round(decode_seconds(orjson.loads, page, 200) * 1000, 3)
+    except ImportError:
+        pass
+    return out
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=10000)
+    ap.add_argument("--out", default="")
+    args = ap.parse_args(argv)
+    res = run(args.n)
+    text = json.dumps(res, indent=2)
+    print(text)
+    if args.out:
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.out).write_text(text, encoding="utf-8")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+# benchmarks/bench_pipeline.py
+"""
+Offline timing and peak-memory benchmarks for the analysis pipeline on a
+synthetic corpus (see benchmarks/corpus.py). No network access is needed:
+`co_trending_topics` is fed the synthetic rows instead of calling fetch_both.
+
+    python -m benchmarks.bench_pipeline --sizes 100,1000,10000 --out output/bench_pipeline.json
+    python -m benchmarks.bench_pipeline --sizes 100000 --stages parse_date,merge_rows
+
+Each stage reports the best and mean wall time over `--repeat` runs plus the
+tracemalloc peak of one extra run, so results can be diffed between versions.
+`cotrend_engine` also reports whether the incremental engine, fed the rows in
+pages, ranks exactly like `score_corpus` on the same rows and `now` (topics,
+variants and counts; `parity_small` repeats that on tie-heavy 20-row corpora);
+`score_bursts` checks that a peak tied across bins is reported at the newest one.
+"""
+import os
+os.environ.setdefault("NLTK_AUTO_DOWNLOAD", "0")   # stay offline; RAKE stages skip without data
+
+import argparse, contextlib, io, json, platform, subprocess, sys, tempfile, time, tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, List
+from unittest import mock
+
+from benchmarks.corpus import provider_split, synthetic_date_strings, synthetic_rows
+
+STAGES = ["parse_date", "merge_rows", "build_topics_df", "co_trending_topics", "score_corpus",
+          "cotrend_engine", "score_bursts", "write_csv_topics", "write_markdown", "write_batch"]
+BATCH_QUERIES = 500   # write_batch: per-query csv+md+jsonl plus one combined report
+ENGINE_PAGE = 100     # cotrend_engine: rows per ingest() call, like a provider page
+ENGINE_SMALL, ENGINE_SMALL_SEEDS = 20, 10   # cotrend_engine: tie-heavy parity corpora
+QUERY = "alabama news"
+
+def measure(fn: Callable[[], object], repeat: int, setup: Callable[[], None] = None) -> Dict:
+    """Best/mean seconds over `repeat` runs, then the tracemalloc peak of one more run."""
+    times = []
+    for _ in range(repeat):
+        if setup: setup()
+        t = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t)
+    if setup: setup()
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"best_s": round(min(times), 6), "mean_s": round(sum(times) / len(times), 6), "peak_bytes": peak}
+
+def _quiet(fn: Callable[[], object]) -> Callable[[], object]:
+    """The pipeline prints progress lines; keep them out of the JSON on stdout."""
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn()
+    return run
+
+def bench_size(n: int, stages: List[str], repeat: int, workdir: Path) -> Dict:
+    import news_sources
+    import analysis
+
+    rows = synthetic_rows(n, seed=n)
+    out: Dict[str, Dict] = {}
+
+    if "parse_date" in stages:
+        dates = synthetic_date_strings(n, seed=n)
+        out["parse_date"] = measure(
+            lambda: [news_sources._parse_date(s) for s in dates], repeat,
+            setup=news_sources._parse_fixed.cache_clear,       # cold memo every run
+        )
+        out["parse_date"]["per_call_us"] = round(out["parse_date"]["best_s"] / n * 1e6, 3)
+
+    if "merge_rows" in stages:
+        a, b = provider_split(rows, seed=n)
+        out["merge_rows"] = measure(_quiet(lambda: news_sources._merge_rows(a, b)), repeat)
+
+    topics_df = None
+    if "build_topics_df" in stages:
+        import topic_miner
+        try:
+            topic_miner.ensure_nltk_resources()
+            out["build_topics_df"] = measure(_quiet(lambda: topic_miner.build_topics_df(rows)), repeat)
+        except LookupError:
+            out["build_topics_df"] = {"skipped": "NLTK data missing (install it or run with NLTK_AUTO_DOWNLOAD=1)"}
+
+    if {"co_trending_topics", "score_corpus", "cotrend_engine", "score_bursts", "write_csv_topics", "write_markdown", "write_batch"} & set(stages):
+        import keyword_trending
+        with mock.patch.object(keyword_trending, "fetch_both", lambda **kw: rows):
+            run = _quiet(lambda: keyword_trending.co_trending_topics(QUERY))
+            if "co_trending_topics" in stages:
+                # cold corpus every run, otherwise only the rescoring is timed
+                out["co_trending_topics"] = measure(run, repeat, setup=keyword_trending.clear_corpus_cache)
+            keyword_trending.clear_corpus_cache()
+            topics_df, _ = run()
+            if "score_corpus" in stages:
+                corpus = keyword_trending.fetch_corpus(QUERY)
+                out["score_corpus"] = measure(
+                    lambda: keyword_trending.score_corpus(corpus, half_life_h=12.0, top_k=15), repeat)
+            if "cotrend_engine" in stages:
+                out["cotrend_engine"] = bench_engine(keyword_trending.fetch_corpus(QUERY), rows, repeat)
+            if "score_bursts" in stages:
+                corpus = keyword_trending.fetch_corpus(QUERY)
+                out["score_bursts"] = measure(lambda: keyword_trending.score_bursts(corpus, top_k=15), repeat)
+                out["score_bursts"]["peak_newest_on_tie"] = check_burst_peak_ties()
+
+    if "write_csv_topics" in stages:
+        path = workdir / "topics.csv"
+        out["write_csv_topics"] = measure(_quiet(lambda: analysis.write_csv_topics(topics_df, path)), repeat)
+    if "write_markdown" in stages:
+        path = workdir / "report.md"
+        out["write_markdown"] = measure(_quiet(lambda: analysis.write_markdown(QUERY, topics_df, rows, path)), repeat)
+    if "write_batch" in stages:
+        results = [(f"{QUERY} {i}", topics_df, rows[:analysis.SAMPLE_ARTICLES]) for i in range(BATCH_QUERIES)]
+        fmts = ("csv", "md", "jsonl")
+
+        def batch():
+            for q, df, sample in results:
+                slug = q.replace(" ", "_")
+                analysis.write_reports(q, df, sample, {f: workdir / f"{slug}.{f}" for f in fmts}, fmts)
+            analysis.write_combined(results, workdir / "combined", fmts)
+        out["write_batch"] = measure(_quiet(batch), repeat)
+    return out
+
+def bench_engine(corpus, rows: List[Dict], repeat: int) -> Dict:
+    """Paged ingest + topics() on a fresh CoTrendEngine, checked against score_corpus."""
+    import keyword_trending
+
+    now = datetime.now(timezone.utc)
+    res = measure(lambda: _engine_topics(rows, now), repeat)
+    res["parity"] = _same_topics(_engine_topics(rows, now),
+                                 keyword_trending.score_corpus(corpus, half_life_h=12.0, top_k=15, now=now))
+    # Small corpora are where equal scores (and so tie order in topics/variants) are common
+    small = [synthetic_rows(ENGINE_SMALL, seed=s) for s in range(ENGINE_SMALL_SEEDS)]
+    res["parity_small"] = all(
+        _same_topics(_engine_topics(r, now, page=7),
+                     keyword_trending.score_corpus(keyword_trending.build_corpus(QUERY, r),
+                                                   half_life_h=12.0, top_k=15, now=now))
+        for r in small)
+    return res
+
+def _engine_topics(rows: List[Dict], now: datetime, page: int = ENGINE_PAGE):
+    from cotrend_engine import CoTrendEngine
+
+    eng = CoTrendEngine(QUERY, half_life_h=12.0)
+    for i in range(0, len(rows), page):
+        eng.ingest(rows[i:i + page])
+    return eng.topics(15, now=now)
+
+def _same_topics(got, want) -> bool:
+    import numpy as np
+
+    return (list(got["topic"]) == list(want["topic"])
+            and list(got["variants"]) == list(want["variants"])
+            and list(got["count"]) == list(want["count"])
+            and np.allclose(got["score"].to_numpy(float), want["score"].to_numpy(float)))
+
+def check_burst_peak_ties() -> bool:
+    """A term with equal doc counts in two hourly bins must peak at the newer bin."""
+    import keyword_trending
+
+    now = datetime(2025, 1, 1, 12, 30, tzinfo=timezone.utc)
+    rows = [{"title": f"Zebra parade downtown {i}", "summary": "", "url": f"u{age}-{i}",
+             "source": "bench", "published_at": now - timedelta(hours=age)}
+            for age in (0, 2) for i in range(3)]
+    corpus = keyword_trending.build_corpus(QUERY, rows)
+    df = keyword_trending.score_bursts(corpus, top_k=1, window_h=48, min_docs=1, now=now)
+    return not df.empty and df["peak_time"].iloc[0] == "2025-01-01T12:00Z"
+
+def _env() -> Dict:
+    info = {"python": platform.python_version(), "platform": platform.platform()}
+    for mod in ("numpy", "pandas", "sklearn"):
+        try:
+            info[mod] = __import__(mod).__version__
+        except ImportError:
+            pass
+    try:
+        info["git"] = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                     text=True, timeout=5).stdout.strip() or None
+    except Exception:
+        info["git"] = None
+    return info
+
+def run(sizes: List[int], stages: List[str] = STAGES, repeat: int = 3) -> Dict:
+    res = {"env": _env(), "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "results": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            res["results"][str(n)] = bench_size(n, stages, max(1, repeat), Path(tmp))
+    return res
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", default="100,1000,10000", help="Comma-separated corpus sizes (up to 100000)")
+    ap.add_argument("--stages", default=",".join(STAGES), help="Subset of: " + ", ".join(STAGES))
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--out", default="")
+    args = ap.parse_args(argv)
+
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        ap.error(f"unknown stage(s): {', '.join(sorted(unknown))}")
+    sizes = [int(x) for x in args.sizes.split(",") if x.strip()]
+
+    res = run(sizes, stages, args.repeat)
+    text = json.dumps(res, indent=2)
+    print(text)
+    if args.out:
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.out).write_text(text, encoding="utf-8")
+
+if __name__ == "__main__":
+    sys.exit(main())
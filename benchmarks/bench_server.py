@@ -0,0 +1,98 @@
+# benchmarks/bench_server.py
+"""
+Requests/second for server.py under concurrent dashboard-style load, fully
+offline: the mock API (benchmarks/mock_api.py) stands in for both providers.
+
+    python -m benchmarks.bench_server --requests 400 --concurrency 16 --distinct 8 --out output/bench_server.json
+
+`--distinct` queries are requested round-robin, so the run shows cold misses,
+single-flight coalescing of identical in-flight requests and cache hits.
+Use `--url http://127.0.0.1:8787` to measure an already running server.
+"""
+import argparse, contextlib, json, sys, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+from benchmarks.load_fetch import mock_providers, percentile
+from benchmarks.mock_api import MockConfig, serve_in_thread
+
+@contextlib.contextmanager
+def _local_server() -> Iterator[str]:
+    """Mock providers + server.py on free ports; yields the server base URL."""
+    api_srv, _, api = serve_in_thread(MockConfig(latency_ms=80, jitter_ms=20))
+    try:
+        with mock_providers(api):
+            import server
+            srv = server.make_server("127.0.0.1", 0)
+            threading.Thread(target=srv.serve_forever, name="newstrend-api", daemon=True).start()
+            try:
+                yield f"http://127.0.0.1:{srv.server_address[1]}"
+            finally:
+                srv.shutdown(); srv.server_close()
+    finally:
+        api_srv.shutdown(); api_srv.server_close()
+
+def run(url: str, requests_n: int, concurrency: int, distinct: int, articles: int) -> Dict:
+    import requests
+
+    local = threading.local()
+    lat: List[float] = []
+    states: Dict[str, int] = {}
+    errors = 0
+    lock = threading.Lock()
+
+    def one(i: int):
+        nonlocal errors
+        s = getattr(local, "s", None) or requests.Session()
+        local.s = s
+        t = time.perf_counter()
+        r = s.get(f"{url}/cotrends", params={"q": f"dashboard {i % distinct}", "articles": articles}, timeout=120)
+        dt = time.perf_counter() - t
+        with lock:
+            if r.status_code == 200:
+                lat.append(dt)
+                k = r.headers.get("X-Cache", "?")
+                states[k] = states.get(k, 0) + 1
+            else:
+                errors += 1
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        list(ex.map(one, range(requests_n)))
+    wall = time.perf_counter() - t0
+
+    srv_stats = requests.get(f"{url}/stats", timeout=10).json()
+    return {
+        "requests": requests_n,
+        "concurrency": concurrency,
+        "distinct_queries": distinct,
+        "wall_s": round(wall, 3),
+        "requests_per_s": round(requests_n / wall, 1) if wall else None,
+        "latency_s": {"p50": round(percentile(lat, 50), 4), "p99": round(percentile(lat, 99), 4)},
+        "x_cache": states,
+        "errors": errors,
+        "server": srv_stats,
+    }
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--requests", type=int, default=400)
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--distinct", type=int, default=8, help="Distinct queries cycled through")
+    ap.add_argument("--articles", type=int, default=20, help="Articles per response")
+    ap.add_argument("--url", default="", help="Benchmark a running server instead of a local one")
+    ap.add_argument("--out", default="")
+    args = ap.parse_args(argv)
+
+    local = contextlib.nullcontext(args.url.rstrip("/")) if args.url else _local_server()
+    with local as url:
+        res = run(url, args.requests, max(1, args.concurrency), max(1, args.distinct), args.articles)
+    text = json.dumps(res, indent=2)
+    print(text)
+    if args.out:
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.out).write_text(text, encoding="utf-8")
+
+if __name__ == "__main__":
+    sys.exit(main())
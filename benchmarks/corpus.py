@@ -0,0 +1,102 @@
+# benchmarks/corpus.py
+"""
+Deterministic synthetic news corpus for offline benchmarks.
+
+Rows look like what `fetch_newsapi` / `fetch_serpapi_google_news` return:
+a handful of recurring storylines re-reported by many outlets (so topic
+scoring has signal and the merge step has syndicated near-duplicates),
+timestamps spread over the look-back window, and date strings in every
+format the providers send.
+"""
+from __future__ import annotations
+import random
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from article import Article
+
+_STORIES = [
+    ("storm", ["storm damage", "power outages", "emergency crews", "flood warning", "county officials"]),
+    ("council", ["city council", "budget vote", "property tax", "school board", "public hearing"]),
+    ("court", ["federal judge", "jury selection", "plea deal", "court filing", "defense attorney"]),
+    ("health", ["flu season", "hospital capacity", "vaccine clinic", "health department", "public health"]),
+    ("economy", ["interest rates", "job growth", "consumer prices", "small businesses", "supply chain"]),
+    ("sports", ["playoff game", "head coach", "season opener", "home crowd", "star quarterback"]),
+    ("tech", ["data breach", "cloud outage", "chip shortage", "software update", "privacy rules"]),
+    ("campus", ["university president", "tuition increase", "student housing", "campus police", "graduate workers"]),
+]
+_FILLER = ("residents said the situation was still developing as officials promised more "
+           "details later this week while neighbors shared photos and video online").split()
+_PLACES = ["Birmingham", "Mobile", "Huntsville", "Montgomery", "Tuscaloosa", "Auburn", "Dothan", "Decatur"]
+_SOURCES = [f"Outlet {i}" for i in range(60)] + ["AP", "Reuters", "AL.com", "WSFA", "WBRC"]
+
+def date_string(dt: datetime, rng: random.Random, now: datetime) -> str:
+    """One provider-style rendering of `dt` (ISO, SerpApi fixed, relative, or free-form)."""
+    k = rng.random()
+    if k < 0.40:
+        return dt.strftime("%Y-%m-%dT%H:%M:%SZ")                    # NewsAPI publishedAt
+    if k < 0.75:
+        return dt.strftime("%m/%d/%Y, %I:%M %p, +0000 UTC")         # SerpApi google_news
+    if k < 0.90:
+        hrs = max(1, int((now - dt).total_seconds() // 3600))
+        return f"{hrs} hours ago" if hrs < 48 else f"{hrs // 24} days ago"
+    if k < 0.97:
+        return dt.strftime("%b %d, %Y")                            # needs the generic fallback
+    return dt.strftime("%a, %d %b %Y %H:%M:%S +0000")              # RFC 2822
+
+def story_text(rng: random.Random, story: Optional[int] = None) -> Tuple[str, str]:
+    """(title, summary) for one of the recurring storylines (random unless given)."""
+    _, phrases = _STORIES[rng.randrange(len(_STORIES)) if story is None else story]
+    place = rng.choice(_PLACES)
+    title = f"{place} {rng.choice(phrases)} as {rng.choice(phrases)} continue"
+    words = [rng.choice(phrases) for _ in range(3)] + rng.sample(_FILLER, 12)
+    rng.shuffle(words)
+    return title.title(), f"In {place}, " + " ".join(words) + "."
+
+def pick_source(rng: random.Random) -> str:
+    return rng.choice(_SOURCES)
+
+def synthetic_rows(n: int, days: int = 7, seed: int = 0, syndication: float = 0.15,
+                   now: Optional[datetime] = None) -> List[Article]:
+    """
+    `n` Article rows, newest first. A `syndication` share of them are lightly
+    edited copies of an earlier row under another outlet and URL.
+    """
+    rng = random.Random(seed)
+    now = now or datetime.now(timezone.utc)
+    span = days * 86400
+    rows: List[Article] = []
+    for i in range(n):
+        pub = now - timedelta(seconds=int(span * rng.random() ** 1.5))  # skewed towards recent
+        src = pick_source(rng)
+        if rows and rng.random() < syndication:
+            base = rows[rng.randrange(len(rows))]
+            title, summary = base.title, base.summary.replace(" the ", " a ", 1)
+        else:
+            title, summary = story_text(rng)
+        url = f"https://news.example/{src.lower().replace(' ', '-')}/{i}"
+        rows.append(Article(title, url, summary, pub, rng.choice(["newsapi", "serpapi"])))
+    rows.sort(key=lambda r: r.published_at, reverse=True)
+    return rows
+
+def synthetic_date_strings(n: int, days: int = 7, seed: int = 0,
+                           now: Optional[datetime] = None) -> List[str]:
+    """Provider-style date strings with realistic repetition (minute resolution)."""
+    rng = random.Random(seed)
+    now = (now or datetime.now(timezone.utc)).replace(second=0, microsecond=0)
+    span = days * 1440
+    return [date_string(now - timedelta(minutes=int(span * rng.random())), rng, now) for _ in range(n)]
+
+def provider_split(rows: List[Article], seed: int = 0, overlap: float = 0.2) -> Tuple[List[Article], List[Article]]:
+    """Split rows into (newsapi, serpapi) groups sharing an `overlap` share of URLs."""
+    rng = random.Random(seed)
+    a, b = [], []
+    for r in rows:
+        k = rng.random()
+        if k < overlap:
+            a.append(r); b.append(r)
+        elif k < (1 + overlap) / 2:
+            a.append(r)
+        else:
+            b.append(r)
+    return a, b
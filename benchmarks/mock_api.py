@@ -0,0 +1,215 @@
+# benchmarks/mock_api.py
+"""
+Local stand-in for the SerpApi `google_news` and NewsAPI `everything`
+endpoints, for load-testing the fetch layer without the network.
+
+    python -m benchmarks.mock_api --port 8765 --latency-ms 80 --burst-rate 0.02
+    NEWSAPI_BASE=http://127.0.0.1:8765/v2/everything SERPAPI_BASE=http://127.0.0.1:8765/search.json python main.py ...
+
+Results are synthetic but deterministic per (query, page). Faults are injected
+as in production: bursts of 429 (with Retry-After) or 5xx responses, NewsAPI's
+426 `maximumResultsReached` past `max_results`, and a share of malformed dates.
+"""
+from __future__ import annotations
+import argparse, json, random, threading, time, zlib
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.corpus import date_string, pick_source, story_text
+
+NEWSAPI_PATH = "/v2/everything"
+SERPAPI_PATH = "/search.json"
+
+@dataclass
+class MockConfig:
+    latency_ms: float = 50.0          # mean per-request service time
+    jitter_ms: float = 25.0           # uniform +/- spread around the mean
+    burst_rate: float = 0.0           # chance that a request starts an error burst
+    burst_len: int = 3                # consecutive failing requests per burst
+    burst_status: Tuple[int, ...] = (429, 503)
+    retry_after_s: float = 1.0        # Retry-After sent with 429s
+    max_results: int = 100            # NewsAPI free-tier cap -> 426 maximumResultsReached
+    malformed_dates: float = 0.02     # share of items with an unparseable date
+    serp_pages: int = 5               # pages with results before SerpApi runs dry
+    seed: int = 0
+
+class MockState:
+    """Fault injection and counters, shared by the server's handler threads."""
+
+    def __init__(self, cfg: MockConfig):
+        self.cfg = cfg
+        self.rng = random.Random(cfg.seed)
+        self.lock = threading.Lock()
+        self.burst_left: Dict[str, int] = {}
+        self.burst_code: Dict[str, int] = {}
+        self.counts: Counter = Counter()
+
+    def fault(self, provider: str) -> Optional[int]:
+        with self.lock:
+            self.counts[f"{provider}_requests"] += 1
+            left = self.burst_left.get(provider, 0)
+            if left <= 0 and self.cfg.burst_rate and self.rng.random() < self.cfg.burst_rate:
+                left = self.cfg.burst_len
+                self.burst_code[provider] = self.rng.choice(self.cfg.burst_status)
+            if left > 0:
+                self.burst_left[provider] = left - 1
+                code = self.burst_code[provider]
+                self.counts[f"{provider}_{code}"] += 1
+                return code
+            return None
+
+    def delay(self) -> float:
+        with self.lock:
+            j = self.rng.uniform(-self.cfg.jitter_ms, self.cfg.jitter_ms)
+        return max(0.0, self.cfg.latency_ms + j) / 1000.0
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return dict(self.counts)
+
+def _items(query: str, page: int, n: int, malformed: float) -> list:
+    """n synthetic (title, url, snippet, published, date_str, source) tuples for one page."""
+    rng = random.Random(zlib.crc32(f"{query}|{page}".encode("utf-8")))
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    out = []
+    for i in range(n):
+        pos = (page - 1) * n + i
+        pub = now - timedelta(minutes=15 * pos + rng.randrange(15))   # newest first across pages
+        title, snippet = story_text(rng)
+        src = pick_source(rng)
+        date_str = "sometime last week??" if rng.random() < malformed else date_string(pub, rng, now)
+        out.append((f"{title} ({query})", f"https://news.example/{zlib.crc32(query.encode())}/{pos}",
+                    snippet, pub, date_str, src))
+    return out
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "MockNewsAPI/1.0"
+    state: MockState = None   # set by make_server
+
+    def log_message(self, fmt, *args):   # keep load tests quiet
+        pass
+
+    def _send(self, code: int, body: dict, headers: Dict[str, str] = None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        u = urlparse(self.path)
+        q = {k: v[-1] for k, v in parse_qs(u.query).items()}
+        provider = {NEWSAPI_PATH: "newsapi", SERPAPI_PATH: "serpapi"}.get(u.path)
+        if provider is None:
+            return self._send(404, {"status": "error", "message": f"unknown path {u.path}"})
+
+        st = self.state
+        time.sleep(st.delay())
+        code = st.fault(provider)
+        if code == 429:
+            return self._send(429, {"status": "error", "code": "rateLimited", "message": "Too many requests"},
+                              {"Retry-After": f"{st.cfg.retry_after_s:g}"})
+        if code:
+            return self._send(code, {"status": "error", "message": "Upstream unavailable"})
+
+        page = max(1, int(q.get("page", 1)))
+        if provider == "newsapi":
+            return self._newsapi(q, page)
+        return self._serpapi(q, page)
+
+    def _newsapi(self, q: dict, page: int):
+        cfg = self.state.cfg
+        size = max(1, min(100, int(q.get("pageSize", 100))))
+        if (page - 1) * size >= cfg.max_results:
+            return self._send(426, {
+                "status": "error", "code": "maximumResultsReached",
+                "message": f"You have requested too many results. Limited to {cfg.max_results}.",
+            })
+        n = min(size, cfg.max_results - (page - 1) * size)
+        arts = [{
+            "source": {"id": None, "name": src},
+            "author": "Staff",
+            "title": title, "description": snippet, "url": url,
+            "publishedAt": pub.strftime("%Y-%m-%dT%H:%M:%SZ") if not date_str.endswith("??") else date_str,
+            "content": snippet,
+        } for title, url, snippet, pub, date_str, src in _items(q.get("q", ""), page, n, cfg.malformed_dates)]
+        self._send(200, {"status": "ok", "totalResults": cfg.max_results, "articles": arts})
+
+    def _serpapi(self, q: dict, page: int):
+        cfg = self.state.cfg
+        if page > cfg.serp_pages:
+            return self._send(200, {"search_metadata": {"status": "Success"},
+                                    "error": "Google News hasn't returned any results for this query."})
+        n = max(1, int(q.get("num", 100)))
+        news = [{
+            "position": i + 1, "title": title, "link": url, "snippet": snippet,
+            "source": {"name": src}, "date": date_str,
+        } for i, (title, url, snippet, pub, date_str, src) in enumerate(
+            _items(q.get("q", ""), page, n, cfg.malformed_dates))]
+        self._send(200, {"search_metadata": {"status": "Success", "page": page}, "news_results": news})
+
+def make_server(cfg: MockConfig, host: str = "127.0.0.1", port: int = 0) -> Tuple[ThreadingHTTPServer, MockState]:
+    """Bound (not yet serving) server; port 0 picks a free one."""
+    state = MockState(cfg)
+    handler = type("Handler", (_Handler,), {"state": state})
+    srv = ThreadingHTTPServer((host, port), handler)
+    srv.daemon_threads = True
+    return srv, state
+
+def serve_in_thread(cfg: MockConfig, host: str = "127.0.0.1", port: int = 0):
+    """Start the server on a daemon thread; returns (server, state, base_url)."""
+    srv, state = make_server(cfg, host, port)
+    threading.Thread(target=srv.serve_forever, name="mock-api", daemon=True).start()
+    return srv, state, f"http://{host}:{srv.server_address[1]}"
+
+def add_args(ap: argparse.ArgumentParser) -> None:
+    d = MockConfig()
+    ap.add_argument("--latency-ms", type=float, default=d.latency_ms)
+    ap.add_argument("--jitter-ms", type=float, default=d.jitter_ms)
+    ap.add_argument("--burst-rate", type=float, default=d.burst_rate, help="Chance a request starts an error burst")
+    ap.add_argument("--burst-len", type=int, default=d.burst_len)
+    ap.add_argument("--burst-status", default="429,503", help="Status codes bursts draw from")
+    ap.add_argument("--retry-after", type=float, default=d.retry_after_s)
+    ap.add_argument("--max-results", type=int, default=d.max_results, help="NewsAPI cap before 426")
+    ap.add_argument("--malformed-dates", type=float, default=d.malformed_dates)
+    ap.add_argument("--serp-available-pages", type=int, default=d.serp_pages,
+                    help="SerpApi pages with results before it runs dry")
+    ap.add_argument("--seed", type=int, default=d.seed)
+
+def config_from_args(args) -> MockConfig:
+    return MockConfig(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        burst_rate=args.burst_rate, burst_len=args.burst_len,
+        burst_status=tuple(int(x) for x in args.burst_status.split(",") if x.strip()),
+        retry_after_s=args.retry_after, max_results=args.max_results,
+        malformed_dates=args.malformed_dates, serp_pages=args.serp_available_pages, seed=args.seed,
+    )
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    add_args(ap)
+    args = ap.parse_args(argv)
+    srv, state = make_server(config_from_args(args), args.host, args.port)
+    base = f"http://{args.host}:{srv.server_address[1]}"
+    print(f"Mock API on {base}")
+    print(f"  NEWSAPI_BASE={base}{NEWSAPI_PATH}")
+    print(f"  SERPAPI_BASE={base}{SERPAPI_PATH}")
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv.server_close()
+        print(json.dumps(state.stats(), indent=2))
+
+if __name__ == "__main__":
+    main()
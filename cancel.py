@@ -0,0 +1,72 @@
+# cancel.py
+from __future__ import annotations
+import contextvars, threading, time
+from concurrent.futures import Future, wait
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+# Cooperative cancellation. A run installs a CancelToken with `scope()`; the
+# fetch loops, HTTP layer, retry/rate-limit sleeps and scoring stages call
+# `check()` between units of work. Like metrics, the token lives in a context
+# variable, so pool submissions wrapped with `metrics.bind` inherit it.
+
+_current: contextvars.ContextVar[Optional["CancelToken"]] = contextvars.ContextVar("newstrend_cancel", default=None)
+
+POLL_S = 0.1   # how often blocking waits look at the token
+
+class Cancelled(Exception):
+    """The run was cancelled by its owner."""
+
+class CancelToken:
+    def __init__(self):
+        self._event = threading.Event()
+        self.reason = ""
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        self.reason = reason
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def check(self) -> None:
+        if self._event.is_set():
+            raise Cancelled(self.reason)
+
+    def sleep(self, seconds: float) -> None:
+        """time.sleep that returns early (raising Cancelled) once cancelled."""
+        if self._event.wait(max(0.0, seconds)):
+            raise Cancelled(self.reason)
+
+def current() -> Optional[CancelToken]:
+    return _current.get()
+
+@contextmanager
+def scope(token: CancelToken) -> Iterator[CancelToken]:
+    t = _current.set(token)
+    try:
+        yield token
+    finally:
+        _current.reset(t)
+
+def check() -> None:
+    tok = _current.get()
+    if tok is not None:
+        tok.check()
+
+def sleep(seconds: float) -> None:
+    tok = _current.get()
+    if tok is None:
+        time.sleep(seconds)
+    else:
+        tok.sleep(seconds)
+
+def result(fut: Future) -> Any:
+    """fut.result(), but give up with Cancelled as soon as the current run is cancelled."""
+    tok = _current.get()
+    if tok is None:
+        return fut.result()
+    while not wait([fut], timeout=POLL_S).done:
+        tok.check()
+    return fut.result()
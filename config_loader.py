@@ -1,18 +1,9 @@
+# config_loader.py
 import os, sys
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from dotenv import load_dotenv
-
-# def load_env_near_exe(require_local: bool = True):
-#    base = Path(sys.executable).parent if getattr(sys, "frozen", False) else Path(__file__).resolve().parent
-#    env_path = base / ".env"
-#    if env_path.exists():
-#        load_dotenv(dotenv_path=env_path, override=True)
-#    elif require_local:
-#        for k in ("SERPAPI_API_KEY", "NEWSAPI_KEY"):
-#            os.environ.pop(k, None)
-# config_env.py
-import os, sys
-from pathlib import Path
+from typing import Any, Dict, Optional
 
 def _mask(v: str) -> str:
     if not v: return ""
@@ -71,4 +62,196 @@ def load_env_near_exe(require_local: bool = True, verbose: bool = False):
         print("[ENV] NEWSAPI_KEY   source:", info["sources"]["NEWSAPI_KEY"],
               " value:", _mask(os.getenv("NEWSAPI_KEY", "")))
 
-    return info
\ No newline at end of file
+    return info
+
+def app_dir() -> Path:
+    # when frozen, use the folder containing the .exe
+    return Path(sys.executable).parent if getattr(sys, "frozen", False) else Path(__file__).resolve().parent
+
+def _env_str(name: str, default: str = "") -> str:
+    return os.getenv(name, default)
+
+def _env_int(name: str, default: int) -> int:
+    return int(float(os.getenv(name, str(default))))
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, str(default)))
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, "1" if default else "0").lower() in ("1", "true", "yes")
+
+@dataclass(frozen=True)
+class Settings:
+    """Every tunable the app reads from the environment / sibling .env, parsed once."""
+    # Providers
+    newsapi_key: str = ""
+    serpapi_api_key: str = ""
+    newsapi_base: str = "https://newsapi.org/v2/everything"
+    serpapi_base: str = "https://serpapi.com/search.json"
+    newsapi_sources: Optional[str] = None
+    newsapi_domains: Optional[str] = None
+    newsapi_search_in: str = "title,description"
+    newsapi_max_results: int = 100
+    serpapi_num: int = 100
+    serpapi_pages: int = 2
+    serpapi_phrase: bool = False
+    keep_raw: bool = False
+    near_dup_threshold: float = 0.8
+    ngram_collapse_ratio: float = 0.8
+    request_timeout: int = 20
+    newsapi_concurrency: int = 2
+    serpapi_concurrency: int = 2
+    date_cache_size: int = 65536
+
+    # HTTP pool + response cache
+    http_pool_size: int = 10
+    http_user_agent: str = "NewsTrend/1.0"
+    http_retries: int = 4
+    http_retry_min_s: float = 2.0
+    http_retry_max_s: float = 30.0
+
+    # Per-provider pacing (token bucket) and daily request quotas (0 = unlimited)
+    newsapi_rate: float = 5.0
+    newsapi_burst: int = 5
+    serpapi_rate: float = 5.0
+    serpapi_burst: int = 5
+    newsapi_daily_quota: int = 0
+    serpapi_daily_quota: int = 0
+    rate_limit_max_wait_s: float = 120.0
+    quota_path: str = ""
+    http_cache: bool = True
+    http_cache_path: str = ""
+    http_cache_max_entries: int = 2000
+    http_cache_max_mb: float = 200.0
+    http_cache_swr: float = 0.0
+    http_cache_ttl_newsapi: float = 900.0
+    http_cache_ttl_serpapi: float = 900.0
+
+    # Incremental article store
+    article_store: bool = False
+    article_store_path: str = ""
+    article_store_overlap_min: float = 30.0
+    article_store_keep_days: int = 30
+
+    # Broad mode
+    rake_workers: int = 0
+    rake_chunk_size: int = 500
+    rake_parallel_min: int = 2000
+    nltk_auto_download: bool = True
+
+    # Run defaults
+    lang: str = "en"
+    days: int = 7
+    top_k: int = 15
+    half_life_h: float = 36.0
+    news_max_pages: int = 2
+    news_page_size: int = 100
+    report_formats: str = "csv,md"
+
+    # Batch runs
+    batch_workers: int = 4
+    watch_interval_s: float = 900.0
+    corpus_cache_size: int = 8
+    corpus_ttl_s: float = 900.0
+    burst_bin_h: float = 1.0
+    burst_window_h: float = 6.0
+    burst_min_docs: int = 2
+    server_port: int = 8787
+    server_cache_size: int = 256
+    server_cache_ttl_s: float = 300.0
+    watch_jitter: float = 0.1
+
+    # GUI
+    startup_target_ms: float = 1500.0
+    gui_workers: int = 3
+
+    app_dir: Path = field(default_factory=app_dir)
+    env_info: Dict[str, Any] = field(default_factory=dict, compare=False, repr=False)
+
+    @property
+    def output_dir(self) -> Path:
+        return self.app_dir / "output"
+
+    @classmethod
+    def from_env(cls, env_info: Optional[Dict[str, Any]] = None) -> "Settings":
+        base = app_dir()
+        return cls(
+            newsapi_key=_env_str("NEWSAPI_KEY"),
+            serpapi_api_key=_env_str("SERPAPI_API_KEY"),
+            newsapi_base=_env_str("NEWSAPI_BASE", cls.newsapi_base),
+            serpapi_base=_env_str("SERPAPI_BASE", cls.serpapi_base),
+            newsapi_sources=_env_str("NEWSAPI_SOURCES") or None,
+            newsapi_domains=_env_str("NEWSAPI_DOMAINS") or None,
+            newsapi_search_in=_env_str("NEWSAPI_SEARCH_IN", cls.newsapi_search_in),
+            newsapi_max_results=_env_int("NEWSAPI_MAX_RESULTS", cls.newsapi_max_results),
+            serpapi_num=_env_int("SERPAPI_NUM", cls.serpapi_num),
+            serpapi_pages=_env_int("SERPAPI_PAGES", cls.serpapi_pages),
+            serpapi_phrase=_env_bool("SERPAPI_PHRASE", cls.serpapi_phrase),
+            near_dup_threshold=_env_float("NEAR_DUP_THRESHOLD", cls.near_dup_threshold),
+            ngram_collapse_ratio=_env_float("NGRAM_COLLAPSE_RATIO", cls.ngram_collapse_ratio),
+            keep_raw=_env_bool("KEEP_RAW", cls.keep_raw),
+            request_timeout=_env_int("REQUEST_TIMEOUT", cls.request_timeout),
+            newsapi_concurrency=max(1, _env_int("NEWSAPI_CONCURRENCY", cls.newsapi_concurrency)),
+            serpapi_concurrency=max(1, _env_int("SERPAPI_CONCURRENCY", cls.serpapi_concurrency)),
+            date_cache_size=_env_int("DATE_CACHE_SIZE", cls.date_cache_size),
+            http_pool_size=max(1, _env_int("HTTP_POOL_SIZE", cls.http_pool_size)),
+            http_user_agent=_env_str("HTTP_USER_AGENT", cls.http_user_agent),
+            http_retries=max(1, _env_int("HTTP_RETRIES", cls.http_retries)),
+            http_retry_min_s=_env_float("HTTP_RETRY_MIN_S", cls.http_retry_min_s),
+            http_retry_max_s=_env_float("HTTP_RETRY_MAX_S", cls.http_retry_max_s),
+            newsapi_rate=_env_float("NEWSAPI_RATE", cls.newsapi_rate),
+            newsapi_burst=max(1, _env_int("NEWSAPI_BURST", cls.newsapi_burst)),
+            serpapi_rate=_env_float("SERPAPI_RATE", cls.serpapi_rate),
+            serpapi_burst=max(1, _env_int("SERPAPI_BURST", cls.serpapi_burst)),
+            newsapi_daily_quota=_env_int("NEWSAPI_DAILY_QUOTA", cls.newsapi_daily_quota),
+            serpapi_daily_quota=_env_int("SERPAPI_DAILY_QUOTA", cls.serpapi_daily_quota),
+            rate_limit_max_wait_s=_env_float("RATE_LIMIT_MAX_WAIT_S", cls.rate_limit_max_wait_s),
+            quota_path=_env_str("QUOTA_PATH") or str(base / "output" / "quota.sqlite"),
+            http_cache=_env_bool("HTTP_CACHE", cls.http_cache),
+            http_cache_path=_env_str("HTTP_CACHE_PATH") or str(base / "output" / ".http_cache.sqlite"),
+            http_cache_max_entries=_env_int("HTTP_CACHE_MAX_ENTRIES", cls.http_cache_max_entries),
+            http_cache_max_mb=_env_float("HTTP_CACHE_MAX_MB", cls.http_cache_max_mb),
+            http_cache_swr=_env_float("HTTP_CACHE_SWR", cls.http_cache_swr),
+            http_cache_ttl_newsapi=_env_float("HTTP_CACHE_TTL_NEWSAPI", cls.http_cache_ttl_newsapi),
+            http_cache_ttl_serpapi=_env_float("HTTP_CACHE_TTL_SERPAPI", cls.http_cache_ttl_serpapi),
+            article_store=_env_bool("ARTICLE_STORE", cls.article_store),
+            article_store_path=_env_str("ARTICLE_STORE_PATH") or str(base / "output" / "articles.sqlite"),
+            article_store_overlap_min=_env_float("ARTICLE_STORE_OVERLAP_MIN", cls.article_store_overlap_min),
+            article_store_keep_days=max(1, _env_int("ARTICLE_STORE_KEEP_DAYS", cls.article_store_keep_days)),
+            rake_workers=_env_int("RAKE_WORKERS", cls.rake_workers),
+            rake_chunk_size=max(1, _env_int("RAKE_CHUNK_SIZE", cls.rake_chunk_size)),
+            rake_parallel_min=_env_int("RAKE_PARALLEL_MIN", cls.rake_parallel_min),
+            nltk_auto_download=_env_bool("NLTK_AUTO_DOWNLOAD", cls.nltk_auto_download),
+            lang=_env_str("LANG", cls.lang),
+            days=_env_int("DAYS", cls.days),
+            top_k=_env_int("TOP_K", cls.top_k),
+            half_life_h=_env_float("HALF_LIFE_H", cls.half_life_h),
+            news_max_pages=_env_int("NEWS_MAX_PAGES", cls.news_max_pages),
+            news_page_size=_env_int("NEWS_PAGE_SIZE", cls.news_page_size),
+            report_formats=_env_str("REPORT_FORMATS", cls.report_formats),
+            server_port=_env_int("SERVER_PORT", cls.server_port),
+            server_cache_size=max(1, _env_int("SERVER_CACHE_SIZE", cls.server_cache_size)),
+            server_cache_ttl_s=_env_float("SERVER_CACHE_TTL_S", cls.server_cache_ttl_s),
+            corpus_cache_size=max(1, _env_int("CORPUS_CACHE_SIZE", cls.corpus_cache_size)),
+            corpus_ttl_s=_env_float("CORPUS_TTL_S", cls.corpus_ttl_s),
+            burst_bin_h=max(0.05, _env_float("BURST_BIN_H", cls.burst_bin_h)),
+            burst_window_h=max(0.05, _env_float("BURST_WINDOW_H", cls.burst_window_h)),
+            burst_min_docs=max(1, _env_int("BURST_MIN_DOCS", cls.burst_min_docs)),
+            watch_interval_s=max(1.0, _env_float("WATCH_INTERVAL_S", cls.watch_interval_s)),
+            watch_jitter=min(0.9, max(0.0, _env_float("WATCH_JITTER", cls.watch_jitter))),
+            batch_workers=max(1, _env_int("BATCH_WORKERS", cls.batch_workers)),
+            startup_target_ms=_env_float("STARTUP_TARGET_MS", cls.startup_target_ms),
+            gui_workers=max(1, _env_int("GUI_WORKERS", cls.gui_workers)),
+            app_dir=base,
+            env_info=dict(env_info or {}),
+        )
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """
+    Load the sibling .env exactly once and freeze the result. Every module
+    (CLI, GUI, fetch layer) reads its configuration from this object.
+    """
+    info = load_env_near_exe(require_local=True,  # require a sibling .env
+                             verbose=("--debug-env" in sys.argv))
+    return Settings.from_env(info)
@@ -0,0 +1,178 @@
+# cotrend_engine.py
+from __future__ import annotations
+from collections import Counter
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from keyword_trending import (MAX_FEATURES, MIN_DF, NGRAM_RANGE, TOPIC_COLUMNS, _build_docs,
+                              _default_stop_terms, top_collapsed)
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+class CoTrendEngine:
+    """
+    Incremental version of `co_trending_topics` scoring for one query.
+
+    Keeps every document's term counts against a growing vocabulary plus
+    running document and corpus term frequencies, so ingesting new articles
+    costs O(new docs) and no text is analysed twice. `topics()` then does what
+    the batch path does on the same rows: min_df / max_features selection,
+    L2-normalisation with the current idf, recency decay against one `now`,
+    and only then the seed/stop-term filter. It returns the same
+    ['topic','score','count','variants'] frame as `co_trending_topics`.
+    """
+
+    def __init__(self, query: str, half_life_h: float = 36.0, ngram_range: tuple = NGRAM_RANGE,
+                 min_df: int = MIN_DF, max_features: int = MAX_FEATURES, stop_terms: Optional[set] = None):
+        from sklearn.feature_extraction.text import CountVectorizer
+
+        self.query = query
+        self.half_life_h = max(float(half_life_h), 1e-6)
+        self.ngram_range = ngram_range
+        self.min_df = min_df
+        self.max_features = max_features
+        self.stop_terms = set(stop_terms) if stop_terms is not None else _default_stop_terms(query)
+        self._analyze = CountVectorizer(
+            lowercase=True,
+            stop_words="english",
+            ngram_range=ngram_range,
+            token_pattern=r"(?u)\b[a-zA-Z][a-zA-Z]+\b",
+        ).build_analyzer()
+
+        self.vocab: Dict[str, int] = {}
+        self._terms: List[str] = []
+        self._keep: List[bool] = []       # not a seed/stop term
+        self._df: List[int] = []          # live docs containing the term
+        self._tf: List[int] = []          # corpus term count (for max_features)
+        self._prefix: List[int] = []      # vocab ids of each term's leading / trailing (n-1)-gram
+        self._suffix: List[int] = []
+        # url (else title) -> (term ids, counts, published epoch seconds or NaN)
+        self._docs: Dict[str, Tuple[List[int], List[int], float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def _term_id(self, term: str) -> int:
+        i = self.vocab.get(term)
+        if i is None:
+            i = self.vocab[term] = len(self._terms)
+            self._terms.append(term)
+            self._keep.append(not any(tok in self.stop_terms for tok in term.split()))
+            self._df.append(0)
+            self._tf.append(0)
+        return i
+
+    def _affixes(self):
+        import numpy as np
+
+        # Terms are only ever appended and a doc's sub-grams arrive with it, so extend, never rebuild
+        get = self.vocab.get
+        for t in self._terms[len(self._prefix):]:
+            self._prefix.append(get(t.rsplit(" ", 1)[0], -1) if " " in t else -1)
+            self._suffix.append(get(t.split(" ", 1)[1], -1) if " " in t else -1)
+        return np.asarray(self._prefix, dtype=np.intp), np.asarray(self._suffix, dtype=np.intp)
+
+    def ingest(self, rows: Iterable[dict]) -> int:
+        """Add unseen rows (by URL, else title). Returns how many documents were new."""
+        fresh, keys, seen = [], [], set()
+        for r in rows:
+            key = r.get("url") or r.get("title")
+            if key and key not in self._docs and key not in seen:
+                seen.add(key)
+                fresh.append(r)
+                keys.append(key)
+        if not fresh:
+            return 0
+        from article_batch import ArticleBatch
+
+        batch = ArticleBatch.from_rows(fresh)
+        docs, keep = _build_docs(batch)   # rows without text are not documents, as in the batch path
+        times = batch.epoch_seconds()[keep].tolist()
+        for text, pos, ts in zip(docs, keep, times):
+            counts = Counter(self._analyze(text))
+            ids = [self._term_id(t) for t in counts]
+            for i, c in zip(ids, counts.values()):
+                self._df[i] += 1
+                self._tf[i] += c
+            self._docs[keys[pos]] = (ids, list(counts.values()), ts)
+        return len(docs)
+
+    def retain(self, rows: Iterable[dict]) -> int:
+        """Forget documents not among `rows` (e.g. aged out of the window). Returns how many were dropped."""
+        live = {r.get("url") or r.get("title") for r in rows}
+        gone = [k for k in self._docs if k not in live]
+        for k in gone:
+            ids, counts, _ = self._docs.pop(k)
+            for i, c in zip(ids, counts):
+                self._df[i] -= 1
+                self._tf[i] -= c
+        return len(gone)
+
+    def _features(self, n: int) -> "np.ndarray":
+        """TfidfVectorizer's vocabulary for the current docs, as a mask over the engine's terms."""
+        import numpy as np
+
+        df = np.asarray(self._df, dtype=np.int64)
+        # Same small-corpus leniency as co_trending_topics
+        min_df = 1 if n < 25 else self.min_df
+        max_n = 2 if n < 25 else self.ngram_range[1]
+        mask = df >= max(min_df, 1)
+        if max_n < self.ngram_range[1]:
+            mask &= np.fromiter((t.count(" ") < max_n for t in self._terms), dtype=bool, count=len(self._terms))
+        if self.max_features and mask.sum() > self.max_features:
+            # sklearn ranks the alphabetically sorted vocabulary by corpus count; same order, same ties
+            cand = np.asarray(sorted(np.flatnonzero(mask).tolist(), key=self._terms.__getitem__), dtype=np.intp)
+            tf = np.asarray(self._tf, dtype=np.int64)[cand]
+            mask = np.zeros_like(mask)
+            mask[cand[(-tf).argsort()[: self.max_features]]] = True
+        return mask
+
+    def topics(self, top_k: int = 15, now: Optional[datetime] = None,
+               half_life_h: Optional[float] = None) -> "pd.DataFrame":
+        """Current ranking; `half_life_h` overrides the engine's half-life for this read."""
+        import numpy as np
+        import pandas as pd
+        from scipy import sparse
+
+        empty = pd.DataFrame(columns=TOPIC_COLUMNS)
+        n = len(self._docs)
+        if not n or not self._terms:
+            return empty
+
+        feat = self._features(n)
+        if not feat.any():
+            return empty
+        df = np.asarray(self._df, dtype=np.int64)
+        idf = np.where(feat, np.log((1 + n) / (1 + df)) + 1.0, 0.0)
+
+        docs = list(self._docs.values())
+        lens = np.fromiter((len(d[0]) for d in docs), dtype=np.intp, count=n)
+        indptr = np.concatenate([[0], np.cumsum(lens)])
+        indices = np.fromiter((i for d in docs for i in d[0]), dtype=np.intp, count=int(indptr[-1]))
+        counts = np.fromiter((c for d in docs for c in d[1]), dtype=np.float64, count=int(indptr[-1]))
+        X = sparse.csr_matrix((counts * idf[indices], indices, indptr), shape=(n, len(self._terms)))
+
+        # L2 rows over the selected features (other columns carry idf 0), then decay per doc
+        norms = np.sqrt(np.asarray(X.multiply(X).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        now_ts = (now or datetime.now(timezone.utc)).timestamp()
+        t = np.fromiter((d[2] for d in docs), dtype=np.float64, count=n)
+        hours = np.clip(np.nan_to_num((now_ts - t) / 3600.0, nan=0.0), 0.0, None)
+        hl = self.half_life_h if half_life_h is None else max(float(half_life_h), 1e-6)
+        scores = X.T.dot(0.5 ** (hours / hl) / norms)
+
+        # Seed/stop terms only leave the candidates after feature selection, as in score_corpus
+        cand = feat & np.asarray(self._keep, dtype=bool)
+        if not cand.any():
+            return empty
+        vocab = np.asarray(self._terms, dtype=object)
+        top, variants = top_collapsed(cand, scores, df, self._affixes(), vocab, top_k)
+        m = scores[cand].max()
+        return pd.DataFrame({
+            "topic": vocab[top],
+            "score": scores[top] / m * 10.0 if m > 0 else scores[top],
+            "count": df[top].astype(int),
+            "variants": variants,
+        })
@@ -0,0 +1,97 @@
+# dedup.py
+from __future__ import annotations
+import re, zlib
+from typing import List, Sequence
+
+import numpy as np
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_PRIME = np.uint64((1 << 31) - 1)
+_CHUNK_DOCS = 2000   # bounds the (num_perm x shingles) working matrix
+
+def _shingles(text: str, k: int) -> List[int]:
+    words = _WORD_RE.findall(text.lower())
+    if not words:
+        return []
+    if len(words) <= k:
+        return [zlib.crc32(" ".join(words).encode("utf-8"))]
+    return list({zlib.crc32(" ".join(words[i:i + k]).encode("utf-8")) for i in range(len(words) - k + 1)})
+
+def minhash_signatures(texts: Sequence[str], num_perm: int = 64, shingle: int = 3,
+                       seed: int = 7) -> np.ndarray:
+    """(n_docs, num_perm) MinHash signatures over word shingles; all-max rows for empty texts."""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, int(_PRIME), size=(num_perm, 1), dtype=np.uint64)
+    b = rng.integers(0, int(_PRIME), size=(num_perm, 1), dtype=np.uint64)
+    sig = np.full((len(texts), num_perm), np.iinfo(np.uint64).max, dtype=np.uint64)
+
+    for start in range(0, len(texts), _CHUNK_DOCS):
+        sh = [_shingles(t, shingle) for t in texts[start:start + _CHUNK_DOCS]]
+        lens = np.fromiter((len(x) for x in sh), dtype=np.int64, count=len(sh))
+        if not lens.any():
+            continue
+        x = np.fromiter((h for s in sh for h in s), dtype=np.uint64, count=int(lens.sum())) % _PRIME
+        hashed = (a * x[None, :] + b) % _PRIME            # one permutation per row
+        nz = np.flatnonzero(lens)
+        offsets = np.concatenate(([0], np.cumsum(lens)[:-1]))[nz]
+        sig[start + nz] = np.minimum.reduceat(hashed, offsets, axis=1).T
+    return sig
+
+def near_duplicate_labels(texts: Sequence[str], threshold: float = 0.8, num_perm: int = 64,
+                          bands: int = 16, shingle: int = 3) -> np.ndarray:
+    """
+    Cluster label per text (the index of the cluster's first member). Candidates
+    come from banded LSH buckets and are confirmed by estimated Jaccard >= threshold,
+    so the whole pass is roughly linear in the number of texts.
+    """
+    n = len(texts)
+    parent = np.arange(n)
+    if n < 2:
+        return parent
+    rows = max(1, num_perm // bands)
+    sig = minhash_signatures(texts, num_perm=bands * rows, shingle=shingle)
+    empty = sig[:, 0] == np.iinfo(np.uint64).max
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for band in range(bands):
+        chunk = np.ascontiguousarray(sig[:, band * rows:(band + 1) * rows])
+        buckets = {}
+        for i in range(n):
+            if empty[i]:
+                continue
+            key = chunk[i].tobytes()
+            head = buckets.setdefault(key, i)
+            if head == i:
+                continue
+            ri, rh = find(i), find(head)
+            if ri != rh and np.mean(sig[i] == sig[head]) >= threshold:
+                # keep the earlier row as the cluster root so input order picks the representative
+                parent[max(ri, rh)] = min(ri, rh)
+
+    return np.fromiter((find(i) for i in range(n)), dtype=np.int64, count=n)
+
+def collapse_near_duplicates(rows: Sequence, threshold: float = 0.8,
+                             num_perm: int = 64, bands: int = 16) -> List:
+    """
+    Keep one row per near-duplicate cluster (the first in input order, i.e. the
+    newest for date-sorted rows) and record the cluster size on `syndication`.
+    """
+    if len(rows) < 2:
+        return list(rows)
+    texts = [f"{r.get('title', '')} {r.get('summary', '')}" for r in rows]
+    labels = near_duplicate_labels(texts, threshold=threshold, num_perm=num_perm, bands=bands)
+    sizes = np.bincount(labels, minlength=len(rows))
+    out = []
+    for i, r in enumerate(rows):
+        if labels[i] == i:
+            if isinstance(r, dict):
+                r["syndication"] = int(sizes[i])
+            else:
+                r.syndication = int(sizes[i])
+            out.append(r)
+    return out
@@ -0,0 +1,276 @@
+# gui_table.py
+"""
+Virtualized Treeview for large result sets.
+
+The widget only ever holds as many Treeview items as fit on screen; scrolling
+rewrites those items from an in-memory model instead of creating one item per
+row. Sorting reorders an index list in the model (no per-cell `tree.set` /
+`tree.move` calls), and `set_rows` formats incoming rows in chunks scheduled
+with `after()` so the event loop keeps running while thousands load.
+"""
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+from tkinter import ttk
+
+@dataclass
+class Column:
+    name: str
+    width: int = 120
+    anchor: str = "w"
+    stretch: bool = False
+    numeric: bool = False
+
+def _num(s) -> float:
+    try:
+        return float(s)
+    except (TypeError, ValueError):
+        return 0.0
+
+class TableModel:
+    """Display cells plus per-row payloads, viewed through a sortable index list."""
+
+    def __init__(self, columns: Sequence[Column]):
+        self.columns = list(columns)
+        self.cells: List[Tuple] = []
+        self.payloads: List[Any] = []
+        self.order: List[int] = []
+        self.sort_col: Optional[int] = None
+        self.descending = False
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def clear(self) -> None:
+        self.cells, self.payloads, self.order = [], [], []
+        self.sort_col, self.descending = None, False
+
+    def extend(self, cells: List[Tuple], payloads: List[Any]) -> None:
+        start = len(self.cells)
+        self.cells.extend(cells)
+        self.payloads.extend(payloads)
+        self.order.extend(range(start, len(self.cells)))
+        if self.sort_col is not None:
+            self._apply_sort()
+
+    def sort(self, col: int) -> None:
+        """Sort by column `col`; a second sort on the same column flips the direction."""
+        self.descending = (not self.descending) if self.sort_col == col else False
+        self.sort_col = col
+        self._apply_sort()
+
+    def _apply_sort(self) -> None:
+        c, cells = self.sort_col, self.cells
+        if self.columns[c].numeric:
+            key = lambda i: _num(cells[i][c])
+        else:
+            key = lambda i: str(cells[i][c]).lower()
+        # Stable sort of the arrival order, so ties keep the producer's ranking
+        self.order = sorted(range(len(cells)), key=key, reverse=self.descending)
+
+    def row(self, pos: int) -> Tuple:
+        return self.cells[self.order[pos]]
+
+    def payload(self, pos: int) -> Any:
+        return self.payloads[self.order[pos]]
+
+class VirtualTable(ttk.Frame):
+    """
+    Treeview + scrollbar over a TableModel.
+
+    `render(row) -> tuple` turns a source row into display cells and
+    `payload(row)` picks what `on_activate` receives on double-click/Enter.
+    """
+
+    STRIPES = ("#ffffff", "#f8f9fb")
+
+    def __init__(self, master, columns: Sequence[Column], render: Callable[[Any], Tuple],
+                 payload: Callable[[Any], Any] = None, on_activate: Callable[[Any], None] = None,
+                 chunk: int = 500, height: int = 10):
+        super().__init__(master)
+        self.model = TableModel(columns)
+        self.render = render
+        self.payload_of = payload or (lambda r: r)
+        self.on_activate = on_activate
+        self.chunk = max(1, int(chunk))
+        self.top = 0                    # model position shown in the first slot
+        self.selected: Optional[int] = None
+        self._visible = height
+        self._slots: List[str] = []
+        self._pending: Optional[str] = None
+        self._backlog: List[Any] = []
+        self._done: List[Callable[[], None]] = []
+        self._syncing = False
+
+        names = [c.name for c in columns]
+        self.tree = ttk.Treeview(self, columns=names, show="headings", height=height, selectmode="browse")
+        for i, c in enumerate(columns):
+            self.tree.heading(c.name, text=c.name.capitalize(), command=lambda i=i: self.sort(i))
+            self.tree.column(c.name, width=c.width, anchor=c.anchor, stretch=c.stretch)
+        self.tree.tag_configure("evenrow", background=self.STRIPES[0])
+        self.tree.tag_configure("oddrow", background=self.STRIPES[1])
+        self.vsb = ttk.Scrollbar(self, orient="vertical", command=self._yview)
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.vsb.grid(row=0, column=1, sticky="ns")
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        t = self.tree
+        t.bind("<Configure>", self._on_resize)
+        t.bind("<<TreeviewSelect>>", self._on_select)
+        t.bind("<MouseWheel>", lambda e: self._scroll(-1 if e.delta > 0 else 1, "units", 3))
+        t.bind("<Button-4>", lambda e: self._scroll(-1, "units", 3))
+        t.bind("<Button-5>", lambda e: self._scroll(1, "units", 3))
+        t.bind("<Up>", lambda e: self._move_selection(-1))
+        t.bind("<Down>", lambda e: self._move_selection(1))
+        t.bind("<Prior>", lambda e: self._move_selection(-self._visible))
+        t.bind("<Next>", lambda e: self._move_selection(self._visible))
+        t.bind("<Home>", lambda e: self._select(0))
+        t.bind("<End>", lambda e: self._select(len(self.model) - 1))
+        t.bind("<Double-1>", self._activate)
+        t.bind("<Return>", self._activate)
+
+    # ---------- data ----------
+    def clear(self) -> None:
+        self._cancel_pending()
+        self.model.clear()
+        self.top, self.selected = 0, None
+        for c in self.model.columns:
+            self.tree.heading(c.name, text=c.name.capitalize())
+        self._refresh()
+
+    def set_rows(self, rows: Sequence[Any], done: Callable[[], None] = None) -> None:
+        """Replace the contents (keeping the current sort), formatting `chunk` rows per event-loop turn."""
+        self._cancel_pending()
+        sort = self.model.sort_col, self.model.descending
+        self.model.clear()
+        self.model.sort_col, self.model.descending = sort
+        self.top, self.selected = 0, None
+        self.append_rows(rows, done)
+
+    def append_rows(self, rows: Sequence[Any], done: Callable[[], None] = None) -> None:
+        """Queue rows behind any still being loaded; `done` runs once all of them are in."""
+        self._backlog.extend(rows)
+        if done:
+            self._done.append(done)
+        if self._pending is None:
+            self._step()
+
+    def _step(self) -> None:
+        part, self._backlog = self._backlog[:self.chunk], self._backlog[self.chunk:]
+        keep = None if self.selected is None else self.model.order[self.selected]
+        self.model.extend([self.render(r) for r in part], [self.payload_of(r) for r in part])
+        if keep is not None and self.model.sort_col is not None:
+            self.selected = self.model.order.index(keep)
+        self._refresh()
+        if self._backlog:
+            self._pending = self.after(1, self._step)
+        else:
+            self._pending = None
+            done, self._done = self._done, []
+            for fn in done:
+                fn()
+
+    def _cancel_pending(self) -> None:
+        if self._pending is not None:
+            self.after_cancel(self._pending)
+            self._pending = None
+        self._backlog, self._done = [], []
+
+    def loading(self) -> bool:
+        return self._pending is not None
+
+    def selected_payload(self) -> Any:
+        return None if self.selected is None else self.model.payload(self.selected)
+
+    # ---------- sorting ----------
+    def sort(self, col: int) -> None:
+        keep = None if self.selected is None else self.model.order[self.selected]
+        self.model.sort(col)
+        for i, c in enumerate(self.model.columns):
+            arrow = (" ▼" if self.model.descending else " ▲") if i == col else ""
+            self.tree.heading(c.name, text=c.name.capitalize() + arrow)
+        self.top = 0
+        if keep is None:
+            self._refresh()
+        else:
+            self._select(self.model.order.index(keep))   # follow the selected row to its new place
+
+    # ---------- viewport ----------
+    def _on_resize(self, event) -> None:
+        rh = int(ttk.Style(self).lookup("Treeview", "rowheight") or 20)
+        heading = 30   # approximate heading height; a spare slot is cheap
+        visible = max(1, (event.height - heading) // rh + 1)
+        if visible != self._visible:
+            self._visible = visible
+            self._refresh()
+
+    def _ensure_slots(self, n: int) -> None:
+        while len(self._slots) < n:
+            self._slots.append(self.tree.insert("", "end", values=()))
+        while len(self._slots) > n:
+            self.tree.delete(self._slots.pop())
+
+    def _refresh(self) -> None:
+        n = len(self.model)
+        self.top = max(0, min(self.top, n - self._visible))
+        shown = min(self._visible, n - self.top)
+        self._ensure_slots(shown)
+        for k, iid in enumerate(self._slots):
+            pos = self.top + k
+            self.tree.item(iid, values=self.model.row(pos), tags=("oddrow" if pos % 2 else "evenrow",))
+        self._syncing = True
+        try:
+            if self.selected is not None and self.top <= self.selected < self.top + shown:
+                iid = self._slots[self.selected - self.top]
+                self.tree.selection_set(iid)
+                self.tree.focus(iid)
+            else:
+                self.tree.selection_remove(self.tree.selection())
+        finally:
+            self._syncing = False
+        if n:
+            self.vsb.set(self.top / n, (self.top + shown) / n)
+        else:
+            self.vsb.set(0.0, 1.0)
+
+    def _yview(self, *args) -> None:
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * len(self.model))
+            self._refresh()
+        elif args[0] == "scroll":
+            self._scroll(int(args[1]), args[2])
+
+    def _scroll(self, n: int, what: str = "units", mult: int = 1) -> str:
+        self.top += n * mult * (self._visible if what == "pages" else 1)
+        self._refresh()
+        return "break"
+
+    # ---------- selection ----------
+    def _on_select(self, _evt=None) -> None:
+        if self._syncing:
+            return
+        sel = self.tree.selection()
+        if sel and sel[0] in self._slots:
+            self.selected = self.top + self._slots.index(sel[0])
+
+    def _select(self, pos: int) -> str:
+        n = len(self.model)
+        if not n:
+            return "break"
+        pos = max(0, min(pos, n - 1))
+        self.selected = pos
+        if pos < self.top:
+            self.top = pos
+        elif pos >= self.top + self._visible:
+            self.top = pos - self._visible + 1
+        self._refresh()
+        return "break"
+
+    def _move_selection(self, step: int) -> str:
+        return self._select((self.top if self.selected is None else self.selected) + step)
+
+    def _activate(self, _evt=None) -> None:
+        self._on_select()
+        p = self.selected_payload()
+        if p is not None and self.on_activate:
+            self.on_activate(p)
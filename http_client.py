@@ -0,0 +1,65 @@
+# http_client.py
+from __future__ import annotations
+import atexit, json, threading
+from typing import TYPE_CHECKING, Any, Optional
+from config_loader import get_settings
+
+try:  # optional, several times faster on large page payloads
+    import orjson
+except ImportError:
+    orjson = None
+
+if TYPE_CHECKING:
+    import requests
+
+# Sized for both providers' concurrent pages plus some headroom for batch runs
+HTTP_POOL_SIZE = get_settings().http_pool_size
+HTTP_USER_AGENT = get_settings().http_user_agent
+
+def json_loads(data: bytes) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def json_dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+_session: Optional[requests.Session] = None
+_lock = threading.Lock()
+
+def _build_session(pool_size: int) -> requests.Session:
+    import requests  # deferred: only paid for on the first real request
+    from requests.adapters import HTTPAdapter
+
+    s = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    s.headers.update({
+        "Accept": "application/json",
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive",
+        "User-Agent": HTTP_USER_AGENT,
+    })
+    return s
+
+def get_session() -> requests.Session:
+    """
+    Process-wide keep-alive session. The GUI, CLI and batch runs all share it,
+    so repeated SerpApi/NewsAPI pages reuse pooled TCP+TLS connections.
+    """
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = _build_session(HTTP_POOL_SIZE)
+    return _session
+
+def close_session() -> None:
+    global _session
+    with _lock:
+        old, _session = _session, None
+    if old is not None:
+        old.close()
+
+atexit.register(close_session)
@@ -1,51 +1,61 @@
 # keyword_trending.py
 from __future__ import annotations
-import re
-from typing import List, Tuple
+import re, threading, time
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-import numpy as np
-import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, List, Optional, Tuple
 
+from config_loader import get_settings
 from news_sources import fetch_both  # NewsAPI + SerpApi combo
+import cancel, metrics
 
-def _to_aware_utc(dt) -> datetime:
-    if isinstance(dt, np.datetime64):
-        return pd.Timestamp(dt, tz="UTC").to_pydatetime()
-    if isinstance(dt, pd.Timestamp):
-        if dt.tzinfo is None or dt.tzinfo.utcoffset(dt) is None:
-            dt = dt.tz_localize("UTC")
-        else:
-            dt = dt.tz_convert("UTC")
-        return dt.to_pydatetime()
-    if isinstance(dt, datetime):
-        if dt.tzinfo is None or dt.tzinfo.utcoffset(dt) is None:
-            return dt.replace(tzinfo=timezone.utc)
-        return dt.astimezone(timezone.utc)
-    return datetime.now(timezone.utc)
-
-def _hours_ago(dt) -> float:
-    now = datetime.now(timezone.utc)
-    dt_utc = _to_aware_utc(dt)
-    return max(0.0, (now - dt_utc).total_seconds() / 3600.0)
-
-def _decay_weight(hours: float, half_life_h: float) -> float:
-    return 0.5 ** (hours / max(half_life_h, 1e-6))
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+    from article_batch import ArticleBatch
+
+S = get_settings()
+
+# Fetched + vectorized corpora kept per (query, lang, days, vectorizer knobs), so
+# changing only half-life / top-k / stop terms rescores without refetching.
+CORPUS_CACHE_SIZE = S.corpus_cache_size
+CORPUS_TTL_S = S.corpus_ttl_s
+
+# Burst mode: hourly bins, the "recent" window compared against everything before it,
+# and the fewest recent docs a term needs before it can count as bursting.
+BURST_BIN_H = S.burst_bin_h
+BURST_WINDOW_H = S.burst_window_h
+BURST_MIN_DOCS = S.burst_min_docs
+BURST_COLUMNS = ["topic", "score", "count", "burst_score", "velocity", "peak_time", "variants"]
+
+# An n-gram folds into a longer one that scores at least as high and appears in at
+# least this share of its documents ("county sheriff" -> "tuscaloosa county sheriff"); 0 disables.
+NGRAM_COLLAPSE_RATIO = S.ngram_collapse_ratio
+TOPIC_COLUMNS = ["topic", "score", "count", "variants"]
+
+# Vectorizer defaults shared by fetch_corpus, co_trending_topics, the incremental
+# engine and watch mode (small corpora fall back to bigrams and min_df=1).
+NGRAM_RANGE = (1, 3)
+MIN_DF = 2
+MAX_FEATURES = 6000
+
+# numpy / pandas / scikit-learn are imported inside the functions that use them
+# so that importing this module (e.g. from the GUI) stays cheap.
 
 def _normalize_text(s: str) -> str:
     return (s or "").replace("\n", " ").strip()
 
-def _build_docs(rows: List[dict]) -> Tuple[List[str], List[datetime]]:
-    texts, times = [], []
-    for r in rows:
-        title = _normalize_text(r.get("title", ""))
-        summary = _normalize_text(r.get("summary", ""))
-        txt = (title + ". " + summary).strip()
+def _build_docs(batch: ArticleBatch) -> Tuple[List[str], List[int]]:
+    """Document texts plus the batch positions they came from (empty docs are skipped)."""
+    texts, keep = [], []
+    for i, (title, summary) in enumerate(zip(batch.titles, batch.summaries)):
+        txt = (_normalize_text(title) + ". " + _normalize_text(summary)).strip()
         if not txt:
             continue
         texts.append(txt)
-        times.append(r["published_at"])
-    return texts, times
+        keep.append(i)
+    return texts, keep
 
 def _default_stop_terms(query: str) -> set:
     tokens = re.findall(r"[A-Za-z]+", (query or "").lower())
@@ -55,20 +65,192 @@ def _default_stop_terms(query: str) -> set:
     }
     return set(tokens) | generic
 
-def co_trending_topics(
+@dataclass
+class Corpus:
+    """
+    Everything about a query that does not depend on the scoring knobs: the
+    merged rows, their columnar batch and the fitted TF-IDF matrix (rows of X
+    are the batch positions in `keep`).
+    """
+    query: str
+    rows: List[Any]
+    batch: Optional[ArticleBatch] = None
+    keep: Optional["np.ndarray"] = None
+    X: Any = None
+    vocab: Optional["np.ndarray"] = None
+    doc_freq: Optional["np.ndarray"] = None
+    fetched_at: float = field(default_factory=time.time)
+    _masks: Dict[FrozenSet[str], "np.ndarray"] = field(default_factory=dict, repr=False)
+    _affixes: Optional[Tuple["np.ndarray", "np.ndarray"]] = field(default=None, repr=False)
+
+    @property
+    def empty(self) -> bool:
+        return self.X is None or self.vocab is None or self.vocab.size == 0
+
+    def term_mask(self, stop_terms: FrozenSet[str]) -> "np.ndarray":
+        """Vocabulary entries without any stop token; memoized per stop-term set."""
+        import numpy as np
+
+        m = self._masks.get(stop_terms)
+        if m is None:
+            m = self._masks[stop_terms] = np.fromiter(
+                (not any(tok in stop_terms for tok in term.split()) for term in self.vocab),
+                dtype=bool, count=self.vocab.size)
+        return m
+
+    def affixes(self) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Prefix/suffix index of the vocabulary (see ngram_affixes); built once per corpus."""
+        if self._affixes is None:
+            self._affixes = ngram_affixes(self.vocab)
+        return self._affixes
+
+def ngram_affixes(vocab) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    For every n-gram, the vocabulary positions of its leading and trailing
+    (n-1)-grams ("a b c" -> "a b", "b c"); -1 for unigrams and for sub-grams
+    that did not make the vocabulary. One dict pass, O(vocabulary).
+    """
+    import numpy as np
+
+    pos = {t: i for i, t in enumerate(vocab)}
+    n = len(pos)
+    prefix = np.fromiter((pos.get(t.rsplit(" ", 1)[0], -1) if " " in t else -1 for t in vocab),
+                         dtype=np.intp, count=n)
+    suffix = np.fromiter((pos.get(t.split(" ", 1)[1], -1) if " " in t else -1 for t in vocab),
+                         dtype=np.intp, count=n)
+    return prefix, suffix
+
+def term_rank(vocab) -> "np.ndarray":
+    """Alphabetical rank of every term, so score ties break by term whatever the vocabulary order."""
+    import numpy as np
+
+    rank = np.empty(len(vocab), dtype=np.intp)
+    rank[np.argsort(np.asarray(vocab, dtype=object), kind="stable")] = np.arange(len(vocab))
+    return rank
+
+def collapse_ngrams(cand: "np.ndarray", scores: "np.ndarray", support: "np.ndarray",
+                    affixes: Tuple["np.ndarray", "np.ndarray"],
+                    ratio: float = NGRAM_COLLAPSE_RATIO, tie: Optional["np.ndarray"] = None) -> "np.ndarray":
+    """
+    root[i]: the candidate term that absorbs term i (i itself when it survives).
+
+    A candidate sub-gram is subsumed by the best-scoring candidate (n+1)-gram
+    that extends it on either side, scores >= it and has support (document
+    count) >= ratio * its support. Chains resolve to the longest survivor, so
+    "county" -> "tuscaloosa county" -> "tuscaloosa county sheriff". Only the
+    affix index is consulted, never pairs of terms. Equal-scoring extensions
+    are decided by `tie` (e.g. term_rank), else by vocabulary position.
+    """
+    import numpy as np
+
+    root = np.arange(scores.size)
+    if ratio <= 0:
+        return root
+    prefix, suffix = affixes
+    longer = np.concatenate([np.arange(prefix.size)] * 2)
+    sub = np.concatenate([prefix, suffix])
+    ok = (sub >= 0) & cand[longer]
+    longer, sub = longer[ok], sub[ok]
+    ok = cand[sub] & (scores[longer] >= scores[sub]) & (support[longer] >= ratio * support[sub])
+    longer, sub = longer[ok], sub[ok]
+    if sub.size == 0:
+        return root
+    tie = root if tie is None else tie
+    order = np.lexsort((tie[longer], -scores[longer], sub))   # per sub-gram, best extension first
+    first = np.unique(sub[order], return_index=True)[1]
+    root[sub[order][first]] = longer[order][first]
+    while True:                                          # pointer jumping; depth <= n-gram length
+        nxt = root[root]
+        if np.array_equal(nxt, root):
+            return root
+        root = nxt
+
+def top_collapsed(cand: "np.ndarray", scores: "np.ndarray", support: "np.ndarray",
+                  affixes: Tuple["np.ndarray", "np.ndarray"], vocab, top_k: int,
+                  ratio: float = NGRAM_COLLAPSE_RATIO) -> Tuple["np.ndarray", List[str]]:
+    """
+    Top-k surviving candidates by score, plus each one's absorbed variants
+    ("; "-joined, best first). Equal scores are ordered by term, so the result
+    does not depend on the order the vocabulary was built in.
+    """
+    import numpy as np
+
+    tie = term_rank(vocab)
+    root = collapse_ngrams(cand, scores, support, affixes, ratio, tie)
+    own = root == np.arange(root.size)
+    idx = np.flatnonzero(cand & own)
+    top = idx[np.lexsort((tie[idx], -scores[idx]))[:top_k]]
+
+    merged = np.flatnonzero(cand & ~own)
+    merged = merged[np.isin(root[merged], top)]
+    merged = merged[np.lexsort((tie[merged], -scores[merged]))]
+    groups: Dict[int, List[str]] = {}
+    for i, r in zip(merged.tolist(), root[merged].tolist()):
+        groups.setdefault(r, []).append(vocab[i])
+    return top, ["; ".join(groups.get(t, ())) for t in top.tolist()]
+
+_corpora: "OrderedDict[tuple, Corpus]" = OrderedDict()
+_corpora_lock = threading.Lock()
+
+def clear_corpus_cache() -> None:
+    with _corpora_lock:
+        _corpora.clear()
+
+def build_corpus(query: str, rows: List[Any], ngram_range: tuple = NGRAM_RANGE, min_df: int = MIN_DF,
+                 max_features: int = MAX_FEATURES) -> Corpus:
+    """Vectorize rows that were already fetched (no fetching, no corpus cache)."""
+    import numpy as np
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from article_batch import ArticleBatch
+
+    if not rows:
+        return Corpus(query, rows)
+    batch = ArticleBatch.from_rows(rows)
+    docs, keep = _build_docs(batch)
+    if not docs:
+        return Corpus(query, rows, batch)
+
+    # Be gentle if doc count is small
+    n_docs = len(docs)
+    vec = TfidfVectorizer(
+        lowercase=True,
+        stop_words="english",
+        ngram_range=(1, 2) if n_docs < 25 else ngram_range,
+        min_df=1 if n_docs < 25 else min_df,
+        max_features=max_features,
+        token_pattern=r"(?u)\b[a-zA-Z][a-zA-Z]+\b",
+    )
+    cancel.check()
+    with metrics.span("vectorize"):
+        X = vec.fit_transform(docs).tocsc()   # column sums / X.T @ w are the hot paths
+        doc_freq = np.diff(X.indptr)          # nonzeros per column = docs containing the term
+    return Corpus(query, rows, batch, np.asarray(keep, dtype=np.intp), X,
+                  np.asarray(vec.get_feature_names_out(), dtype=object), doc_freq)
+
+def fetch_corpus(
     query: str,
     lang: str = "en",
     days: int = 7,
-    half_life_h: float = 36.0,
-    top_k: int = 15,
-    ngram_range: tuple = (1, 3),
-    min_df: int = 2,
-    max_features: int = 6000,
-):
+    ngram_range: tuple = NGRAM_RANGE,
+    min_df: int = MIN_DF,
+    max_features: int = MAX_FEATURES,
+    refresh: bool = False,
+    on_page=None,
+) -> Corpus:
     """
-    Pull news for `query`, then rank co-occurring n-grams with recency-weighted TF-IDF.
-    Returns: (topics_df, rows) with topics_df columns ['topic','score','count'].
+    Fetch and vectorize `query` once; later calls with the same fetch/vectorizer
+    arguments reuse the result for CORPUS_TTL_S seconds (refresh=True forces a refetch
+    from the network, bypassing both this cache and the HTTP response cache).
+    `on_page` is handed to fetch_both to stream pages while fetching (not called on a cache hit).
     """
+    key = (query.strip().lower(), lang, int(days), tuple(ngram_range), min_df, max_features)
+    with _corpora_lock:
+        c = _corpora.get(key)
+        if c is not None and not refresh and time.time() - c.fetched_at <= CORPUS_TTL_S:
+            _corpora.move_to_end(key)
+            metrics.incr("corpus.hit")
+            return c
+
     rows = fetch_both(
         query=query,
         lang=lang,
@@ -76,58 +258,168 @@ def co_trending_topics(
         nc_page_size=100,
         nc_pages=2,
         serp_pages=2,
+        on_page=on_page,
+        refresh=refresh,
     )
-    if not rows:
-        return pd.DataFrame(columns=["topic", "score", "count"]), []
+    cancel.check()
+    c = build_corpus(query, rows, tuple(ngram_range), min_df, max_features)
+    metrics.incr("corpus.miss")
+    with _corpora_lock:
+        _corpora[key] = c
+        _corpora.move_to_end(key)
+        while len(_corpora) > CORPUS_CACHE_SIZE:
+            _corpora.popitem(last=False)
+    return c
 
-    docs, ts = _build_docs(rows)
-    if not docs:
-        return pd.DataFrame(columns=["topic", "score", "count"]), rows
+def score_corpus(
+    corpus: Corpus,
+    half_life_h: float = 36.0,
+    top_k: int = 15,
+    stop_terms: Optional[set] = None,
+    now: Optional[datetime] = None,
+) -> "pd.DataFrame":
+    """
+    Recency-weighted co-topic ranking of an already vectorized corpus. Only the
+    per-doc decay weights and one sparse mat-vec are recomputed, so changing
+    the half-life, top-k or stop terms costs milliseconds. N-grams subsumed by
+    a longer top term are listed in its `variants` instead of taking a slot.
+    """
+    import pandas as pd
 
-    # Recency weights per doc
-    hrs = np.array([_hours_ago(t) for t in ts], dtype=float)
-    w = np.array([_decay_weight(h, half_life_h) for h in hrs], dtype=np.float64)
+    if corpus.empty:
+        return pd.DataFrame(columns=TOPIC_COLUMNS)
 
-    # Be gentle if doc count is small
-    n_docs = len(docs)
-    adaptive_min_df = 1 if n_docs < 25 else min_df
-    adaptive_ngram = (1, 2) if n_docs < 25 else ngram_range
+    cancel.check()
+    with metrics.span("rank"):
+        # Recency weights per doc, one vector expression against a single "now"
+        w = corpus.batch.decay_weights(half_life_h, now)[corpus.keep]
+        term_scores = corpus.X.T.dot(w)                       # recency-weighted
 
-    vec = TfidfVectorizer(
-        lowercase=True,
-        stop_words="english",
-        ngram_range=adaptive_ngram,
-        min_df=adaptive_min_df,
-        max_features=max_features,
-        token_pattern=r"(?u)\b[a-zA-Z][a-zA-Z]+\b",
-    )
-    X = vec.fit_transform(docs)
-
-    term_scores = np.asarray(X.T.dot(w)).ravel()           # recency-weighted
-    doc_freq = np.asarray((X > 0).sum(axis=0)).ravel()     # in how many docs term appears
-    vocab = np.array(vec.get_feature_names_out())
-
-    # Filter out seed terms to surface *co* topics
-    stop_terms = _default_stop_terms(query)
-    mask = np.array([not any(tok in stop_terms for tok in term.split()) for term in vocab], dtype=bool)
-
-    vocab = vocab[mask]
-    term_scores = term_scores[mask]
-    doc_freq = doc_freq[mask]
-
-    if vocab.size == 0:
-        return pd.DataFrame(columns=["topic", "score", "count"]), rows
-
-    # Normalize scores to 0..10 for readability
-    m = term_scores.max()
-    if m > 0:
-        term_scores = term_scores / m * 10.0
-
-    order = np.argsort(-term_scores)
-    top_idx = order[:top_k]
-    out = pd.DataFrame({
-        "topic": vocab[top_idx],
-        "score": term_scores[top_idx],
-        "count": doc_freq[top_idx].astype(int),
-    })
-    return out, rows
+        # Filter out seed terms to surface *co* topics
+        stops = frozenset(_default_stop_terms(corpus.query) if stop_terms is None else stop_terms)
+        cand = corpus.term_mask(stops)
+        if not cand.any():
+            return pd.DataFrame(columns=TOPIC_COLUMNS)
+
+        # Fold fragments into their longer phrase before taking the top-k
+        top, variants = top_collapsed(cand, term_scores, corpus.doc_freq, corpus.affixes(),
+                                      corpus.vocab, top_k)
+
+        # Normalize scores to 0..10 for readability
+        m = term_scores[cand].max()
+        scores = term_scores[top] / m * 10.0 if m > 0 else term_scores[top]
+        return pd.DataFrame({
+            "topic": corpus.vocab[top],
+            "score": scores,
+            "count": corpus.doc_freq[top].astype(int),
+            "variants": variants,
+        })
+
+def term_time_matrix(corpus: Corpus, bin_h: float = BURST_BIN_H, now: Optional[datetime] = None):
+    """
+    Sparse term x time-bin document counts for the corpus, plus docs per bin.
+    Column 0 is the bin holding `now`, column j the bin j steps earlier (bins
+    are aligned to the clock, e.g. whole UTC hours); undated docs are left out.
+    Returns (C, docs_per_bin, newest bin start in epoch seconds).
+    """
+    import numpy as np
+    from scipy import sparse
+
+    bin_s = max(bin_h, 1e-3) * 3600.0
+    t = corpus.batch.epoch_seconds()[corpus.keep]
+    dated = np.flatnonzero(~np.isnan(t))
+    now_bin = np.floor((now or datetime.now(timezone.utc)).timestamp() / bin_s)
+    age = np.clip(now_bin - np.floor(t[dated] / bin_s), 0, None).astype(np.intp)   # future -> current bin
+    n_bins = int(age.max()) + 1 if age.size else 1
+
+    # Doc x bin indicator; presence (not TF-IDF weight) so C counts documents
+    B = sparse.csr_matrix((np.ones(dated.size), (dated, age)), shape=(corpus.X.shape[0], n_bins))
+    P = corpus.X.copy()
+    P.data[:] = 1.0
+    C = (P.T @ B).tocsr()
+    return C, np.bincount(age, minlength=n_bins).astype(np.float64), now_bin * bin_s
+
+def score_bursts(
+    corpus: Corpus,
+    top_k: int = 15,
+    bin_h: float = BURST_BIN_H,
+    window_h: float = BURST_WINDOW_H,
+    min_docs: int = BURST_MIN_DOCS,
+    stop_terms: Optional[set] = None,
+    now: Optional[datetime] = None,
+) -> "pd.DataFrame":
+    """
+    Terms whose share of documents rose in the last `window_h` hours compared
+    with the rest of the corpus. Every term is scored at once from the
+    term x bin matrix:
+
+    - burst_score: z-score of the recent share against the baseline share
+      (binomial standard error, add-one smoothed so new terms stay finite)
+    - velocity: recent minus baseline docs per hour
+    - peak_time: start (UTC) of the bin with most docs, latest on ties
+    - count: docs in the recent window; score: burst_score scaled to 0..10
+    - variants: fragments folded into the term (see collapse_ngrams)
+    """
+    import numpy as np
+    import pandas as pd
+
+    if corpus.empty:
+        return pd.DataFrame(columns=BURST_COLUMNS)
+
+    cancel.check()
+    with metrics.span("burst"):
+        C, per_bin, newest = term_time_matrix(corpus, bin_h, now)
+        n_bins = C.shape[1]
+        w = int(min(n_bins, max(1, round(window_h / max(bin_h, 1e-3)))))
+        recent = np.asarray(C[:, :w].sum(axis=1)).ravel()
+        base = np.asarray(C.sum(axis=1)).ravel() - recent
+        n_recent, n_base = per_bin[:w].sum(), per_bin[w:].sum()
+
+        p_base = (base + 1.0) / (n_base + 2.0)
+        p_recent = recent / max(n_recent, 1.0)
+        z = (p_recent - p_base) / np.sqrt(p_base * (1.0 - p_base) / max(n_recent, 1.0))
+        velocity = recent / (w * bin_h) - base / (max(n_bins - w, 1) * bin_h)
+
+        stops = frozenset(_default_stop_terms(corpus.query) if stop_terms is None else stop_terms)
+        cand = corpus.term_mask(stops) & (recent >= min_docs) & (z > 0)
+        if not cand.any():
+            return pd.DataFrame(columns=BURST_COLUMNS)
+        # Support is the recent window: a phrase absorbs fragments that burst alongside it
+        top, variants = top_collapsed(cand, z, recent, corpus.affixes(), corpus.vocab, top_k)
+
+        # Peak bin of the chosen terms only; column 0 is the newest bin and argmax takes the first max
+        peak_age = np.asarray(C[top].argmax(axis=1)).ravel()
+        peak_s = (newest - peak_age * max(bin_h, 1e-3) * 3600.0).astype(np.int64)
+        peak = np.datetime_as_string(peak_s.astype("datetime64[s]"), unit="m")
+        return pd.DataFrame({
+            "topic": corpus.vocab[top],
+            "score": z[top] / z[top[0]] * 10.0,
+            "count": recent[top].astype(int),
+            "burst_score": z[top],
+            "velocity": velocity[top],
+            "peak_time": [s + "Z" for s in peak.tolist()],
+            "variants": variants,
+        })
+
+def co_trending_topics(
+    query: str,
+    lang: str = "en",
+    days: int = 7,
+    half_life_h: float = 36.0,
+    top_k: int = 15,
+    ngram_range: tuple = NGRAM_RANGE,
+    min_df: int = MIN_DF,
+    max_features: int = MAX_FEATURES,
+    stop_terms: Optional[set] = None,
+    refresh: bool = False,
+    on_page=None,
+):
+    """
+    Pull news for `query`, then rank co-occurring n-grams with recency-weighted TF-IDF.
+    The fetched corpus is reused across calls that only change scoring knobs;
+    `on_page` streams fetched pages (see news_sources.PageCallback).
+    Returns: (topics_df, rows) with topics_df columns ['topic','score','count','variants'].
+    """
+    corpus = fetch_corpus(query, lang=lang, days=days, ngram_range=ngram_range,
+                          min_df=min_df, max_features=max_features, refresh=refresh, on_page=on_page)
+    return score_corpus(corpus, half_life_h=half_life_h, top_k=top_k, stop_terms=stop_terms), corpus.rows
@@ -1,57 +1,426 @@
 # main.py
-import os, argparse
+import argparse, functools, hashlib, heapq, json, os, random, threading, time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from datetime import datetime, timezone
 from pathlib import Path
-import sys
-from config_loader import load_env_near_exe
+from typing import Dict, List, Optional
+from config_loader import get_settings
 
-env_info = load_env_near_exe(require_local=True,  # require a sibling .env
-                             verbose=("--debug-env" in sys.argv))
+S = get_settings()
+env_info = S.env_info
 
+from news_sources import fetch_both, set_request_budget, QuotaExhausted
+from topic_miner import build_topics_df, build_topics_dfs
+from keyword_trending import fetch_corpus, score_bursts, score_corpus
+from analysis import REPORT_FORMATS, SAMPLE_ARTICLES, WRITERS, write_combined, write_index, write_reports
+import metrics
 
-from news_sources import fetch_both
-from topic_miner import build_topics_df
-from keyword_trending import co_trending_topics
-from analysis import write_csv_topics, write_markdown
-
-LANG = os.getenv("LANG", "en")
-DAYS = int(os.getenv("DAYS", "7"))
-TOP_K = int(os.getenv("TOP_K", "15"))
-HALF_LIFE_H = float(os.getenv("HALF_LIFE_H", "36"))
-NEWS_MAX_PAGES = int(os.getenv("NEWS_MAX_PAGES", "2"))
-NEWS_PAGE_SIZE = int(os.getenv("NEWS_PAGE_SIZE", "100"))
-SERPAPI_PAGES = int(os.getenv("SERPAPI_PAGES", "2"))
+LANG = S.lang
+DAYS = S.days
+TOP_K = S.top_k
+HALF_LIFE_H = S.half_life_h
+NEWS_MAX_PAGES = S.news_max_pages
+NEWS_PAGE_SIZE = S.news_page_size
+SERPAPI_PAGES = S.serpapi_pages
 
 ROOT = Path(__file__).resolve().parent
 OUTPUT = ROOT / "output"
 OUTPUT.mkdir(exist_ok=True)
 
-def run_broad(query: str):
+def _summary(query: str, topics_df, rows, csv_path: Path, md_path: Path) -> Dict:
+    return {
+        "query": query,
+        "status": "ok",
+        "topics": int(len(topics_df)),
+        "articles": len(rows),
+        "top_topic": "" if topics_df.empty else str(topics_df.iloc[0]["topic"]),
+        "csv": csv_path.name,
+        "md": md_path.name,
+        "error": "",
+    }
+
+def _report_paths(topics_prefix: str, report_prefix: str, slug: str, sfx: str = "") -> Dict[str, Path]:
+    # CSV/JSONL/Parquet hold the topics table; Markdown is the readable report
+    stem = f"{topics_prefix}_{slug}{sfx}"
+    return {"csv": OUTPUT / f"{stem}.csv", "jsonl": OUTPUT / f"{stem}.jsonl",
+            "parquet": OUTPUT / f"{stem}.parquet", "md": OUTPUT / f"{report_prefix}_{slug}{sfx}.md"}
+
+def _hl_suffix(hl: float, half_lives: List[float]) -> str:
+    # Single half-life keeps the historical file names
+    return "" if len(half_lives) == 1 else f"_hl{hl:g}"
+
+def run_broad(query: str, half_lives: Optional[List[float]] = None,
+              formats=REPORT_FORMATS, sink: Optional[List] = None) -> Dict:
+    """`sink` collects (query, (query + half-life suffix, topics_df, sample rows)) for a combined report."""
+    half_lives = half_lives or [HALF_LIFE_H]
     print(f"\n=== [BROAD] Query: {query} | lang={LANG} | days={DAYS} ===")
     rows = fetch_both(query=query, lang=LANG, days=DAYS,
                       nc_page_size=NEWS_PAGE_SIZE, nc_pages=NEWS_MAX_PAGES,
                       serp_pages=SERPAPI_PAGES)
     print(f"Fetched {len(rows)} articles")
-    topics_df = build_topics_df(rows, half_life_h=HALF_LIFE_H, top_k=TOP_K)
-    write_csv_topics(topics_df, OUTPUT / f"topics_{query.replace(' ','_')}.csv")
-    write_markdown(query, topics_df, rows, OUTPUT / f"report_{query.replace(' ','_')}.md")
-    print("(no signal)" if topics_df.empty else f"\nTop topics:\n{topics_df.to_string(index=False)}")
+    slug = query.replace(" ", "_")
+    for hl, topics_df in build_topics_dfs(rows, half_lives, top_k=TOP_K).items():
+        sfx = _hl_suffix(hl, half_lives)
+        paths = _report_paths("topics", "report", slug, sfx)
+        write_reports(query, topics_df, rows, paths, formats)
+        print(f"\n-- half-life {hl:g}h --" if sfx else "", end="")
+        print("(no signal)" if topics_df.empty else f"\nTop topics:\n{topics_df.to_string(index=False)}")
+        if sink is not None:
+            sink.append((query, (query + sfx, topics_df, rows[:SAMPLE_ARTICLES])))
+    return _summary(query, topics_df, rows, paths["csv"], paths["md"])
 
-def run_keyword(query: str):
+def run_keyword(query: str, half_lives: Optional[List[float]] = None,
+                formats=REPORT_FORMATS, sink: Optional[List] = None) -> Dict:
+    """`sink` collects (query, (query + half-life suffix, topics_df, sample rows)) for a combined report."""
+    half_lives = half_lives or [HALF_LIFE_H]
     print(f"\n=== [KEYWORD] Query: {query} | lang={LANG} | days={DAYS} ===")
-    topics_df, rows = co_trending_topics(query=query, lang=LANG, days=DAYS,
-                                         half_life_h=HALF_LIFE_H, top_k=TOP_K)
+    corpus = fetch_corpus(query, lang=LANG, days=DAYS)   # fetched and vectorized once
+    rows = corpus.rows
     slug = query.replace(" ", "_")
-    write_csv_topics(topics_df, OUTPUT / f"cotopics_{slug}.csv")
-    write_markdown(query, topics_df, rows, OUTPUT / f"coreport_{slug}.md")
-    print("(no signal)" if topics_df.empty else topics_df.to_string(index=False))
+    for hl in half_lives:
+        topics_df = score_corpus(corpus, half_life_h=hl, top_k=TOP_K)
+        sfx = _hl_suffix(hl, half_lives)
+        paths = _report_paths("cotopics", "coreport", slug, sfx)
+        write_reports(query, topics_df, rows, paths, formats)
+        if sfx:
+            print(f"-- half-life {hl:g}h --")
+        print("(no signal)" if topics_df.empty else topics_df.to_string(index=False))
+        if sink is not None:
+            sink.append((query, (query + sfx, topics_df, rows[:SAMPLE_ARTICLES])))
+    return _summary(query, topics_df, rows, paths["csv"], paths["md"])
+
+def run_burst(query: str, half_lives: Optional[List[float]] = None,
+              formats=REPORT_FORMATS, sink: Optional[List] = None) -> Dict:
+    """Terms rising in the last BURST_WINDOW_H hours (half-lives do not apply and are ignored)."""
+    print(f"\n=== [BURST] Query: {query} | lang={LANG} | days={DAYS} ===")
+    corpus = fetch_corpus(query, lang=LANG, days=DAYS)   # same fetch/vectorizer as keyword mode
+    rows = corpus.rows
+    topics_df = score_bursts(corpus, top_k=TOP_K)
+    paths = _report_paths("bursts", "burstreport", query.replace(" ", "_"))
+    write_reports(query, topics_df, rows, paths, formats)
+    print("(no bursts)" if topics_df.empty else topics_df.to_string(index=False))
+    if sink is not None:
+        sink.append((query, (query, topics_df, rows[:SAMPLE_ARTICLES])))
+    return _summary(query, topics_df, rows, paths["csv"], paths["md"])
+
+RUNNERS = {"broad": run_broad, "keyword": run_keyword, "burst": run_burst}
+
+# ---------- Watchlist batch mode ----------
+def read_watchlist(path: Path) -> List[str]:
+    """One query per line; blank lines and '#' comments are skipped, duplicates dropped."""
+    seen, out = set(), []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        q = line.split("#", 1)[0].strip()
+        if q and q.lower() not in seen:
+            out.append(q); seen.add(q.lower())
+    return out
+
+class Checkpoint:
+    """Per-query results of a batch, rewritten atomically after every query."""
+
+    def __init__(self, path: Path, mode: str, resume: bool = True):
+        self.path = Path(path)
+        self.mode = mode
+        self._lock = threading.Lock()
+        self.done: Dict[str, Dict] = {}
+        if resume and self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+                if data.get("mode") == mode:
+                    self.done = data.get("done", {})
+            except (OSError, ValueError):
+                pass
+
+    def record(self, entry: Dict) -> None:
+        with self._lock:
+            if entry["status"] == "ok":
+                self.done[entry["query"]] = entry
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"mode": self.mode, "done": self.done}, indent=1), encoding="utf-8")
+            os.replace(tmp, self.path)
+
+    def clear(self) -> None:
+        """Drop the file once the batch is complete, so the next run starts over."""
+        with self._lock:
+            self.path.unlink(missing_ok=True)
+
+def _checkpoint_path(queries: List[str], mode: str) -> Path:
+    # One checkpoint per watchlist contents and UTC day: tomorrow's run (or a
+    # different list) never reuses today's results
+    digest = hashlib.sha1("\n".join(queries).encode("utf-8")).hexdigest()[:10]
+    day = datetime.now(timezone.utc).strftime("%Y%m%d")
+    return OUTPUT / f"watchlist_{mode}_{digest}_{day}.checkpoint.json"
+
+def run_watchlist(queries: List[str], mode: str = "keyword", workers: int = 4,
+                  resume: bool = True, half_lives: Optional[List[float]] = None,
+                  formats=REPORT_FORMATS, combined: bool = False) -> List[Dict]:
+    """
+    Run many queries through a bounded worker pool. Workers share the process-wide
+    HTTP pool, per-provider concurrency caps and request budget; finished queries
+    are checkpointed so a crashed batch picks up where it stopped (same list, same
+    UTC day); the checkpoint is removed once every query succeeded. With `combined`,
+    the queries run in this batch also go into one watchlist_<mode>_combined.* report.
+    """
+    sink: Optional[List] = [] if combined else None
+    runner = functools.partial(RUNNERS[mode], half_lives=half_lives, formats=formats, sink=sink)
+    ckpt = Checkpoint(_checkpoint_path(queries, mode), mode, resume=resume)
+    todo = [q for q in queries if q not in ckpt.done]
+    print(f"[WATCHLIST] {len(queries)} queries, {len(queries) - len(todo)} already done, "
+          f"{len(todo)} to run on {workers} workers")
+
+    results: Dict[str, Dict] = {}
+
+    def one(q: str) -> Dict:
+        try:
+            return runner(q)
+        except QuotaExhausted as e:
+            return {"query": q, "status": "quota", "error": str(e)}
+        except Exception as e:
+            return {"query": q, "status": "error", "error": str(e)[:300]}
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as ex:
+        futures = {ex.submit(metrics.bind(one), q): q for q in todo}
+        for fut in as_completed(futures):
+            if fut.cancelled():
+                continue
+            entry = fut.result()
+            results[entry["query"]] = entry
+            ckpt.record(entry)
+            if entry["status"] == "quota":
+                # Remaining queries would only fail the same way; leave them for a resume.
+                for f in futures:
+                    f.cancel()
+
+    entries = []
+    for q in queries:
+        entry = ckpt.done.get(q) or results.get(q) or {"query": q, "status": "skipped"}
+        entries.append(entry)
+    write_index(entries, OUTPUT / f"watchlist_{mode}_index.csv")
+    if sink:
+        pos = {q: i for i, q in enumerate(queries)}   # workers finish out of order
+        sink.sort(key=lambda r: pos.get(r[0], len(pos)))   # stable: half-lives keep their order
+        write_combined([res for _, res in sink], OUTPUT / f"watchlist_{mode}_combined", formats)
+    ok = sum(e["status"] == "ok" for e in entries)
+    if ok == len(entries):
+        ckpt.clear()
+    print(f"[WATCHLIST] {ok}/{len(entries)} queries ok")
+    return entries
+
+# ---------- Watch mode ----------
+class WatchState:
+    """Warm per-query state carried across watch ticks."""
+
+    def __init__(self, query: str, mode: str, half_lives: Optional[List[float]] = None,
+                 formats=REPORT_FORMATS):
+        self.query = query
+        self.mode = mode
+        self.half_lives = half_lives or [HALF_LIFE_H]
+        self.formats = formats
+        self.engine = None   # CoTrendEngine (keyword mode)
+        self.corpus = None   # vectorized store window (burst mode)
+        self.corpus_keys: frozenset = frozenset()
+        self.ticks = 0
+
+def watch_tick(st: WatchState) -> Dict:
+    """
+    One refresh: pull only what is new since the last tick (article store),
+    fold it into the warm engine and atomically rewrite the query's outputs.
+    Ticks always ask the network: a response cached within HTTP_CACHE_TTL
+    would replay the previous tick's first page.
+    """
+    slug = st.query.replace(" ", "_")
+    if st.mode == "broad":
+        rows = fetch_both(query=st.query, lang=LANG, days=DAYS, nc_page_size=NEWS_PAGE_SIZE,
+                          nc_pages=NEWS_MAX_PAGES, serp_pages=SERPAPI_PAGES, incremental=True,
+                          refresh=True)
+        results = build_topics_dfs(rows, st.half_lives, top_k=TOP_K)
+        prefixes = ("topics", "report")
+    elif st.mode == "burst":
+        from keyword_trending import build_corpus
+
+        # Only deltas come off the network; the store returns the whole window. It is only
+        # re-vectorized when its articles changed (bins are recomputed against `now` anyway)
+        rows = fetch_both(query=st.query, lang=LANG, days=DAYS, nc_page_size=100,
+                          nc_pages=2, serp_pages=2, incremental=True, refresh=True)
+        keys = frozenset(r.get("url") or r.get("title") for r in rows)
+        if st.corpus is None or keys != st.corpus_keys:
+            st.corpus, st.corpus_keys = build_corpus(st.query, rows), keys
+        else:
+            metrics.incr("corpus.hit")
+        # timed as "burst", as in run_burst; half-lives do not apply
+        results = {HALF_LIFE_H: score_bursts(st.corpus, top_k=TOP_K)}
+        prefixes = ("bursts", "burstreport")
+    else:
+        from cotrend_engine import CoTrendEngine
+
+        # Same page plan as co_trending_topics
+        rows = fetch_both(query=st.query, lang=LANG, days=DAYS, nc_page_size=100,
+                          nc_pages=2, serp_pages=2, incremental=True, refresh=True)
+        if st.engine is None:
+            st.engine = CoTrendEngine(st.query, half_life_h=st.half_lives[0])
+        with metrics.span("rank"):
+            # Engine docs == store window, so the ranking matches --mode keyword on these rows
+            st.engine.retain(rows)
+            new = st.engine.ingest(rows)
+            results = {hl: st.engine.topics(TOP_K, half_life_h=hl) for hl in st.half_lives}
+        metrics.incr("watch.new_articles", new)
+        prefixes = ("cotopics", "coreport")
+
+    for hl, topics_df in results.items():
+        paths = _report_paths(*prefixes, slug, _hl_suffix(hl, list(results)))
+        write_reports(st.query, topics_df, rows, paths, st.formats)
+    return _summary(st.query, topics_df, rows, paths["csv"], paths["md"])
+
+def run_watch(queries: List[str], mode: str = "keyword", interval: float = 900.0,
+              jitter: float = 0.1, workers: int = 4, ticks: int = 0,
+              half_lives: Optional[List[float]] = None, formats=REPORT_FORMATS) -> None:
+    """
+    Keep refreshing `queries` until interrupted (or `ticks` refreshes each),
+    rewriting each query's reports per half-life in `formats` every tick.
+    Each query is rescheduled `interval` seconds (+/- `jitter` share) after
+    its previous tick finished, and first ticks are spread over one jitter
+    window, so queries drift apart instead of firing together.
+    """
+    if mode == "broad":
+        from topic_miner import ensure_nltk_resources
+        ensure_nltk_resources()   # once, not per tick
+
+    states = {q: WatchState(q, mode, half_lives, formats) for q in queries}
+    rng = random.Random()
+    start = time.monotonic()
+    due = [(start + rng.uniform(0, jitter * interval), q) for q in queries]
+    heapq.heapify(due)
+    workers = max(1, workers)
+    print(f"[WATCH] {len(queries)} queries every {interval:.0f}s (±{jitter:.0%}) on {workers} workers; Ctrl+C to stop")
+
+    def one(st: WatchState) -> Dict:
+        with metrics.collect(f"watch:{st.query}") as m:
+            try:
+                entry = watch_tick(st)
+            except QuotaExhausted as e:
+                entry = {"query": st.query, "status": "quota", "error": str(e)}
+            except Exception as e:
+                entry = {"query": st.query, "status": "error", "error": str(e)[:300]}
+            finally:
+                _write_metrics(m)
+        return entry
+
+    running: Dict = {}
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        try:
+            while due or running:
+                now = time.monotonic()
+                while due and due[0][0] <= now and len(running) < workers:
+                    _, q = heapq.heappop(due)
+                    running[ex.submit(metrics.bind(one), states[q])] = q
+
+                if len(running) >= workers or not due:
+                    timeout = None
+                else:
+                    timeout = max(0.0, due[0][0] - time.monotonic())
+                if not running:
+                    time.sleep(timeout)
+                    continue
+                done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    q = running.pop(fut)
+                    st = states[q]
+                    entry = fut.result()
+                    st.ticks += 1
+                    tag = entry["status"] if entry["status"] != "ok" else f"{entry['topics']} topics, {entry['articles']} articles"
+                    print(f"[WATCH] {q!r} tick {st.ticks}: {tag} {entry.get('error', '')}".rstrip())
+                    if not ticks or st.ticks < ticks:
+                        nxt = time.monotonic() + interval * rng.uniform(1 - jitter, 1 + jitter)
+                        heapq.heappush(due, (nxt, q))
+        except KeyboardInterrupt:
+            print("[WATCH] stopping after in-flight ticks…")
+            for fut in running:
+                fut.cancel()
 
 def main():
     ap = argparse.ArgumentParser()
-    ap.add_argument("--mode", choices=["broad", "keyword"], default="keyword")
-    ap.add_argument("--queries", required=True)
+    ap.add_argument("--mode", choices=list(RUNNERS), default="keyword",
+                    help="broad: RAKE topics; keyword: co-trending terms; burst: terms rising in the last hours")
+    src = ap.add_mutually_exclusive_group(required=True)
+    src.add_argument("--queries")
+    src.add_argument("--watchlist", help="file with one query per line")
+    ap.add_argument("--workers", type=int, default=S.batch_workers, help="watchlist worker threads")
+    ap.add_argument("--budget-newsapi", type=int, default=None, help="max NewsAPI requests for this run")
+    ap.add_argument("--budget-serpapi", type=int, default=None, help="max SerpApi requests for this run")
+    ap.add_argument("--fresh", action="store_true", help="ignore the watchlist checkpoint")
+    ap.add_argument("--half-life", default="", metavar="H[,H...]",
+                    help="recency half-life(s) in hours; several are scored from one fetch (default HALF_LIFE_H)")
+    ap.add_argument("--formats", default=",".join(REPORT_FORMATS), metavar="FMT[,FMT...]",
+                    help="report formats: csv, md, jsonl, parquet (default REPORT_FORMATS)")
+    ap.add_argument("--combined", action="store_true",
+                    help="also write one report covering every query of the run")
+    ap.add_argument("--watch", action="store_true", help="keep running and refresh the queries on a schedule")
+    ap.add_argument("--interval", type=float, default=S.watch_interval_s, help="watch: seconds between refreshes")
+    ap.add_argument("--jitter", type=float, default=S.watch_jitter, help="watch: +/- share of the interval")
+    ap.add_argument("--ticks", type=int, default=0, help="watch: stop after this many refreshes per query")
+    ap.add_argument("--profile", nargs="?", const=str(OUTPUT / "profile.prof"), default=None, metavar="PATH",
+                    help="write a cProfile dump (snakeviz/flameprof/tuna) of the main thread")
     args = ap.parse_args()
+    unknown = {f.strip().lower() for f in args.formats.split(",") if f.strip()} - set(WRITERS)
+    if unknown:
+        ap.error(f"unknown --formats {', '.join(sorted(unknown))} (choose from {', '.join(WRITERS)})")
+    if args.watch and args.combined:
+        ap.error("--combined is not supported with --watch (each tick rewrites per-query reports)")
+
+    set_request_budget("newsapi", args.budget_newsapi)
+    set_request_budget("serpapi", args.budget_serpapi)
+
+    with metrics.collect(args.mode) as m:
+        try:
+            if args.profile:
+                _profiled(_run, args, Path(args.profile))
+            else:
+                _run(args)
+        finally:
+            if not args.watch:   # watch ticks record their own metrics
+                _write_metrics(m)
+
+def _run(args) -> None:
+    half_lives = [float(h) for h in args.half_life.split(",") if h.strip()] or None
+    formats = tuple(f.strip().lower() for f in args.formats.split(",") if f.strip())
+    if args.watch:
+        queries = (read_watchlist(Path(args.watchlist)) if args.watchlist
+                   else [s.strip() for s in args.queries.split(",") if s.strip()])
+        run_watch(queries, mode=args.mode, interval=args.interval, jitter=args.jitter,
+                  workers=args.workers, ticks=args.ticks, half_lives=half_lives, formats=formats)
+        return
+    if args.watchlist:
+        run_watchlist(read_watchlist(Path(args.watchlist)), mode=args.mode, workers=args.workers,
+                      resume=not args.fresh, half_lives=half_lives, formats=formats, combined=args.combined)
+        return
+    sink: Optional[List] = [] if args.combined else None
     for q in [s.strip() for s in args.queries.split(",") if s.strip()]:
-        (run_broad if args.mode == "broad" else run_keyword)(q)
+        with metrics.span("query"):
+            RUNNERS[args.mode](q, half_lives=half_lives, formats=formats, sink=sink)
+    if sink:
+        write_combined([res for _, res in sink], OUTPUT / f"combined_{args.mode}", formats)
+
+def _profiled(fn, args, path: Path) -> None:
+    import cProfile, pstats
+
+    prof = cProfile.Profile()
+    try:
+        prof.runcall(fn, args)
+    finally:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        prof.dump_stats(str(path))
+        print(f"\n[PROFILE] saved {path} (view with: snakeviz {path.name})")
+        pstats.Stats(prof).sort_stats("cumulative").print_stats(20)
+
+def _write_metrics(m: "metrics.Collector") -> None:
+    """One JSON line per run in output/metrics.jsonl, plus the per-stage breakdown."""
+    data = m.to_dict()
+    with open(OUTPUT / "metrics.jsonl", "a", encoding="utf-8") as f:
+        f.write(json.dumps(data) + "\n")
+    c = data["counters"]
+    print(f"[METRICS] {data['wall_s']:.2f}s total | {m.breakdown() or 'no stages'} | "
+          f"http={c.get('http.requests', 0)} retries={c.get('http.retries', 0)} "
+          f"bytes={c.get('http.bytes', 0)} cache_hits={c.get('cache.fresh', 0) + c.get('cache.stale', 0)}")
 
 if __name__ == "__main__":
     main()
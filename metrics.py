@@ -0,0 +1,133 @@
+# metrics.py
+from __future__ import annotations
+import contextvars, functools, json, os, threading, time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+# Lightweight run instrumentation. A Collector is installed for the duration of
+# a run with `collect()`; `span()` / `incr()` anywhere below it record into it
+# and are near-free no-ops when nothing is collecting. Worker threads do not
+# inherit context variables, so pool submissions go through `bind()`.
+
+_current: contextvars.ContextVar[Optional["Collector"]] = contextvars.ContextVar("newstrend_metrics", default=None)
+
+# Stages shown in the one-line breakdown (GUI status bar, CLI summary), in pipeline order
+STAGE_LABELS = [
+    ("fetch", "fetch"),
+    ("parse_dates", "dates"),
+    ("merge", "merge"),
+    ("vectorize", "vectorize"),
+    ("keyphrases", "keyphrases"),
+    ("rank", "rank"),
+    ("burst", "burst"),
+    ("write", "write"),
+]
+
+class Collector:
+    """Thread-safe span timings (count, total, max seconds) and counters for one run."""
+
+    def __init__(self, name: str = "run"):
+        self.name = name
+        self.started = time.time()
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+        self.spans: Dict[str, list] = {}
+        self.counters: Counter = Counter()
+
+    def add_span(self, name: str, seconds: float) -> None:
+        with self._lock:
+            s = self.spans.get(name)
+            if s is None:
+                self.spans[name] = [1, seconds, seconds]
+            else:
+                s[0] += 1; s[1] += seconds; s[2] = max(s[2], seconds)
+
+    def incr(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += n
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._t0
+
+    def stage_seconds(self, stage: str) -> float:
+        """Total time of spans named `stage` or `stage.<sub>`."""
+        with self._lock:
+            return sum(v[1] for k, v in self.spans.items() if k == stage or k.startswith(stage + "."))
+
+    def breakdown(self) -> str:
+        """'fetch 1.42s · vectorize 0.21s · …' for the stages that ran (concurrent spans overlap)."""
+        parts = []
+        for stage, label in STAGE_LABELS:
+            t = self.stage_seconds(stage)
+            if t > 0:
+                parts.append(f"{label} {t:.2f}s")
+        return " · ".join(parts)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            spans = {k: {"count": v[0], "total_s": round(v[1], 6), "max_s": round(v[2], 6)}
+                     for k, v in sorted(self.spans.items())}
+            counters = dict(sorted(self.counters.items()))
+        return {
+            "name": self.name,
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(self.started)),
+            "wall_s": round(self.elapsed(), 6),
+            "pid": os.getpid(),
+            "spans": spans,
+            "counters": counters,
+        }
+
+    def write(self, path: Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+        return path
+
+def current() -> Optional[Collector]:
+    return _current.get()
+
+@contextmanager
+def collect(name: str = "run") -> Iterator[Collector]:
+    """Install a fresh Collector for the enclosed block (and anything bound from it)."""
+    c = Collector(name)
+    token = _current.set(c)
+    try:
+        yield c
+    finally:
+        _current.reset(token)
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    c = _current.get()
+    if c is None:
+        yield
+        return
+    t = time.perf_counter()
+    try:
+        yield
+    finally:
+        c.add_span(name, time.perf_counter() - t)
+
+def timed(name: str) -> Callable:
+    """Decorator form of `span`."""
+    def deco(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*a, **kw):
+            with span(name):
+                return fn(*a, **kw)
+        return wrapper
+    return deco
+
+def incr(name: str, n: int = 1) -> None:
+    c = _current.get()
+    if c is not None:
+        c.incr(name, n)
+
+def bind(fn: Callable) -> Callable:
+    """`fn` wrapped to run in a copy of the caller's context (one copy per call to bind)."""
+    ctx = contextvars.copy_context()
+    return functools.partial(ctx.run, fn)
@@ -1,46 +1,135 @@
 # news_sources.py
-import sys
-import os, time, math, re
-from typing import List, Dict, Any
+import math, re, threading
+from collections import Counter
+from contextlib import closing
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple
 from datetime import datetime, timezone, timedelta
-import requests
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
-from dateutil.relativedelta import relativedelta
-from dateutil import parser as duparser
-from config_loader import load_env_near_exe
+from config_loader import get_settings
+from http_client import get_session, json_loads
+from article import Article
+import cancel, metrics
+from response_cache import get_cache, cache_key
+from rate_limit import QuotaExhausted, RATE_LIMIT_MAX_WAIT_S, get_limiter, parse_retry_after
+
+S = get_settings()
+env_info = S.env_info
+
+REQUEST_TIMEOUT   = S.request_timeout
+NEWSAPI_KEY       = S.newsapi_key
+SERPAPI_API_KEY   = S.serpapi_api_key
+
+NEWSAPI_BASE      = S.newsapi_base
+SERPAPI_BASE      = S.serpapi_base
+
+NEWSAPI_SOURCES   = S.newsapi_sources
+NEWSAPI_DOMAINS   = S.newsapi_domains
+NEWSAPI_SEARCH_IN = S.newsapi_search_in
+NEWSAPI_MAX_RESULTS = S.newsapi_max_results
+
+SERPAPI_NUM       = S.serpapi_num
+SERPAPI_PAGES     = S.serpapi_pages
+SERPAPI_PHRASE    = S.serpapi_phrase
+NEAR_DUP_THRESHOLD = S.near_dup_threshold  # 0 disables near-duplicate collapsing
+KEEP_RAW          = S.keep_raw  # keep provider payloads on each Article (debug only)
+
+# Max in-flight page requests per provider (shared by every concurrent query)
+NEWSAPI_CONCURRENCY = S.newsapi_concurrency
+SERPAPI_CONCURRENCY = S.serpapi_concurrency
+
+_PROVIDER_SLOTS = {
+    "newsapi": threading.BoundedSemaphore(NEWSAPI_CONCURRENCY),
+    "serpapi": threading.BoundedSemaphore(SERPAPI_CONCURRENCY),
+}
+
+# Attempts per request and the exponential backoff bounds between them
+HTTP_RETRIES     = S.http_retries
+HTTP_RETRY_MIN_S = S.http_retry_min_s
+HTTP_RETRY_MAX_S = S.http_retry_max_s
+
+# on_page(provider, page, pages, rows, last): called from the fetching thread as
+# each page's articles are parsed, then once more with last=True (and usually no
+# rows) when the provider is finished, however it stopped.
+PageCallback = Callable[[str, int, int, List[Article], bool], None]
 
-env_info = load_env_near_exe(require_local=True,  # require a sibling .env
-                             verbose=("--debug-env" in sys.argv))
+def have_newsapi() -> bool:
+    return bool(NEWSAPI_KEY)
 
-REQUEST_TIMEOUT = int(float(os.getenv("REQUEST_TIMEOUT", "20")))
-NEWSAPI_KEY       = os.getenv("NEWSAPI_KEY", "")
-SERPAPI_API_KEY   = os.getenv("SERPAPI_API_KEY", "")
+def have_serpapi() -> bool:
+    return bool(SERPAPI_API_KEY)
 
-NEWSAPI_BASE      = os.getenv("NEWSAPI_BASE", "https://newsapi.org/v2/everything")
-SERPAPI_BASE      = os.getenv("SERPAPI_BASE", "https://serpapi.com/search.json")
+DATE_CACHE_SIZE = S.date_cache_size
 
-NEWSAPI_SOURCES   = os.getenv("NEWSAPI_SOURCES", "") or None
-NEWSAPI_DOMAINS   = os.getenv("NEWSAPI_DOMAINS", "") or None
-NEWSAPI_SEARCH_IN = os.getenv("NEWSAPI_SEARCH_IN", "title,description")
-NEWSAPI_MAX_RESULTS = int(os.getenv("NEWSAPI_MAX_RESULTS", "100"))
+# SerpApi google_news: "10/21/2025, 08:55 PM, +0000 UTC"
+_SERP_DATE_RE = re.compile(
+    r"^(\d{1,2})/(\d{1,2})/(\d{4}),?\s+(\d{1,2}):(\d{2})\s*([AaPp][Mm]),?\s*([+-])(\d{2}):?(\d{2})(?:\s*UTC)?$"
+)
+_REL_DATE_RE = re.compile(r"(?i)^\s*(\d+)\s*(second|minute|hour|day|week|month|year)s?\s+ago\s*$")
 
-SERPAPI_NUM       = int(os.getenv("SERPAPI_NUM", "100"))
-SERPAPI_PAGES     = int(os.getenv("SERPAPI_PAGES", "2"))
-SERPAPI_PHRASE    = os.getenv("SERPAPI_PHRASE", "0").lower() in ("1","true","yes")
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_fixed(s: str) -> Optional[datetime]:
+    """Strict parsers for the formats the providers actually send. Pure, so memoized."""
+    # A) ISO-8601 (NewsAPI publishedAt, SerpApi date_utc)
+    if len(s) >= 10 and s[4:5] == "-" and s[7:8] == "-":
+        try:
+            dt = datetime.fromisoformat(s[:-1] + "+00:00" if s.endswith(("Z", "z")) else s)
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=timezone.utc)
+            return dt.astimezone(timezone.utc)
+        except ValueError:
+            pass
 
-def have_newsapi() -> bool:
-    return bool(NEWSAPI_KEY)
+    # B) SerpApi's fixed pattern, built directly from the regex groups
+    m = _SERP_DATE_RE.match(s)
+    if m:
+        mo, d, y, hh, mm, ampm, sign, oh, om = m.groups()
+        hour = int(hh) % 12 + (12 if ampm.upper() == "PM" else 0)
+        offset = timedelta(hours=int(oh), minutes=int(om))
+        try:
+            dt = datetime(int(y), int(mo), int(d), hour, int(mm), tzinfo=timezone.utc)
+        except ValueError:
+            return None
+        return dt - offset if sign == "+" else dt + offset
+    return None
 
-def have_serpapi() -> bool:
-    return bool(SERPAPI_API_KEY)
+def _parse_relative(s: str, base: datetime) -> Optional[datetime]:
+    # "3 hours ago" / "yesterday" – depends on `base`, so never memoized
+    m = _REL_DATE_RE.match(s)
+    if m:
+        from dateutil.relativedelta import relativedelta
+        n = int(m.group(1)); unit = m.group(2).lower()
+        return {
+            "second": lambda: base - timedelta(seconds=n),
+            "minute": lambda: base - timedelta(minutes=n),
+            "hour":   lambda: base - timedelta(hours=n),
+            "day":    lambda: base - timedelta(days=n),
+            "week":   lambda: base - timedelta(weeks=n),
+            "month":  lambda: base - relativedelta(months=n),
+            "year":   lambda: base - relativedelta(years=n),
+        }[unit]()
+    if s.lower() == "yesterday":
+        return base - timedelta(days=1)
+    return None
 
-def _parse_date(s: str):
+def _parse_date(s: str, now: Optional[datetime] = None):
     """Parse a wide range of SerpApi/NewsAPI date strings into tz-aware UTC datetimes."""
     if not s:
         return None
     s = str(s).strip()
 
-    # 0) Try dateparser (if available) – do NOT import at the top-level
+    # 1) Precompiled fast paths for known provider formats
+    dt = _parse_fixed(s)
+    if dt:
+        return dt
+
+    now = now or datetime.now(timezone.utc)
+    dt = _parse_relative(s, now)
+    if dt:
+        return dt
+
+    # 2) Slow generic fallbacks – dateparser, then dateutil (both imported lazily)
     try:
         import dateparser as _dp
         dt = _dp.parse(
@@ -48,7 +137,7 @@ def _parse_date(s: str):
             settings={
                 "RETURN_AS_TIMEZONE_AWARE": True,
                 "PREFER_DATES_FROM": "past",
-                "RELATIVE_BASE": datetime.now(timezone.utc),
+                "RELATIVE_BASE": now,
                 "TIMEZONE": "UTC",
                 "TO_TIMEZONE": "UTC",
                 "DATE_ORDER": "MDY",
@@ -57,22 +146,14 @@ def _parse_date(s: str):
         )
         if dt:
             return dt.astimezone(timezone.utc)
-    except Exception:
-        pass  # fall through to the other strategies
-
-    # B) Normalize common SerpApi pattern: "10/21/2025, 08:55 PM, +0000 UTC"
-    s2 = re.sub(r"\s*,\s*", " ", s)         # -> "10/21/2025 08:55 PM +0000 UTC"
-    s2 = s2.replace("UTC", "").strip()      # -> "10/21/2025 08:55 PM +0000"
-    # Try strict strptime on that pattern
-    try:
-        dt = datetime.strptime(s2, "%m/%d/%Y %I:%M %p %z")  # %z accepts +0000
-        return dt.astimezone(timezone.utc)
     except Exception:
         pass
 
-    # C) Make the offset ISO-like: +0000 -> +00:00, then try dateutil
-    s3 = re.sub(r"([+-]\d{2})(\d{2})(\s*)$", r"\1:\2", s2)  # -> +00:00
+    # Make the offset ISO-like: "... +0000 UTC" -> "... +00:00", then try dateutil
+    s2 = re.sub(r"\s*,\s*", " ", s).replace("UTC", "").strip()
+    s3 = re.sub(r"([+-]\d{2})(\d{2})(\s*)$", r"\1:\2", s2)
     try:
+        from dateutil import parser as duparser
         dt = duparser.parse(s3, tzinfos={"UTC": timezone.utc})
         if dt.tzinfo is None:
             dt = dt.replace(tzinfo=timezone.utc)
@@ -80,73 +161,234 @@ def _parse_date(s: str):
     except Exception:
         pass
 
-    # D) Relative-time fallback: "3 hours ago"
-    m = re.match(r"(?i)^\s*(\d+)\s*(second|minute|hour|day|week|month|year)s?\s+ago\s*$", s)
-    if m:
-        n = int(m.group(1)); unit = m.group(2).lower()
-        base = datetime.now(timezone.utc)
-        return {
-            "second": base - timedelta(seconds=n),
-            "minute": base - timedelta(minutes=n),
-            "hour":   base - timedelta(hours=n),
-            "day":    base - timedelta(days=n),
-            "week":   base - timedelta(weeks=n),
-            "month":  base - relativedelta(months=n),
-            "year":   base - relativedelta(years=n),
-        }[unit]
+    return None
 
-    if s.lower() == "yesterday":
-        return datetime.now(timezone.utc) - timedelta(days=1)
+def parse_dates(values: Iterable[str]) -> List[Optional[datetime]]:
+    """Parse a whole page of date strings against one `now`; duplicates are parsed once."""
+    now = datetime.now(timezone.utc)
+    memo: Dict[str, Optional[datetime]] = {}
+    out = []
+    for v in values:
+        if v not in memo:
+            memo[v] = _parse_date(v, now)
+        out.append(memo[v])
+    return out
 
-    return None
+class ApiError(Exception):
+    """Transient HTTP failure (429/408/5xx); retried, honouring the server's Retry-After."""
+
+    def __init__(self, msg: str, retry_after: Optional[float] = None):
+        super().__init__(msg)
+        self.retry_after = retry_after
+
+_retries: Counter = Counter()
+_retries_lock = threading.Lock()
 
-class ApiError(Exception): ...
+def _count_retry(state) -> None:
+    with _retries_lock:
+        _retries[state.args[0] if state.args else "?"] += 1
+    metrics.incr("http.retries")
+
+def retry_stats() -> Dict[str, int]:
+    """Retried attempts so far, per endpoint URL."""
+    with _retries_lock:
+        return dict(_retries)
+
+_backoff = wait_exponential(multiplier=1, min=HTTP_RETRY_MIN_S, max=HTTP_RETRY_MAX_S)
+
+def _wait_retry_after(state) -> float:
+    """Exponential backoff, unless the server said how long to wait."""
+    exc = state.outcome.exception() if state.outcome else None
+    ra = getattr(exc, "retry_after", None)
+    return min(ra, RATE_LIMIT_MAX_WAIT_S) if ra is not None else _backoff(state)
 
 @retry(
-    stop=stop_after_attempt(4),
-    wait=wait_exponential(multiplier=1, min=2, max=30),
+    stop=stop_after_attempt(HTTP_RETRIES),
+    wait=_wait_retry_after,
     retry=retry_if_exception_type(ApiError),
+    before_sleep=_count_retry,
+    sleep=cancel.sleep,   # a cancelled run stops backing off immediately
     reraise=True
 )
-def _http_get(url: str, params: Dict[str, Any] = None, headers: Dict[str, str] = None) -> Dict[str, Any]:
-    r = requests.get(url, params=params or {}, headers=headers or {}, timeout=REQUEST_TIMEOUT)
-    if r.status_code >= 500 or r.status_code in (429, 408):
-        raise ApiError(f"{r.status_code} {r.text[:200]}")
+def _http_get_network(url: str, params: Dict[str, Any] = None, headers: Dict[str, str] = None,
+                      provider: str = None) -> Dict[str, Any]:
+    limiter = get_limiter() if provider else None
+    if provider:
+        _spend_budget(provider)              # --budget-* counts every attempt, retries included
+    if limiter:
+        try:
+            waited = limiter.acquire(provider)   # daily quota + token bucket, per attempt
+        except QuotaExhausted:
+            _refund_budget(provider)         # refused before anything was sent
+            raise
+        if waited:
+            metrics.incr("ratelimit.waits")
+            metrics.incr("ratelimit.wait_ms", int(waited * 1000))
+    with metrics.span("http.request"):
+        r = get_session().get(url, params=params or {}, headers=headers or {}, timeout=REQUEST_TIMEOUT)
+    metrics.incr("http.requests")
+    metrics.incr("http.bytes", len(r.content))
+    if r.status_code != 200:
+        metrics.incr(f"http.status_{r.status_code}")
+    if r.status_code == 429:
+        retry_after = parse_retry_after(r.headers.get("Retry-After"))
+        if limiter:
+            limiter.throttled(provider, retry_after)   # raises QuotaExhausted on day-long waits
+        raise ApiError(f"{r.status_code} {r.text[:200]}", retry_after=retry_after)
+    if r.status_code >= 500 or r.status_code == 408:
+        raise ApiError(f"{r.status_code} {r.text[:200]}",
+                       retry_after=parse_retry_after(r.headers.get("Retry-After")))
+    if limiter:
+        limiter.succeeded(provider)
     if r.status_code != 200:
         try:
-            j = r.json()
-            if isinstance(j, dict) and j.get("message"):
-                raise Exception(f"HTTP {r.status_code}: {j.get('message')}")
+            j = json_loads(r.content)
         except Exception:
-            pass
+            j = None
+        # NewsAPI error envelope (e.g. 426 maximumResultsReached): let the fetcher act on `code`
+        if isinstance(j, dict) and j.get("status") == "error":
+            return j
+        if isinstance(j, dict) and j.get("message"):
+            raise Exception(f"HTTP {r.status_code}: {j.get('message')}")
         raise Exception(f"HTTP {r.status_code}: {r.text[:200]}")
     try:
-        return r.json()
+        return json_loads(r.content)
     except Exception:
         raise Exception("Invalid JSON from API")
 
-def _norm_row(title, url, summary, published_at, source):
-    return {
-        "title": (title or "").strip(),
-        "url": url or "",
-        "summary": (summary or "").strip(),
-        "published_at": published_at,  # tz-aware UTC datetime
-        "source": source,
-    }
+def _cacheable(data) -> bool:
+    # Provider-level errors (quota, no results) must not be replayed from cache
+    return isinstance(data, dict) and not data.get("error") and data.get("status") != "error"
+
+_budget: Dict[str, Optional[int]] = {}
+_budget_lock = threading.Lock()
+
+def set_request_budget(provider: str, limit: Optional[int]) -> None:
+    """Cap network requests to `provider` for the rest of the process (None = unlimited)."""
+    with _budget_lock:
+        _budget[provider] = None if limit is None else max(0, int(limit))
+
+def request_budget() -> Dict[str, Optional[int]]:
+    with _budget_lock:
+        return dict(_budget)
+
+def _spend_budget(provider: str) -> None:
+    with _budget_lock:
+        left = _budget.get(provider)
+        if left is None:
+            return
+        if left <= 0:
+            raise QuotaExhausted(f"{provider} request budget exhausted")
+        _budget[provider] = left - 1
+
+def _refund_budget(provider: str) -> None:
+    with _budget_lock:
+        if _budget.get(provider) is not None:
+            _budget[provider] += 1
+
+def _http_get(url: str, params: Dict[str, Any] = None, headers: Dict[str, str] = None,
+              provider: str = None, refresh: bool = False) -> Dict[str, Any]:
+    """Cached GET; refresh=True skips the cache lookup but still stores the fresh response."""
+    cancel.check()
+    cache = get_cache() if provider else None
+    if cache is None:
+        return _http_get_network(url, params=params, headers=headers, provider=provider)
+
+    key = cache_key(url, params)
+    if refresh:
+        metrics.incr("cache.bypass")
+    else:
+        data, state = cache.lookup(key, provider)
+        metrics.incr(f"cache.{state}")
+        if state == "fresh":
+            return data
+        if state == "stale":
+            cache.revalidate(key, provider,
+                             lambda: _http_get_network(url, params=params, headers=headers, provider=provider),
+                             keep=_cacheable)
+            return data
+
+    data = _http_get_network(url, params=params, headers=headers, provider=provider)
+    if _cacheable(data):
+        cache.put(key, provider, data)
+    return data
+
+def cache_stats() -> Dict[str, int]:
+    cache = get_cache()
+    return cache.stats() if cache else {}
+
+def _fetch_pages(provider: str, url: str, pages: List[Dict[str, Any]],
+                 headers: Dict[str, str] = None, prefetch: bool = True,
+                 refresh: bool = False) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Yield (page_no, json) in page order. The first page is requested on its
+    own; the rest go out concurrently (bounded by the provider's slot count)
+    only once the caller asks for the next page, so an error or empty first
+    page (e.g. "out of searches") never spends requests on pages 2..N.
+    Closing the generator early (or cancelling the run) drops pages that have
+    not started yet; errors only surface for consumed pages.
+    With prefetch=False a page is only requested once the previous one was consumed;
+    refresh=True bypasses the response cache (see _http_get).
+    """
+    def one(params):
+        with _PROVIDER_SLOTS[provider]:
+            return _http_get(url, params=params, headers=headers, provider=provider, refresh=refresh)
+
+    if not pages:
+        return
+    yield pages[0]["page"], one(pages[0])
+    rest = pages[1:]
+    if not prefetch:
+        for p in rest:
+            yield p["page"], one(p)
+        return
+    if not rest:
+        return
+
+    limit = NEWSAPI_CONCURRENCY if provider == "newsapi" else SERPAPI_CONCURRENCY
+    ex = ThreadPoolExecutor(max_workers=max(1, min(len(rest), limit)))
+    futures = [ex.submit(metrics.bind(one), p) for p in rest]
+    try:
+        for p, fut in zip(rest, futures):
+            yield p["page"], cancel.result(fut)
+    finally:
+        for fut in futures:
+            fut.cancel()
+        ex.shutdown(wait=False)
+
+def _norm_row(title, url, summary, published_at, source, raw=None) -> Article:
+    return Article(
+        (title or "").strip(),
+        url or "",
+        (summary or "").strip(),
+        published_at,  # tz-aware UTC datetime
+        source,
+        raw if KEEP_RAW else None,
+    )
 
 def fetch_newsapi(query: str, lang: str = "en", days: int = 7,
-                  page_size: int = 50, max_pages: int = 2) -> List[Dict[str, Any]]:
+                  page_size: int = 50, max_pages: int = 2,
+                  since: Optional[datetime] = None,
+                  on_page: Optional[PageCallback] = None,
+                  refresh: bool = False) -> List[Dict[str, Any]]:
+    """
+    `since` narrows the window start (never widens it) for incremental runs;
+    `on_page` receives each page's rows as soon as they are parsed;
+    refresh=True asks the network even when the response cache has the pages.
+    """
     if not NEWSAPI_KEY:
         return []
     headers = {"X-Api-Key": NEWSAPI_KEY}
     out: List[Dict[str, Any]] = []
 
     now = datetime.now(timezone.utc)
-    since = now - timedelta(days=int(days or 7))
+    window_start = now - timedelta(days=int(days or 7))
+    since = max(window_start, since) if since else window_start
 
     # Cap pages to plan limit
     allowed_pages = max(1, min(max_pages, math.ceil(NEWSAPI_MAX_RESULTS / max(1, page_size))))
 
+    page_params = []
     for page in range(1, allowed_pages + 1):
         params = {
             "q": query,
@@ -160,32 +402,52 @@ def fetch_newsapi(query: str, lang: str = "en", days: int = 7,
         }
         if NEWSAPI_SOURCES: params["sources"] = NEWSAPI_SOURCES
         if NEWSAPI_DOMAINS: params["domains"] = NEWSAPI_DOMAINS
-
-        data = _http_get(NEWSAPI_BASE, params=params, headers=headers)
-        if isinstance(data, dict) and data.get("status") == "error":
-            code = data.get("code", "error")
-            msg = data.get("message", "")
-            if code == "maximumResultsReached":
-                print("[NewsAPI] maximumResultsReached: partial results")
+        page_params.append(params)
+
+    done = 0
+    with closing(_fetch_pages("newsapi", NEWSAPI_BASE, page_params, headers=headers,
+                              refresh=refresh)) as pages:
+        for page, data in pages:
+            cancel.check()
+            if isinstance(data, dict) and data.get("status") == "error":
+                code = data.get("code", "error")
+                msg = data.get("message", "")
+                if code == "maximumResultsReached":
+                    print("[NewsAPI] maximumResultsReached: partial results")
+                    break
+                raise Exception(f"NewsAPI error {code}: {msg}")
+
+            articles = data.get("articles") or []
+            with metrics.span("parse_dates"):
+                pubs = parse_dates([a.get("publishedAt") or "" for a in articles])
+            start = len(out)
+            for a, pub in zip(articles, pubs):
+                if not pub:      # keep timestamps honest
+                    continue
+                out.append(_norm_row(a.get("title"), a.get("url"),
+                                     a.get("description") or a.get("content") or "",
+                                     pub, "newsapi", raw=a))
+            done = page
+            if on_page:
+                on_page("newsapi", page, allowed_pages, out[start:], False)
+            if len(articles) < page_size:
                 break
-            raise Exception(f"NewsAPI error {code}: {msg}")
-
-        articles = data.get("articles") or []
-        for a in articles:
-            pub = _parse_date(a.get("publishedAt") or "")
-            if not pub:      # keep timestamps honest
-                continue
-            out.append(_norm_row(a.get("title"), a.get("url"),
-                                 a.get("description") or a.get("content") or "",
-                                 pub, "newsapi"))
-        if len(articles) < page_size:
-            break
-        time.sleep(0.3)
+    if on_page:
+        on_page("newsapi", done, allowed_pages, [], True)
 
     out.sort(key=lambda x: x["published_at"], reverse=True)
     return out
 
-def fetch_serpapi_google_news(query: str, lang: str = "en", pages: int = 2) -> List[Dict[str, Any]]:
+def fetch_serpapi_google_news(query: str, lang: str = "en", pages: int = 2,
+                              stop_before: Optional[datetime] = None,
+                              on_page: Optional[PageCallback] = None,
+                              refresh: bool = False) -> List[Dict[str, Any]]:
+    """
+    Google News has no date filter, so for incremental runs `stop_before` pages
+    sequentially and stops after the first page with nothing newer than it.
+    `on_page` receives each page's rows as soon as they are parsed;
+    refresh=True asks the network even when the response cache has the pages.
+    """
     if not SERPAPI_API_KEY:
         return []
     q = f'"{query}"' if SERPAPI_PHRASE else query
@@ -193,52 +455,56 @@ def fetch_serpapi_google_news(query: str, lang: str = "en", pages: int = 2) -> L
     total_dropped = 0
     dropped_examples = []
 
-    for page in range(1, pages + 1):
-        params = {
-            "engine": "google_news",
-            "q": q,
-            "hl": lang,
-            "gl": "us",
-            "api_key": SERPAPI_API_KEY,
-            "num": SERPAPI_NUM,
-            "page": page,
-        }
-        data = _http_get(SERPAPI_BASE, params=params)
-
-        if isinstance(data, dict) and data.get("error"):
-            print(f"[DEBUG] SerpApi ERROR page={page}: {data.get('error')}")
-            break
-
-        news = data.get("news_results") or []
-        if not news:
-            print(f"[DEBUG] SerpApi page={page} returned 0 results; meta={data.get('search_metadata', {})}")
-            break
+    page_params = [{
+        "engine": "google_news",
+        "q": q,
+        "hl": lang,
+        "gl": "us",
+        "api_key": SERPAPI_API_KEY,
+        "num": SERPAPI_NUM,
+        "page": page,
+    } for page in range(1, pages + 1)]
+
+    done = 0
+    with closing(_fetch_pages("serpapi", SERPAPI_BASE, page_params,
+                              prefetch=stop_before is None, refresh=refresh)) as results:
+        for page, data in results:
+            cancel.check()
+            if isinstance(data, dict) and data.get("error"):
+                print(f"[DEBUG] SerpApi ERROR page={page}: {data.get('error')}")
+                break
 
-        for n in news:
-            title = (n.get("title") or "").strip()
-            url = n.get("link") or n.get("url") or ""
-            summary = (n.get("snippet") or "").strip()
+            news = data.get("news_results") or []
+            if not news:
+                print(f"[DEBUG] SerpApi page={page} returned 0 results; meta={data.get('search_metadata', {})}")
+                break
 
             # Prefer precise UTC if present
-            raw_date = n.get("date_utc") or n.get("date") or n.get("published") or ""
-            pub = _parse_date(raw_date)
-
-            if not pub:
-                total_dropped += 1
-                if len(dropped_examples) < 5:
-                    dropped_examples.append(raw_date)
-                continue
-
-            out.append({
-                "source": "serpapi",
-                "title": title,
-                "summary": summary,
-                "url": url,
-                "published_at": pub,
-                "language": lang,
-                "raw": n,
-            })
-        time.sleep(0.5)
+            raw_dates = [n.get("date_utc") or n.get("date") or n.get("published") or "" for n in news]
+            with metrics.span("parse_dates"):
+                pubs = parse_dates(raw_dates)
+            fresh, start = 0, len(out)
+            for n, raw_date, pub in zip(news, raw_dates, pubs):
+                title = (n.get("title") or "").strip()
+                url = n.get("link") or n.get("url") or ""
+                summary = (n.get("snippet") or "").strip()
+
+                if not pub:
+                    total_dropped += 1
+                    if len(dropped_examples) < 5:
+                        dropped_examples.append(raw_date)
+                    continue
+
+                out.append(_norm_row(title, url, summary, pub, "serpapi", raw=n))
+                if stop_before is None or pub > stop_before:
+                    fresh += 1
+            done = page
+            if on_page:
+                on_page("serpapi", page, pages, out[start:], False)
+            if stop_before is not None and not fresh:
+                break
+    if on_page:
+        on_page("serpapi", done, pages, [], True)
 
     if total_dropped:
         print(f"[DEBUG] SerpApi dropped {total_dropped} items due to unparseable date; examples={dropped_examples}")
@@ -253,18 +519,109 @@ def fetch_serpapi_google_news(query: str, lang: str = "en", pages: int = 2) -> L
     return uniq
 
 
-def fetch_both(query: str, lang: str = "en", days: int = 7,
-               nc_page_size: int = 100, nc_pages: int = 2, serp_pages: int = 2) -> List[Dict[str, Any]]:
-    a = fetch_newsapi(query, lang=lang, days=days, page_size=nc_page_size, max_pages=nc_pages) if have_newsapi() else []
-    print(f"[DEBUG] NewsAPI returned {len(a)}")
-    b = fetch_serpapi_google_news(query, lang=lang, pages=serp_pages) if have_serpapi() else []
-    print(f"[DEBUG] SerpApi returned {len(b)}")
-
-    seen, out = set(), []
-    for it in a + b:
-        key = it.get("url") or it.get("title")
-        if key and key not in seen:
-            out.append(it); seen.add(key)
-
-    out.sort(key=lambda x: x["published_at"], reverse=True)
+def _merge_rows(*groups: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    De-duplicate by URL (or title when URL is missing), sort newest first, then
+    collapse syndicated near-duplicates to one row each (NEAR_DUP_THRESHOLD).
+    """
+    with metrics.span("merge"):
+        seen, out = set(), []
+        for group in groups:
+            for it in group:
+                key = it.get("url") or it.get("title")
+                if key and key not in seen:
+                    out.append(it); seen.add(key)
+
+        out.sort(key=lambda x: x["published_at"], reverse=True)
+        if NEAR_DUP_THRESHOLD > 0 and len(out) > 1:
+            from dedup import collapse_near_duplicates
+            n = len(out)
+            out = collapse_near_duplicates(out, threshold=NEAR_DUP_THRESHOLD)
+            metrics.incr("merge.near_duplicates", n - len(out))
+            if len(out) < n:
+                print(f"[DEBUG] Collapsed {n - len(out)} near-duplicate articles")
+    metrics.incr("articles", len(out))
     return out
+
+def fetch_both(query: str, lang: str = "en", days: int = 7,
+               nc_page_size: int = 100, nc_pages: int = 2, serp_pages: int = 2,
+               incremental: Optional[bool] = None,
+               on_page: Optional[PageCallback] = None,
+               refresh: bool = False) -> List[Dict[str, Any]]:
+    """
+    Merged, de-duplicated, newest-first rows from both providers. With
+    incremental=True (default: ARTICLE_STORE) only articles newer than the
+    stored high-water mark are fetched and the rest of the window is read
+    back from the local article store. `on_page` streams raw (un-merged)
+    pages while the fetch is still running; stored rows arrive as provider "store".
+    refresh=True skips response-cache lookups (fresh pages are still cached).
+    """
+    if incremental is None:
+        incremental = S.article_store
+    if incremental:
+        return _fetch_incremental(query, lang, days, nc_page_size, nc_pages, serp_pages, on_page, refresh)
+
+    # Both providers run side by side; each fans out its own pages.
+    with metrics.span("fetch"), ThreadPoolExecutor(max_workers=2) as ex:
+        fa = ex.submit(metrics.bind(fetch_newsapi), query, lang=lang, days=days,
+                       page_size=nc_page_size, max_pages=nc_pages, on_page=on_page,
+                       refresh=refresh) if have_newsapi() else None
+        fb = ex.submit(metrics.bind(fetch_serpapi_google_news), query, lang=lang,
+                       pages=serp_pages, on_page=on_page, refresh=refresh) if have_serpapi() else None
+        a = cancel.result(fa) if fa else []
+        print(f"[DEBUG] NewsAPI returned {len(a)}")
+        b = cancel.result(fb) if fb else []
+        print(f"[DEBUG] SerpApi returned {len(b)}")
+    metrics.incr("fetched.newsapi", len(a))
+    metrics.incr("fetched.serpapi", len(b))
+
+    stats = cache_stats()
+    if stats:
+        print(f"[DEBUG] HTTP cache hits={stats['hits']} stale={stats['stale_hits']} misses={stats['misses']}")
+
+    return _merge_rows(a, b)
+
+def _fetch_incremental(query: str, lang: str, days: int, nc_page_size: int, nc_pages: int,
+                       serp_pages: int, on_page: Optional[PageCallback] = None,
+                       refresh: bool = False) -> List[Dict[str, Any]]:
+    from article_store import get_store, query_key
+
+    store = get_store()
+    qk = query_key(query, lang)
+    window_start = datetime.now(timezone.utc) - timedelta(days=int(days or 7))
+    overlap = timedelta(minutes=S.article_store_overlap_min)  # catch late-indexed items
+
+    wm_news = store.watermark(qk, "newsapi", window_start)
+    wm_serp = store.watermark(qk, "serpapi", window_start)
+    if on_page and (wm_news or wm_serp):
+        # What we already have is the best first answer while the deltas load
+        with metrics.span("store"):
+            on_page("store", 1, 1, store.window(qk, window_start), True)
+
+    with metrics.span("fetch"), ThreadPoolExecutor(max_workers=2) as ex:
+        fa = ex.submit(metrics.bind(fetch_newsapi), query, lang=lang, days=days, page_size=nc_page_size,
+                       max_pages=nc_pages, since=wm_news - overlap if wm_news else None,
+                       on_page=on_page, refresh=refresh) if have_newsapi() else None
+        fb = ex.submit(metrics.bind(fetch_serpapi_google_news), query, lang=lang, pages=serp_pages,
+                       stop_before=wm_serp, on_page=on_page, refresh=refresh) if have_serpapi() else None
+        a = cancel.result(fa) if fa else []
+        b = cancel.result(fb) if fb else []
+    metrics.incr("fetched.newsapi", len(a))
+    metrics.incr("fetched.serpapi", len(b))
+    print(f"[DEBUG] NewsAPI delta {len(a)} (since {wm_news or 'full window'})")
+    print(f"[DEBUG] SerpApi delta {len(b)} (since {wm_serp or 'full window'})")
+
+    with metrics.span("store"):
+        store.add(qk, a + b)
+        # Keep at least this query's window (and ARTICLE_STORE_KEEP_DAYS for wider ones)
+        pruned = store.prune(datetime.now(timezone.utc) - timedelta(days=max(int(days or 7),
+                                                                           S.article_store_keep_days)))
+        if pruned:
+            metrics.incr("store.pruned", pruned)
+        if fa:
+            store.advance(qk, "newsapi", a, window_start, full=wm_news is None)
+        if fb:
+            store.advance(qk, "serpapi", b, window_start, full=wm_serp is None)
+        rows = store.window(qk, window_start)
+    print(f"[DEBUG] Article store window holds {len(rows)}")
+    return _merge_rows(rows)
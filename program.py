@@ -1,24 +1,25 @@
+import time
+_T0 = time.perf_counter()  # cold-start clock: measured until the first idle event
+
 import os, threading, queue, webbrowser, sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import timezone
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from config_loader import load_env_near_exe
+from config_loader import get_settings
 
-env_info = load_env_near_exe(require_local=True,  # require a sibling .env
-                             verbose=("--debug-env" in sys.argv))
+S = get_settings()
+env_info = S.env_info
 
-# --- your existing modules ---
+# --- your existing modules (heavy deps inside are imported on first run) ---
 from keyword_trending import co_trending_topics
 from analysis import write_csv_topics, write_markdown
+from gui_table import Column, VirtualTable
+import cancel, metrics
 
 
-def app_dir() -> Path:
-    # when frozen, use the folder containing the .exe
-    return Path(sys.executable).parent if getattr(sys, "frozen", False) else Path(__file__).resolve().parent
-
-
-APP_DIR = app_dir()
+APP_DIR = S.app_dir
 
 env_path = APP_DIR / ".env"
 
@@ -32,32 +33,279 @@ OUTPUT = (APP_DIR / "output")
 OUTPUT.mkdir(exist_ok=True)
 
 # --- default knobs (also read from .env if present) ---
-LANG = os.getenv("LANG", "en")
-DAYS = int(os.getenv("DAYS", "7"))
-TOP_K = int(os.getenv("TOP_K", "15"))
-HALF_LIFE_H = float(os.getenv("HALF_LIFE_H", "36"))
+LANG = S.lang
+DAYS = S.days
+TOP_K = S.top_k
+HALF_LIFE_H = S.half_life_h
+GUI_WORKERS = S.gui_workers   # queries running at once; further runs wait their turn
+POLL_MS = 50
 
 
 def _slug(text: str) -> str:
     return "".join(c if c.isalnum() or c in "-_." else "_" for c in text.strip())
 
 
+def _article_cells(r) -> tuple:
+    ts = r.get("published_at")
+    ts_str = ts.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M UTC") if ts else ""
+    return ts_str, r.get("source", ""), r.get("title", "")
+
+
+PROVIDER_LABELS = {"newsapi": "NewsAPI", "serpapi": "SerpApi", "store": "Stored"}
+
+
+def _open_url(url: str):
+    if url.startswith("http://") or url.startswith("https://"):
+        webbrowser.open(url)
+
+
+def _timing(m) -> str:
+    c = m.counters
+    if c.get("corpus.hit"):
+        return f"{m.elapsed():.2f}s — rescored cached corpus (Run again unchanged to refetch)"
+    return (f"{m.elapsed():.1f}s — {m.breakdown() or 'no stages'} "
+            f"| {c.get('http.requests', 0)} requests, {c.get('cache.fresh', 0) + c.get('cache.stale', 0)} cached")
+
+
+class QueryTab(ttk.Frame):
+    """One query: its own result tables, status line, provider progress and cancel token."""
+
+    def __init__(self, master, app, query):
+        super().__init__(master, padding=(0, 6, 0, 0))
+        self.app = app
+        self.query = query
+        self.token = None          # set while queued/running
+        self.future = None
+        self.last_topics_df = None
+        self.last_rows = []
+        self.last_knobs = None     # (days, topk, half_life) of the latest run
+        self._live_keys = set()
+        self._t_run, self._t_first = 0.0, None
+
+        self.var_status = tk.StringVar(value="Ready.")
+        ttk.Label(self, textvariable=self.var_status, anchor="w", style="Status.TLabel").pack(fill="x", pady=(0, 4))
+
+        # Per-provider page progress while a fetch streams in
+        self.frm_progress = ttk.Frame(self, padding=(0, 0, 0, 4))
+        self.frm_progress.pack(fill="x")
+        self._progress = {}
+        self._build_results()
+
+    @property
+    def busy(self) -> bool:
+        return self.token is not None
+
+    def _build_results(self):
+        pan = ttk.PanedWindow(self, orient=tk.VERTICAL)
+        pan.pack(fill="both", expand=True)
+
+        # Top: topics table
+        frm_top = ttk.Frame(pan, padding=(0, 4, 0, 4))
+        self.tv_topics = VirtualTable(
+            frm_top,
+            [Column("topic", 360, "w", stretch=True),
+             Column("score", 100, "e", numeric=True),
+             Column("count", 80, "e", numeric=True),
+             Column("variants", 280, "w", stretch=True)],
+            render=lambda r: (r[0], f"{float(r[1]):.3f}", int(r[2]), r[3]),
+            height=10,
+        )
+        self.tv_topics.pack(fill="both", expand=True)
+        pan.add(frm_top, weight=1)
+
+        # Bottom: articles list (all of them; only the visible rows exist as Treeview items)
+        frm_bottom = ttk.Frame(pan, padding=(0, 4, 0, 0))
+        self.tv_articles = VirtualTable(
+            frm_bottom,
+            [Column("time", 180), Column("source", 140), Column("title", 800, stretch=True)],
+            render=_article_cells,
+            payload=lambda r: r.get("url", ""),
+            on_activate=_open_url,
+            height=12,
+        )
+        self.tv_articles.pack(fill="both", expand=True)
+        pan.add(frm_bottom, weight=2)
+
+    # ---------- run lifecycle (GUI thread) ----------
+    def start(self, pool, days, topk, half_life):
+        """Run the query; re-running with unchanged knobs refetches instead of rescoring the cached corpus."""
+        knobs = (days, topk, half_life)
+        refresh, self.last_knobs = knobs == self.last_knobs, knobs
+        self.token = cancel.CancelToken()
+        self.last_topics_df, self.last_rows = None, []
+        self._live_keys = set()
+        self._t_run, self._t_first = time.perf_counter(), None
+        self.tv_topics.clear()
+        self.tv_articles.clear()
+        self._clear_progress()
+        self._set_status(f"Queued: {self.query} …")
+        self.future = pool.submit(self._work, self.token, days, topk, half_life, refresh)
+
+    def cancel(self):
+        tok = self.token
+        if tok is None or tok.cancelled:
+            return
+        tok.cancel()
+        self._set_status(f"Cancelling: {self.query} …")
+        if self.future is not None and self.future.cancel():
+            # Never started, so no worker will report back
+            self.app.worker_q.put((self, tok, "CANCELLED", "before it started"))
+
+    def handle(self, kind, *args):
+        if kind == "START":
+            self._set_status(f"Running: {self.query} …")
+        elif kind == "PAGE":
+            self._on_page(*args)
+        elif kind == "OK":
+            topics_df, rows, timing = args
+            self.token = self.future = None
+            self.last_topics_df = topics_df
+            self.last_rows = rows
+            self._populate_topics(topics_df)
+            self._populate_articles(rows)
+            self._finish_progress()
+            n = len(rows)
+            if topics_df is not None and not topics_df.empty:
+                self._set_status(f"Done. {topics_df.shape[0]} topics, {n} articles in {timing}")
+            else:
+                self._set_status(f"No signal. {n} fetched in {timing}")
+        elif kind == "CANCELLED":
+            self.token = self.future = None
+            shown = len(self._live_keys)
+            self._set_status(f"Cancelled {args[0]}" + (f" — {shown} articles so far shown" if shown else "."))
+        else:
+            self.token = self.future = None
+            self._set_status("Error.")
+            messagebox.showerror("Error", f"Run failed for {self.query!r}:\n\n{args[0]}")
+
+    # ---------- worker (pool thread) ----------
+    def _work(self, token, days, topk, half_life, refresh=False):
+        def post(*msg):
+            self.app.worker_q.put((self, token) + msg)
+
+        post("START")
+        # Provisional ranking over the pages seen so far; the final one comes from co_trending_topics
+        engine, lock = None, threading.Lock()
+
+        def get_engine():
+            nonlocal engine
+            if engine is None:
+                from cotrend_engine import CoTrendEngine
+                engine = CoTrendEngine(self.query, half_life_h=half_life)
+                engine.topics()   # pulls in numpy/pandas
+            return engine
+
+        def warm():
+            with lock:
+                get_engine()
+
+        def on_page(provider, page, pages, rows, last):
+            topics = None
+            if rows and not token.cancelled:
+                with lock:   # providers call in from their own threads
+                    eng = get_engine()
+                    eng.ingest(rows)
+                    topics = eng.topics(top_k=topk)
+            post("PAGE", provider, page, pages, last, rows, topics)
+
+        # sklearn/pandas imports overlap the first round trip instead of delaying the first page
+        threading.Thread(target=warm, daemon=True).start()
+
+        with cancel.scope(token), metrics.collect("gui") as m:
+            try:
+                topics_df, rows = co_trending_topics(
+                    query=self.query, lang=LANG, days=days,
+                    half_life_h=half_life, top_k=topk, refresh=refresh, on_page=on_page
+                )
+                rows = sorted(rows, key=lambda r: r.get("published_at") or 0, reverse=True)
+                post("OK", topics_df, rows, _timing(m))
+            except cancel.Cancelled:
+                post("CANCELLED", f"after {m.elapsed():.1f}s")
+            except Exception as e:
+                post("ERR", str(e))
+
+    # ---------- rendering ----------
+    def _on_page(self, provider, page, pages, last, rows, topics):
+        self._set_progress(provider, page, pages, last)
+        fresh = []
+        for r in rows:
+            key = r.get("url") or r.get("title")
+            if key and key not in self._live_keys:
+                self._live_keys.add(key)
+                fresh.append(r)
+        if fresh:
+            self.tv_articles.append_rows(fresh)
+        if topics is not None and not topics.empty:
+            self._populate_topics(topics)
+        if rows and not self.token.cancelled:
+            if self._t_first is None:
+                self._t_first = time.perf_counter() - self._t_run
+            self._set_status(f"Running: {self.query} … provisional ranking from "
+                             f"{len(self._live_keys)} articles (first page after {self._t_first:.1f}s)")
+
+    def _clear_progress(self):
+        for w in self.frm_progress.winfo_children():
+            w.destroy()
+        self._progress = {}
+
+    def _set_progress(self, provider, page, pages, last):
+        w = self._progress.get(provider)
+        if w is None:
+            lbl = ttk.Label(self.frm_progress, style="Secondary.TLabel")
+            bar = ttk.Progressbar(self.frm_progress, length=120, mode="determinate")
+            lbl.pack(side="left", padx=(0, 4))
+            bar.pack(side="left", padx=(0, 16))
+            w = self._progress[provider] = (lbl, bar)
+        lbl, bar = w
+        name = PROVIDER_LABELS.get(provider, provider)
+        bar.configure(maximum=max(1, pages), value=max(1, pages) if last else page)
+        lbl.configure(text=f"{name} {page}/{pages}" + (" ✓" if last else ""))
+
+    def _finish_progress(self):
+        for lbl, bar in self._progress.values():
+            bar.configure(value=bar.cget("maximum"))
+
+    def _set_status(self, s: str):
+        self.var_status.set(s)
+        self.app._update_summary()
+
+    def _populate_topics(self, df):
+        if df is None or df.empty:
+            self.tv_topics.clear()
+            return
+        variants = df["variants"] if "variants" in df.columns else [""] * len(df)
+        self.tv_topics.set_rows(list(zip(df["topic"], df["score"], df["count"], variants)))
+
+    def _populate_articles(self, rows):
+        self.tv_articles.set_rows(rows)
+
+
 class App(tk.Tk):
     def __init__(self):
         super().__init__()
         self.title(APP_TITLE)
-        self.geometry("1000x670")
+        self.geometry("1000x700")
         self.minsize(900, 600)
         self._apply_style()
 
+        self.worker_q = queue.Queue()
+        self.pool = ThreadPoolExecutor(max_workers=GUI_WORKERS, thread_name_prefix="query")
+        self._polling = False
+
         self._build_controls()
-        self._build_results()
+        self._build_tabs()
         self._bind_events()
-
-        self.worker_q = queue.Queue()
-        self.current_query = None
-        self.last_topics_df = None
-        self.last_rows = []
+        self._update_buttons()
+        self.after_idle(self._report_startup)
+
+    def _report_startup(self):
+        # Cold-start target for the desk build: `program.exe --startup-time` prints and exits
+        ms = (time.perf_counter() - _T0) * 1000.0
+        if "--startup-time" in sys.argv or ms > S.startup_target_ms:
+            verdict = "OK" if ms <= S.startup_target_ms else "SLOW"
+            print(f"[STARTUP] window ready in {ms:.0f} ms (target {S.startup_target_ms:.0f} ms) {verdict}")
+        if "--startup-time" in sys.argv:
+            self.after(0, self.destroy)
 
     # ------- Apply styles -------
     def _apply_style(self):
@@ -122,8 +370,14 @@ class App(tk.Tk):
         self.b_run = ttk.Button(btns, text="Run")
         self.b_run.pack(side="left")
 
+        self.b_cancel = ttk.Button(btns, text="Cancel", state="disabled")
+        self.b_cancel.pack(side="left", padx=(8, 0))
+
+        self.b_close = ttk.Button(btns, text="Close Tab", state="disabled")
+        self.b_close.pack(side="left", padx=(8, 0))
+
         self.b_save_md = ttk.Button(btns, text="Save Markdown", state="disabled")
-        self.b_save_md.pack(side="left", padx=8)
+        self.b_save_md.pack(side="left", padx=(24, 8))
 
         self.b_save_csv = ttk.Button(btns, text="Save CSV", state="disabled")
         self.b_save_csv.pack(side="left")
@@ -135,81 +389,34 @@ class App(tk.Tk):
         self.lbl_status = ttk.Label(self, textvariable=self.var_status, anchor="w", style="Status.TLabel")
         self.lbl_status.pack(fill="x", padx=10, pady=(0, 6))
 
-    def _sort_tree(self, tree, col, numeric=False):
-        items = [(tree.set(k, col), k) for k in tree.get_children("")]
-        if numeric:
-            def to_num(s):
-                try:
-                    return float(s)
-                except Exception:
-                    try:
-                        return int(s)
-                    except Exception:
-                        return 0
-            items.sort(key=lambda t: to_num(t[0]))
-        else:
-            items.sort(key=lambda t: (t[0] is None, str(t[0]).lower()))
-
-        descending = tree.heading(col, "text").endswith(" ▼")
-        tree.heading(col, text=col.capitalize() + (" ▲" if descending else " ▼"))
-
-        if descending:
-            items.reverse()
-
-        for i, (_, k) in enumerate(items):
-            tree.move(k, "", i)
-
-    def _build_results(self):
-        pan = ttk.PanedWindow(self, orient=tk.VERTICAL)
-        pan.pack(fill="both", expand=True, padx=10, pady=(0, 10))
-
-        # Top: topics table
-        frm_top = ttk.Frame(pan, padding=(0, 4, 0, 4))
-        cols = ("topic", "score", "count")
-        self.tv_topics = ttk.Treeview(frm_top, columns=cols, show="headings", height=10)
-        for c, w, anchor in (
-            ("topic", 600, "w"),
-            ("score", 120, "e"),
-            ("count", 100, "e"),
-        ):
-            self.tv_topics.heading(c, text=c.capitalize(),
-                                   command=lambda col=c: self._sort_tree(self.tv_topics, col, numeric=(col != "topic")))
-            self.tv_topics.column(c, width=w, anchor=anchor, stretch=True if c == "topic" else False)
-
-        vs1 = ttk.Scrollbar(frm_top, orient="vertical", command=self.tv_topics.yview)
-        self.tv_topics.configure(yscroll=vs1.set, selectmode="browse")
-        self.tv_topics.grid(row=0, column=0, sticky="nsew")
-        vs1.grid(row=0, column=1, sticky="ns")
-        frm_top.grid_rowconfigure(0, weight=1)
-        frm_top.grid_columnconfigure(0, weight=1)
-        pan.add(frm_top, weight=1)
-
-        # Bottom: articles list
-        frm_bottom = ttk.Frame(pan, padding=(0, 4, 0, 0))
-        cols2 = ("time", "source", "title")
-        self.tv_articles = ttk.Treeview(frm_bottom, columns=cols2, show="headings", height=12)
-        for c, w, anchor in (
-            ("time", 180, "w"),
-            ("source", 140, "w"),
-            ("title", 800, "w"),
-        ):
-            self.tv_articles.heading(c, text=c.capitalize(),
-                                     command=lambda col=c: self._sort_tree(self.tv_articles, col, numeric=False))
-            self.tv_articles.column(c, width=w, anchor=anchor, stretch=(c == "title"))
-        vs2 = ttk.Scrollbar(frm_bottom, orient="vertical", command=self.tv_articles.yview)
-        self.tv_articles.configure(yscroll=vs2.set, selectmode="browse")
-        self.tv_articles.grid(row=0, column=0, sticky="nsew")
-        vs2.grid(row=0, column=1, sticky="ns")
-        frm_bottom.grid_rowconfigure(0, weight=1)
-        frm_bottom.grid_columnconfigure(0, weight=1)
-        pan.add(frm_bottom, weight=2)
+    def _build_tabs(self):
+        self.nb = ttk.Notebook(self)
+        self.nb.pack(fill="both", expand=True, padx=10, pady=(0, 10))
 
     def _bind_events(self):
         self.b_run.configure(command=self._on_run)
+        self.b_cancel.configure(command=self._on_cancel)
+        self.b_close.configure(command=self._on_close_tab)
         self.b_save_md.configure(command=self._on_save_md)
         self.b_save_csv.configure(command=self._on_save_csv)
         self.b_open_out.configure(command=self._on_open_output)
-        self.tv_articles.bind("<Double-1>", self._open_selected_article)
+        self.e_query.bind("<Return>", lambda e: self._on_run())
+        self.nb.bind("<<NotebookTabChanged>>", lambda e: self._update_buttons())
+        self.protocol("WM_DELETE_WINDOW", self._on_quit)
+
+    # ---------- Tabs ----------
+    def _tabs(self):
+        return [self.nametowidget(t) for t in self.nb.tabs()]
+
+    def _current_tab(self):
+        sel = self.nb.select()
+        return self.nametowidget(sel) if sel else None
+
+    def _tab_for(self, query):
+        for tab in self._tabs():
+            if tab.query.lower() == query.lower():
+                return tab
+        return None
 
     # ---------- Actions ----------
     def _on_run(self):
@@ -218,116 +425,88 @@ class App(tk.Tk):
             messagebox.showwarning("Input", "Please enter a query.")
             return
 
-        self.current_query = q
-        self._set_status(f"Running: {q} …")
-        self._set_buttons_busy(True)
-        self._clear_tables()
+        tab = self._tab_for(q)
+        if tab is not None and tab.busy:
+            self.nb.select(tab)
+            self._set_status(f"{q!r} is already running.")
+            return
+        if tab is None:
+            tab = QueryTab(self.nb, self, q)
+            self.nb.add(tab, text=q if len(q) <= 24 else q[:23] + "…")
 
         days = int(self.s_days.get())
         topk = int(self.s_topk.get())
         half_life = float(self.s_halflife.get())
 
-        t = threading.Thread(
-            target=self._worker_run_keyword,
-            args=(q, days, topk, half_life),
-            daemon=True
-        )
-        t.start()
-        self.after(100, self._poll_worker)
-
-    def _worker_run_keyword(self, query, days, topk, half_life):
-        try:
-            topics_df, rows = co_trending_topics(
-                query=query, lang=LANG, days=days,
-                half_life_h=half_life, top_k=topk
-            )
-            rows = sorted(rows, key=lambda r: r.get("published_at") or 0, reverse=True)
-            self.worker_q.put(("OK", topics_df, rows))
-        except Exception as e:
-            self.worker_q.put(("ERR", str(e)))
-
-    def _poll_worker(self):
-        try:
-            msg = self.worker_q.get_nowait()
-        except queue.Empty:
-            self.after(100, self._poll_worker)
+        self.nb.select(tab)
+        tab.start(self.pool, days, topk, half_life)
+        self._update_buttons()
+        if not self._polling:
+            self._polling = True
+            self.after(POLL_MS, self._poll_worker)
+
+    def _on_cancel(self):
+        tab = self._current_tab()
+        if tab is not None:
+            tab.cancel()
+
+    def _on_close_tab(self):
+        tab = self._current_tab()
+        if tab is None:
             return
+        tab.cancel()
+        self.nb.forget(tab)
+        tab.destroy()
+        self._update_buttons()
+        self._update_summary()
+
+    def _on_quit(self):
+        for tab in self._tabs():
+            tab.cancel()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.destroy()
 
-        if msg[0] == "OK":
-            topics_df, rows = msg[1], msg[2]
-            self.last_topics_df = topics_df
-            self.last_rows = rows
-            self._populate_topics(topics_df)
-            self._populate_articles(rows)
-            n = len(rows)
-            if topics_df is not None and not topics_df.empty:
-                t1 = topics_df.shape[0]
-                self._set_status(f"Done. {t1} topics, {n} articles.")
-                self._set_buttons_busy(False, enable_save=True)
-            else:
-                self._set_status(f"No signal. {n} fetched.")
-                self._set_buttons_busy(False, enable_save=False)
+    def _poll_worker(self):
+        # One loop for every tab; messages from a superseded or closed run are dropped
+        while True:
+            try:
+                tab, token, kind, *args = self.worker_q.get_nowait()
+            except queue.Empty:
+                break
+            if token is tab.token and tab.winfo_exists():
+                tab.handle(kind, *args)
+                if kind not in ("START", "PAGE"):
+                    self._update_buttons()
+        if any(t.busy for t in self._tabs()):
+            self.after(POLL_MS, self._poll_worker)
         else:
-            err = msg[1]
-            messagebox.showerror("Error", f"Run failed:\n\n{err}")
-            self._set_status("Error.")
-            self._set_buttons_busy(False, enable_save=False)
-
-    def _set_buttons_busy(self, busy: bool, enable_save: bool = False):
-        self.b_run.configure(state="disabled" if busy else "normal")
-        self.b_save_md.configure(state="normal" if enable_save else "disabled")
-        self.b_save_csv.configure(state="normal" if enable_save else "disabled")
+            self._polling = False
+
+    def _update_buttons(self):
+        tab = self._current_tab()
+        done = tab is not None and not tab.busy and tab.last_topics_df is not None
+        self.b_cancel.configure(state="normal" if tab is not None and tab.busy else "disabled")
+        self.b_close.configure(state="normal" if tab is not None else "disabled")
+        self.b_save_md.configure(state="normal" if done and tab.last_rows else "disabled")
+        self.b_save_csv.configure(state="normal" if done and not tab.last_topics_df.empty else "disabled")
+
+    def _update_summary(self):
+        tabs = self._tabs()
+        running = sum(1 for t in tabs if t.busy and t.future is not None and t.future.running())
+        queued = sum(1 for t in tabs if t.busy) - running
+        if running or queued:
+            self._set_status(f"{running} running, {queued} queued (up to {GUI_WORKERS} at once)")
+        else:
+            self._set_status("Ready.")
 
     def _set_status(self, s: str):
         self.var_status.set(s)
 
-    def _clear_tables(self):
-        for tv in (self.tv_topics, self.tv_articles):
-            for i in tv.get_children():
-                tv.delete(i)
-
-    def _populate_topics(self, df):
-        if df is None or df.empty:
-            return
-        for i, (_, r) in enumerate(df.iterrows()):
-            tag = "oddrow" if i % 2 else "evenrow"
-            self.tv_topics.insert("", "end",
-                                  values=(r["topic"], f"{float(r['score']):.3f}", int(r["count"])),
-                                  tags=(tag,))
-        self.tv_topics.tag_configure("evenrow", background="#ffffff")
-        self.tv_topics.tag_configure("oddrow", background="#f8f9fb")
-
-    def _populate_articles(self, rows):
-        for i, r in enumerate(rows[:200]):
-            ts = r.get("published_at")
-            ts_str = ts.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M UTC") if ts else ""
-            src = r.get("source", "")
-            title = r.get("title", "")
-            tag = "oddrow" if i % 2 else "evenrow"
-
-            iid = self.tv_articles.insert("", "end", values=(ts_str, src, title), tags=(tag,))
-            # ✅ store URL along with stripe tag
-            self.tv_articles.item(iid, tags=(tag, r.get("url", "")))
-
-        self.tv_articles.tag_configure("evenrow", background="#ffffff")
-        self.tv_articles.tag_configure("oddrow", background="#f8f9fb")
-
-    # ✅ robust link opening (new)
-    def _open_selected_article(self, _evt=None):
-        sel = self.tv_articles.selection()
-        if not sel:
-            return
-        iid = sel[0]
-        tags = self.tv_articles.item(iid, "tags") or ()
-        for t in tags:
-            if isinstance(t, str) and (t.startswith("http://") or t.startswith("https://")):
-                webbrowser.open(t)
-                return
-
     def _on_save_md(self):
-        if self.last_topics_df is None or not self.last_rows:
+        tab = self._current_tab()
+        if tab is None or tab.last_topics_df is None or not tab.last_rows:
             return
-        q = self.current_query or "query"
+        q = tab.query
         slug = _slug(q)
         default = OUTPUT / f"coreport_{slug}.md"
         path = filedialog.asksaveasfilename(
@@ -339,13 +518,14 @@ class App(tk.Tk):
         )
         if not path:
             return
-        write_markdown(q, self.last_topics_df, self.last_rows, Path(path))
-        self._set_status(f"Saved: {path}")
+        write_markdown(q, tab.last_topics_df, tab.last_rows, Path(path))
+        tab.var_status.set(f"Saved: {path}")
 
     def _on_save_csv(self):
-        if self.last_topics_df is None or self.last_topics_df.empty:
+        tab = self._current_tab()
+        if tab is None or tab.last_topics_df is None or tab.last_topics_df.empty:
             return
-        q = self.current_query or "query"
+        q = tab.query
         slug = _slug(q)
         default = OUTPUT / f"cotopics_{slug}.csv"
         path = filedialog.asksaveasfilename(
@@ -357,8 +537,8 @@ class App(tk.Tk):
         )
         if not path:
             return
-        write_csv_topics(self.last_topics_df, Path(path))
-        self._set_status(f"Saved: {path}")
+        write_csv_topics(tab.last_topics_df, Path(path))
+        tab.var_status.set(f"Saved: {path}")
 
     def _on_open_output(self):
         os.startfile(str(OUTPUT))  # Windows convenience
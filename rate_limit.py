@@ -0,0 +1,189 @@
+# rate_limit.py
+import sqlite3, threading, time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Optional
+from config_loader import get_settings
+import cancel
+
+S = get_settings()
+
+# Longest server-requested pause we are willing to sit out; anything beyond
+# that (e.g. NewsAPI's "come back tomorrow") is reported as quota exhaustion.
+RATE_LIMIT_MAX_WAIT_S = S.rate_limit_max_wait_s
+QUOTA_PATH = S.quota_path
+
+class QuotaExhausted(Exception):
+    """A provider's request budget (per run or per day) is used up."""
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds from a Retry-After header (delta-seconds or HTTP-date); None if absent/invalid."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return max(0.0, (dt - datetime.now(timezone.utc)).total_seconds())
+
+class TokenBucket:
+    """
+    Token bucket with AIMD pacing: a 429 pauses the bucket for Retry-After and
+    cuts the refill rate (halved when the server gave no hint, down to a tenth
+    of the configured rate); each success creeps the rate back up.
+    """
+
+    def __init__(self, rate: float, burst: int, recover: float = 0.1):
+        self.max_rate = max(float(rate), 1e-3)
+        self.rate = self.max_rate
+        self.burst = max(1, int(burst))
+        self.min_rate = self.max_rate / 10.0
+        self.recover = recover              # share of max_rate regained per success
+        self.tokens = float(self.burst)
+        self.blocked_until = 0.0
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def acquire(self) -> float:
+        """Block until a token is available; returns the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                elif self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return waited
+                else:
+                    wait = (1.0 - self.tokens) / self.rate
+            cancel.sleep(wait)
+            waited += wait
+
+    def throttled(self, retry_after: Optional[float] = None) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate * (0.5 if retry_after is None else 0.8))
+            self.tokens = 0.0
+            pause = retry_after if retry_after is not None else 1.0 / self.rate
+            self.blocked_until = max(self.blocked_until, now + pause)
+
+    def succeeded(self) -> None:
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * self.recover)
+
+class DailyQuota:
+    """
+    Requests per provider per UTC day, kept in SQLite so concurrent processes
+    (GUI, server, watch runs) draw from one budget. Each request is a single
+    conditional upsert, so the check and the increment are atomic across
+    processes. Providers without a limit are never written.
+    """
+
+    def __init__(self, path: str, limits: Dict[str, int]):
+        self.path = Path(path)
+        self.limits = {k: int(v) for k, v in limits.items() if v and int(v) > 0}
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None, timeout=30)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("CREATE TABLE IF NOT EXISTS quota ("
+                       " day TEXT, provider TEXT, used INTEGER NOT NULL, PRIMARY KEY (day, provider))")
+            db.execute("DELETE FROM quota WHERE day < ?", (self._today(),))
+            self._db = db
+        return self._db
+
+    def spend(self, provider: str) -> None:
+        """Count one request, or raise QuotaExhausted without counting it."""
+        limit = self.limits.get(provider)
+        if limit is None:
+            return
+        with self._lock:
+            cur = self._conn().execute(
+                "INSERT INTO quota(day, provider, used) VALUES (?, ?, 1)"
+                " ON CONFLICT(day, provider) DO UPDATE SET used = used + 1 WHERE used < ?",
+                (self._today(), provider, limit))
+        if cur.rowcount == 0:
+            raise QuotaExhausted(f"{provider} daily quota of {limit} requests used up "
+                                 f"(resets 00:00 UTC; see {self.path.name})")
+
+    def status(self) -> Dict[str, Dict[str, Optional[int]]]:
+        if not self.limits:
+            return {}
+        with self._lock:
+            used = dict(self._conn().execute("SELECT provider, used FROM quota WHERE day=?", (self._today(),)))
+        return {p: {"used": used.get(p, 0), "limit": self.limits[p]} for p in sorted(self.limits)}
+
+class RateLimiter:
+    """Per-provider token buckets plus the shared daily quota, used by every HTTP request."""
+
+    def __init__(self, buckets: Dict[str, TokenBucket], quota: Optional[DailyQuota] = None):
+        self.buckets = buckets
+        self.quota = quota
+
+    def acquire(self, provider: str) -> float:
+        if self.quota is not None:
+            self.quota.spend(provider)
+        bucket = self.buckets.get(provider)
+        return bucket.acquire() if bucket else 0.0
+
+    def throttled(self, provider: str, retry_after: Optional[float] = None) -> None:
+        if retry_after is not None and retry_after > RATE_LIMIT_MAX_WAIT_S:
+            raise QuotaExhausted(f"{provider} asked to retry after {retry_after:.0f}s "
+                                 f"(> RATE_LIMIT_MAX_WAIT_S={RATE_LIMIT_MAX_WAIT_S:.0f}); treating as quota exhausted")
+        bucket = self.buckets.get(provider)
+        if bucket:
+            bucket.throttled(retry_after)
+
+    def succeeded(self, provider: str) -> None:
+        bucket = self.buckets.get(provider)
+        if bucket:
+            bucket.succeeded()
+
+    def status(self) -> Dict[str, Dict]:
+        out = {p: {"rate": round(b.rate, 3), "max_rate": b.max_rate, "burst": b.burst}
+               for p, b in self.buckets.items()}
+        if self.quota is not None:
+            for p, q in self.quota.status().items():
+                out.setdefault(p, {}).update(daily_used=q["used"], daily_limit=q["limit"])
+        return out
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+def get_limiter() -> RateLimiter:
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                pacing = {"newsapi": (S.newsapi_rate, S.newsapi_burst),
+                          "serpapi": (S.serpapi_rate, S.serpapi_burst)}
+                _limiter = RateLimiter(
+                    {p: TokenBucket(rate, burst) for p, (rate, burst) in pacing.items() if rate > 0},
+                    DailyQuota(QUOTA_PATH, {"newsapi": S.newsapi_daily_quota,
+                                            "serpapi": S.serpapi_daily_quota}),
+                )
+    return _limiter
@@ -0,0 +1,162 @@
+# response_cache.py
+import json, time, sqlite3, hashlib, threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+from config_loader import get_settings
+from http_client import json_loads, json_dumps
+
+S = get_settings()
+HTTP_CACHE = S.http_cache
+HTTP_CACHE_PATH = S.http_cache_path
+HTTP_CACHE_MAX_ENTRIES = S.http_cache_max_entries
+HTTP_CACHE_MAX_MB = S.http_cache_max_mb
+HTTP_CACHE_SWR = S.http_cache_swr  # seconds a stale entry may still be served
+
+# Per-provider freshness (seconds)
+HTTP_CACHE_TTL = {
+    "newsapi": S.http_cache_ttl_newsapi,
+    "serpapi": S.http_cache_ttl_serpapi,
+}
+
+# Never part of the key: credentials must not decide (or leak into) cache identity
+_SECRET_PARAMS = {"api_key", "apikey", "key", "token"}
+# Window bounds move every second; bucket them to the hour so re-runs line up
+_WINDOW_PARAMS = {"from", "to"}
+
+def cache_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    norm = {}
+    for k, v in (params or {}).items():
+        if v is None or k.lower() in _SECRET_PARAMS:
+            continue
+        v = str(v)
+        if k in _WINDOW_PARAMS:
+            v = v[:13]  # "YYYY-MM-DDTHH"
+        norm[k] = v
+    blob = url.split("?", 1)[0].rstrip("/").lower() + "?" + json.dumps(norm, sort_keys=True)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    """
+    SQLite-backed JSON response cache with per-provider TTLs, LRU eviction by
+    entry count and total size, and optional stale-while-revalidate.
+    """
+
+    def __init__(self, path: str, max_entries: int = 2000, max_bytes: int = 200 * 1024 * 1024,
+                 ttl: Optional[Dict[str, float]] = None, swr: float = 0.0):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(1, int(max_bytes))
+        self.ttl = dict(ttl or {})
+        self.swr = max(0.0, float(swr))
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self.hits = self.misses = self.stale_hits = 0
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, provider TEXT, stored_at REAL, accessed_at REAL,"
+            " size INTEGER, body BLOB)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS ix_responses_lru ON responses(accessed_at)")
+
+    def lookup(self, key: str, provider: str) -> Tuple[Optional[Any], str]:
+        """Returns (payload, state) with state in {'fresh', 'stale', 'miss'}."""
+        now = time.time()
+        ttl = self.ttl.get(provider, 0.0)
+        with self._lock:
+            row = self._db.execute("SELECT stored_at, body FROM responses WHERE key=?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None, "miss"
+            age = now - row[0]
+            if age > ttl + self.swr:
+                self.misses += 1
+                return None, "miss"
+            self._db.execute("UPDATE responses SET accessed_at=? WHERE key=?", (now, key))
+            if age <= ttl:
+                self.hits += 1
+                state = "fresh"
+            else:
+                self.stale_hits += 1
+                state = "stale"
+        return json_loads(row[1]), state
+
+    def put(self, key: str, provider: str, payload: Any) -> None:
+        body = json_dumps(payload)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses(key, provider, stored_at, accessed_at, size, body)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, provider, now, now, len(body), body),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        count, total = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        # Walk least-recently-used first until both bounds hold
+        drop, over_n, over_b = [], count - self.max_entries, total - self.max_bytes
+        for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY accessed_at ASC"):
+            if over_n <= 0 and over_b <= 0:
+                break
+            drop.append((key,))
+            over_n -= 1
+            over_b -= size
+        self._db.executemany("DELETE FROM responses WHERE key=?", drop)
+
+    def revalidate(self, key: str, provider: str, fetch: Callable[[], Any],
+                   keep: Optional[Callable[[Any], bool]] = None) -> None:
+        """
+        Refresh a stale entry in the background; concurrent calls for one key collapse.
+        A result that fails `keep` (e.g. a provider error payload) leaves the stale copy in place.
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                data = fetch()
+                if keep is None or keep(data):
+                    self.put(key, provider, data)
+            except Exception:
+                pass  # keep serving the stale copy until the next attempt
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {"hits": self.hits, "stale_hits": self.stale_hits, "misses": self.misses, "entries": entries}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+def get_cache() -> Optional[ResponseCache]:
+    """Shared cache instance, or None when HTTP_CACHE=0."""
+    global _cache
+    if not HTTP_CACHE:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache(
+                    HTTP_CACHE_PATH,
+                    max_entries=HTTP_CACHE_MAX_ENTRIES,
+                    max_bytes=int(HTTP_CACHE_MAX_MB * 1024 * 1024),
+                    ttl=HTTP_CACHE_TTL,
+                    swr=HTTP_CACHE_SWR,
+                )
+    return _cache
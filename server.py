@@ -0,0 +1,266 @@
+# server.py
+"""
+Local JSON API over the trend pipeline for dashboards.
+
+    python server.py --port 8787
+    GET /cotrends?q=Tuscaloosa&days=7&half_life_h=36&top_k=15&articles=20
+    GET /topics?q=Tuscaloosa            (broad RAKE topics)
+    GET /stats                          (cache / single-flight counters)
+
+Identical in-flight requests share one computation (single-flight) and
+finished results stay in a bounded TTL/LRU cache keyed on the query and its
+parameters. A result is serialised once into JSON fragments; every response
+streams those fragments with chunked transfer encoding, so cache hits cost
+no re-encoding and large article lists are never joined into one buffer.
+"""
+import argparse, threading, time
+from collections import OrderedDict
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from config_loader import get_settings
+from http_client import json_dumps
+from rate_limit import QuotaExhausted
+
+S = get_settings()
+
+SERVER_CACHE_SIZE = S.server_cache_size
+SERVER_CACHE_TTL_S = S.server_cache_ttl_s
+MAX_ARTICLES = 1000
+_CHUNK = 16 * 1024   # coalesce small JSON pieces into writes of about this size
+
+class TTLCache:
+    """Thread-safe LRU bounded by entry count, with a per-entry time to live."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max(1, int(max_entries))
+        self.ttl = float(ttl)
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get(self, key) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[0] < time.monotonic():
+                if item is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def put(self, key, value) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._data), "hits": self.hits, "misses": self.misses}
+
+class SingleFlight:
+    """Collapse concurrent calls for the same key into one execution of `fn`."""
+
+    class _Call:
+        __slots__ = ("done", "value", "error")
+
+        def __init__(self):
+            self.done = threading.Event()
+            self.value = self.error = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Any, "SingleFlight._Call"] = {}
+        self.leaders = self.followers = 0
+
+    def do(self, key, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Returns (value, shared) where shared=True means another caller computed it."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = self._Call()
+                self.leaders += 1
+            else:
+                self.followers += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+        try:
+            call.value = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value, False
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"computed": self.leaders, "coalesced": self.followers, "in_flight": len(self._calls)}
+
+_cache = TTLCache(SERVER_CACHE_SIZE, SERVER_CACHE_TTL_S)
+_flight = SingleFlight()
+
+def _article_json(r) -> Dict[str, Any]:
+    pub = r.get("published_at")
+    return {
+        "title": r.get("title", ""),
+        "url": r.get("url", ""),
+        "summary": r.get("summary", ""),
+        "published_at": pub.isoformat() if isinstance(pub, datetime) else pub,
+        "source": r.get("source", ""),
+        "syndication": r.get("syndication") or 1,
+    }
+
+def _encode(kind: str, params: Dict[str, Any], topics_df, rows, n_articles: int, elapsed: float) -> List[bytes]:
+    """Response body as a list of JSON fragments (cached as-is, streamed in order)."""
+    topics = [] if topics_df is None or topics_df.empty else [
+        {"topic": str(t), "score": float(s), "count": int(c)}
+        for t, s, c in zip(topics_df["topic"], topics_df["score"], topics_df["count"])
+    ]
+    if "variants" in getattr(topics_df, "columns", ()):
+        for t, v in zip(topics, topics_df["variants"].tolist()):
+            t["variants"] = v.split("; ") if v else []
+    head = json_dumps({"kind": kind, "params": params, "n_articles": len(rows),
+                       "elapsed_ms": round(elapsed * 1000, 1), "topics": topics})
+    parts = [head[:-1] + b',"articles":[']
+    for i, r in enumerate(rows[:n_articles]):
+        parts.append((b"," if i else b"") + json_dumps(_article_json(r)))
+    parts.append(b"]}")
+    return parts
+
+def _params(q: Dict[str, str]) -> Dict[str, Any]:
+    query = (q.get("q") or q.get("query") or "").strip()
+    if not query:
+        raise ValueError("missing required parameter 'q'")
+    return {
+        "q": query,
+        "lang": q.get("lang", S.lang),
+        "days": int(q.get("days", S.days)),
+        "half_life_h": float(q.get("half_life_h", S.half_life_h)),
+        "top_k": max(1, int(q.get("top_k", S.top_k))),
+        "articles": max(0, min(MAX_ARTICLES, int(q.get("articles", 20)))),
+    }
+
+def compute(kind: str, p: Dict[str, Any]) -> List[bytes]:
+    t = time.perf_counter()
+    if kind == "cotrends":
+        from keyword_trending import co_trending_topics
+        topics_df, rows = co_trending_topics(p["q"], lang=p["lang"], days=p["days"],
+                                             half_life_h=p["half_life_h"], top_k=p["top_k"])
+    else:
+        from news_sources import fetch_both
+        from topic_miner import build_topics_df
+        rows = fetch_both(query=p["q"], lang=p["lang"], days=p["days"],
+                          nc_page_size=S.news_page_size, nc_pages=S.news_max_pages, serp_pages=S.serpapi_pages)
+        topics_df = build_topics_df(rows, half_life_h=p["half_life_h"], top_k=p["top_k"])
+    return _encode(kind, p, topics_df, rows, p["articles"], time.perf_counter() - t)
+
+def get_result(kind: str, p: Dict[str, Any]) -> Tuple[List[bytes], str]:
+    """(body parts, 'hit' | 'shared' | 'miss')."""
+    key = (kind, p["q"].lower(), p["lang"], p["days"], p["half_life_h"], p["top_k"], p["articles"])
+    parts = _cache.get(key)
+    if parts is not None:
+        return parts, "hit"
+
+    def run():
+        parts = compute(kind, p)
+        _cache.put(key, parts)
+        return parts
+
+    parts, shared = _flight.do(key, run)
+    return parts, "shared" if shared else "miss"
+
+def stats() -> Dict[str, Any]:
+    return {"cache": _cache.stats(), "single_flight": _flight.stats()}
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive + chunked bodies
+    server_version = "NewsTrend/1.0"
+
+    verbose = False
+
+    def log_message(self, fmt, *args):
+        if self.verbose:
+            super().log_message(fmt, *args)
+
+    def _send_json(self, code: int, obj: Any) -> None:
+        self._stream(code, iter([json_dumps(obj)]))
+
+    def _stream(self, code: int, parts: Iterator[bytes], headers: Dict[str, str] = None) -> None:
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        buf = bytearray()
+        for part in parts:
+            buf += part
+            if len(buf) >= _CHUNK:
+                self._chunk(bytes(buf)); buf.clear()
+        if buf:
+            self._chunk(bytes(buf))
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _chunk(self, data: bytes) -> None:
+        self.wfile.write(b"%x\r\n" % len(data) + data + b"\r\n")
+
+    def do_GET(self):
+        u = urlparse(self.path)
+        q = {k: v[-1] for k, v in parse_qs(u.query).items()}
+        path = u.path.rstrip("/")
+        if path == "/health":
+            return self._send_json(200, {"ok": True})
+        if path == "/stats":
+            return self._send_json(200, stats())
+        if path not in ("/cotrends", "/topics"):
+            return self._send_json(404, {"error": f"unknown path {u.path}"})
+        try:
+            p = _params(q)
+        except ValueError as e:
+            return self._send_json(400, {"error": str(e)})
+
+        try:
+            parts, state = get_result(path[1:], p)
+        except QuotaExhausted as e:
+            return self._send_json(429, {"error": str(e)})
+        except Exception as e:
+            return self._send_json(502, {"error": str(e)[:300]})
+        self._stream(200, iter(parts), {"X-Cache": state})
+
+def make_server(host: str = "127.0.0.1", port: int = 8787) -> ThreadingHTTPServer:
+    srv = ThreadingHTTPServer((host, port), Handler)
+    srv.daemon_threads = True
+    return srv
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=S.server_port)
+    ap.add_argument("--verbose", action="store_true", help="log every request")
+    args = ap.parse_args(argv)
+    Handler.verbose = args.verbose
+    srv = make_server(args.host, args.port)
+    print(f"NewsTrend API on http://{args.host}:{srv.server_address[1]} "
+          f"(cache {SERVER_CACHE_SIZE} entries, ttl {SERVER_CACHE_TTL_S:.0f}s)")
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv.server_close()
+
+if __name__ == "__main__":
+    main()
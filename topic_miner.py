@@ -1,36 +1,72 @@
 # topic_miner.py
 from __future__ import annotations
-import math, re
-from datetime import datetime, timezone
-from typing import Dict, List
-import pandas as pd
-from rake_nltk import Rake
-import nltk
-
-# Ensure NLTK resources (RAKE uses punkt; NLTK 3.9+ needs punkt_tab)
-for pkg in ("stopwords", "punkt", "punkt_tab"):
-    try:
-        nltk.data.find(f"tokenizers/{pkg}" if "punkt" in pkg else f"corpora/{pkg}")
-    except LookupError:
-        try:
-            nltk.download(pkg, quiet=True)
-        except Exception:
-            pass
+import math, re, threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
+from config_loader import get_settings
+import cancel, metrics
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from article_batch import ArticleBatch
+    from rake_nltk import Rake
+
+S = get_settings()
+
+# Broad mode: spread RAKE over a process pool once the corpus is this large
+RAKE_WORKERS = S.rake_workers          # 0/1 = in-process
+RAKE_CHUNK_SIZE = S.rake_chunk_size
+RAKE_PARALLEL_MIN = S.rake_parallel_min
+
+_WORD_RE = re.compile(r"\w+")
+_local = threading.local()
+_nltk_lock = threading.Lock()
+_nltk_ready = False
+
+def ensure_nltk_resources() -> None:
+    """
+    Make sure RAKE's NLTK data is present (punkt; NLTK 3.9+ also needs punkt_tab).
+    Runs on first use rather than at import, so importing this module never
+    touches the network; downloads only happen if NLTK_AUTO_DOWNLOAD is on.
+    """
+    global _nltk_ready
+    if _nltk_ready:
+        return
+    with _nltk_lock:
+        if _nltk_ready:
+            return
+        import nltk
+        for pkg in ("stopwords", "punkt", "punkt_tab"):
+            try:
+                nltk.data.find(f"tokenizers/{pkg}" if "punkt" in pkg else f"corpora/{pkg}")
+            except LookupError:
+                if not S.nltk_auto_download:
+                    continue
+                try:
+                    nltk.download(pkg, quiet=True)
+                except Exception:
+                    pass
+        _nltk_ready = True
+
+def _extractor() -> Rake:
+    # Rake() reloads the stopword list on construction and keeps per-call state,
+    # so build one per thread (and per worker process) and reuse it.
+    rake = getattr(_local, "rake", None)
+    if rake is None:
+        ensure_nltk_resources()
+        from rake_nltk import Rake
+        rake = _local.rake = Rake()
+    return rake
 
 def _as_text(v) -> str:
     if v is None: return ""
     if isinstance(v, float) and math.isnan(v): return ""
     return str(v)
 
-def _hours_ago(dt: datetime) -> float:
-    now = datetime.now(timezone.utc)
-    return max(0.0, (now - dt).total_seconds() / 3600.0)
-
-def extract_keyphrases(text: str, top_n: int = 3) -> list[str]:
+def _ranked_phrases(rake: Rake, text: str, top_n: int) -> list[str]:
     text = _as_text(text).strip()
     if not text:
         return []
-    rake = Rake()
     rake.extract_keywords_from_text(text)
     phrases = []
     seen = set()
@@ -40,30 +76,78 @@ def extract_keyphrases(text: str, top_n: int = 3) -> list[str]:
         p = phrase.strip().lower()
         if not p or p in seen:
             continue
-        wc = len(re.findall(r"\w+", p))
+        wc = len(_WORD_RE.findall(p))
         if 1 <= wc <= 3 and len(p) <= 50:
             phrases.append(p); seen.add(p)
         if len(phrases) >= top_n:
             break
     return phrases
 
-def build_topics_df(rows: List[Dict], half_life_h: float = 36.0, top_k: int = 15) -> pd.DataFrame:
-    topic_rows = []
-    for r in rows:
-        title = _as_text(r.get("title"))
-        summary = _as_text(r.get("summary"))
-        phrases = extract_keyphrases(f"{title}. {summary}", top_n=3)
-        if not phrases:
-            continue
-        hrs = _hours_ago(r["published_at"])
-        decay = 0.5 ** (hrs / max(1e-6, half_life_h))
+def extract_keyphrases(text: str, top_n: int = 3) -> list[str]:
+    return _ranked_phrases(_extractor(), text, top_n)
+
+def _extract_chunk(texts: List[str], top_n: int) -> List[list[str]]:
+    rake = _extractor()
+    return [_ranked_phrases(rake, t, top_n) for t in texts]
+
+def extract_keyphrases_batch(texts: List[str], top_n: int = 3,
+                             workers: Optional[int] = None) -> List[list[str]]:
+    """
+    Keyphrases for every text with one reused extractor. Large corpora are
+    split into RAKE_CHUNK_SIZE chunks across a process pool when workers > 1.
+    """
+    workers = RAKE_WORKERS if workers is None else workers
+    if workers <= 1 or len(texts) < RAKE_PARALLEL_MIN:
+        return _extract_chunk(texts, top_n)
+
+    chunks = [texts[i:i + RAKE_CHUNK_SIZE] for i in range(0, len(texts), RAKE_CHUNK_SIZE)]
+    out: List[list[str]] = []
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        for res in ex.map(_extract_chunk, chunks, [top_n] * len(chunks)):
+            cancel.check()
+            out.extend(res)
+    return out
+
+def build_topics_df(rows: Union[List[Dict], ArticleBatch], half_life_h: float = 36.0, top_k: int = 15,
+                    workers: Optional[int] = None) -> pd.DataFrame:
+    return build_topics_dfs(rows, [half_life_h], top_k=top_k, workers=workers)[half_life_h]
+
+def build_topics_dfs(rows: Union[List[Dict], ArticleBatch], half_lives: List[float], top_k: int = 15,
+                     workers: Optional[int] = None) -> Dict[float, pd.DataFrame]:
+    """One topics frame per half-life; keyphrases are extracted only once."""
+    from article_batch import ArticleBatch
+
+    batch = ArticleBatch.coerce(rows)
+    texts = [f"{t}. {s}" for t, s in zip(batch.titles, batch.summaries)]
+    cancel.check()
+    with metrics.span("keyphrases"):
+        per_doc = extract_keyphrases_batch(texts, top_n=3, workers=workers)
+    cancel.check()
+    with metrics.span("rank"):
+        return {hl: _aggregate(batch, per_doc, hl, top_k) for hl in half_lives}
+
+def _aggregate(batch: ArticleBatch, per_doc: List[list[str]], half_life_h: float, top_k: int) -> pd.DataFrame:
+    import numpy as np
+    import pandas as pd
+
+    # (phrase id, doc index) pairs; aggregated with bincount instead of per-phrase dicts
+    ids: Dict[str, int] = {}
+    topic_idx: List[int] = []
+    doc_idx: List[int] = []
+    for i, phrases in enumerate(per_doc):
         for p in phrases:
-            topic_rows.append({"topic": p, "decayed": decay, "source": r.get("source")})
+            topic_idx.append(ids.setdefault(p, len(ids)))
+            doc_idx.append(i)
 
-    if not topic_rows:
+    if not ids:
         return pd.DataFrame(columns=["topic", "score", "count"])
 
-    df = pd.DataFrame(topic_rows)
-    agg = df.groupby("topic").agg(score=("decayed","sum"), count=("topic","size")).reset_index()
-    agg = agg.sort_values("score", ascending=False).head(top_k)
-    return agg
+    decay = batch.decay_weights(half_life_h)
+
+    t = np.asarray(topic_idx, dtype=np.intp)
+    score = np.bincount(t, weights=decay[np.asarray(doc_idx, dtype=np.intp)], minlength=len(ids))
+    count = np.bincount(t, minlength=len(ids))
+    topics = np.array(list(ids))
+
+    order = np.lexsort((topics, -score))[:top_k]
+    return pd.DataFrame({"topic": topics[order], "score": score[order], "count": count[order]})